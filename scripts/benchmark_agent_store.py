@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare per-agent memory and per-tick cost of the object and SoA agent layouts."""
+from __future__ import annotations
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from terrarium.sim.core.config import SimulationConfig  # noqa: E402
+from terrarium.sim.core.world import World  # noqa: E402
+
+
+def build_config(storage: str, population: int, seed: int) -> SimulationConfig:
+    config = SimulationConfig(seed=seed, initial_population=population, max_population=population)
+    config.performance.agent_storage = storage
+    return config
+
+
+def measure_memory(storage: str, population: int, seed: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    world = World(build_config(storage, population, seed))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    agent_bytes = sum(
+        stat.size_diff
+        for stat in stats
+        if "environment.py" not in stat.traceback[0].filename and "spatial_grid.py" not in stat.traceback[0].filename
+    )
+    del world
+    return agent_bytes / max(1, population)
+
+
+def measure_step(storage: str, population: int, seed: int, ticks: int) -> float:
+    world = World(build_config(storage, population, seed))
+    world.step(0)
+    start = perf_counter()
+    for tick in range(1, ticks + 1):
+        world.step(tick)
+    return (perf_counter() - start) * 1000.0 / ticks
+
+
+def measure_column_sweep(storage: str, population: int, seed: int, repeats: int) -> float:
+    """Time an aging/metabolism sweep over every agent, the kind of pass batch kernels do."""
+
+    world = World(build_config(storage, population, seed))
+    dt = world._config.time_step
+    drain = world._config.species.metabolism_per_second * dt
+    start = perf_counter()
+    if storage == "soa":
+        store = world._store
+        count = len(store)
+        for _ in range(repeats):
+            store.age[:count] += dt
+            store.energy[:count] -= drain
+    else:
+        agents = world.agents
+        for _ in range(repeats):
+            for agent in agents:
+                agent.age += dt
+                agent.energy -= drain
+    return (perf_counter() - start) * 1000.0 / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--population", type=int, nargs="+", default=[700, 5000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("layout   population  bytes/agent  step_ms/tick  sweep_ms")
+    for population in args.population:
+        for storage in ("objects", "soa"):
+            bytes_per_agent = measure_memory(storage, population, args.seed)
+            step_ms = measure_step(storage, population, args.seed, args.ticks)
+            sweep_ms = measure_column_sweep(storage, population, args.seed, 200)
+            print(f"{storage:<8} {population:>10}  {bytes_per_agent:>11.1f}  {step_ms:>12.3f}  {sweep_ms:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
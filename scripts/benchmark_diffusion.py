@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare explicit diffusion substeps with the spectral solver over one environment interval: error vs a fine-step reference and cost.
+
+The reference runs the explicit stencil on plain arrays without the per-tick cutoffs (1e-4 for food,
+1e-5 for pheromone/danger), so it is the model the cutoffs approximate rather than either solver."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from terrarium.sim.core.config import EnvironmentConfig  # noqa: E402
+from terrarium.sim.core.environment import DenseEnvironmentGrid  # noqa: E402
+from terrarium.sim.utils.stencil import _scatter_orthogonal  # noqa: E402
+
+FIELDS = ("food", "pheromone", "danger")
+
+
+def build(solver: str, world_size: float, cell_size: float, seed: int) -> DenseEnvironmentGrid:
+    config = EnvironmentConfig(food_regen_per_second=0.0, food_decay_rate=0.02, resource_patches=[])
+    env = DenseEnvironmentGrid(
+        cell_size, config, world_size, pheromone_field="layers", danger_field="dict", diffusion_solver=solver
+    )
+    rng = np.random.default_rng(seed)
+    cells = env._max_index
+    for x, y in rng.integers(0, cells, size=(max(4, cells // 2), 2)).tolist():
+        env.add_food((x, y), 8.0)
+        env.add_danger((x, y), 3.0)
+        env.add_pheromone((x, y), x % 3, 2.0)
+    return env
+
+
+def snapshot(env: DenseEnvironmentGrid) -> dict[str, np.ndarray]:
+    cells = env._max_index
+    danger = np.zeros((cells, cells))
+    for key, value in env._danger_field.items():
+        danger[key] = value
+    pheromone = sum((env._pheromone_layers._layers.get(group, 0.0) for group in range(3)), np.zeros((cells, cells)))
+    return {"food": env._food_value.copy(), "pheromone": pheromone, "danger": danger}
+
+
+def rates(env: DenseEnvironmentGrid) -> dict[str, tuple[float, float]]:
+    return {
+        "food": (env._food_diffusion_rate, env._food_decay_rate),
+        "pheromone": (env._pheromone_diffusion_rate, env._pheromone_decay_rate),
+        "danger": (env._danger_diffusion_rate, env._danger_decay_rate),
+    }
+
+
+def explicit_reference(field: np.ndarray, rate: float, decay: float, interval: float, substeps: int) -> np.ndarray:
+    field = field.copy()
+    dt = interval / substeps
+    for _ in range(substeps):
+        field *= 1.0 - decay * dt
+        spread = field * (rate * dt)
+        field -= spread
+        _scatter_orthogonal(field, spread * 0.25)
+    return field
+
+
+def advance(env: DenseEnvironmentGrid, interval: float, substeps: int) -> float:
+    start = perf_counter()
+    for _ in range(substeps):
+        env.tick(interval / substeps)
+    return (perf_counter() - start) * 1000.0
+
+
+def relative_error(field: np.ndarray, reference: np.ndarray) -> float:
+    return float(np.abs(field - reference).sum() / max(np.abs(reference).sum(), 1e-12))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--world-size", type=float, default=400.0)
+    parser.add_argument("--cell-size", type=float, default=5.5)
+    parser.add_argument("--interval", type=float, default=6.0)
+    parser.add_argument("--substeps", type=int, nargs="+", default=[1, 6, 24])
+    parser.add_argument("--reference-substeps", type=int, default=2400)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    reference_env = build("explicit", args.world_size, args.cell_size, args.seed)
+    reference = {
+        name: explicit_reference(field, *rates(reference_env)[name], args.interval, args.reference_substeps)
+        for name, field in snapshot(reference_env).items()
+    }
+
+    runs = [(f"explicit x{substeps}", "explicit", substeps) for substeps in args.substeps]
+    runs.append(("spectral x1", "spectral", 1))
+    print(f"cells={reference_env._max_index ** 2}  interval={args.interval}s  reference=cutoff-free explicit x{args.reference_substeps}")
+    print("solver           ms     " + "  ".join(f"{name}_err" for name in FIELDS))
+    for label, solver, substeps in runs:
+        env = build(solver, args.world_size, args.cell_size, args.seed)
+        elapsed = advance(env, args.interval, substeps)
+        result = snapshot(env)
+        errors = "  ".join(
+            f"{relative_error(result[name], reference[name]):>{len(name) + 4}.4f}" for name in FIELDS
+        )
+        print(f"{label:<14}  {elapsed:>7.2f}  {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Time environment ticks: food regen + diffusion (sparse dict vs dense arrays) and pheromones (flat dict vs per-group layers)."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from terrarium.sim.core.config import EnvironmentConfig  # noqa: E402
+from terrarium.sim.core.environment import DenseEnvironmentGrid, EnvironmentGrid  # noqa: E402
+
+
+def build(kind: type[EnvironmentGrid], world_size: float, cell_size: float) -> EnvironmentGrid:
+    config = EnvironmentConfig(food_diffusion_rate=0.1, food_decay_rate=0.0)
+    env = kind(cell_size, config, world_size)
+    cells = env._max_index
+    for x in range(cells):
+        for y in range(cells):
+            env.sample_food((x, y))
+    return env
+
+
+def time_ticks(env: EnvironmentGrid, ticks: int) -> float:
+    start = perf_counter()
+    for _ in range(ticks):
+        env._regen_food(1.0)
+        env._diffuse_food(1.0)
+    return (perf_counter() - start) * 1000.0 / ticks
+
+
+def build_pheromones(pheromone_field: str, world_size: float, cell_size: float, groups: int) -> EnvironmentGrid:
+    env = EnvironmentGrid(cell_size, EnvironmentConfig(), world_size, pheromone_field)
+    cells = env._max_index
+    for group_id in range(groups):
+        for x in range(cells):
+            for y in range(group_id % 3, cells, 3):
+                env.add_pheromone((x, y), group_id, 1.0 + group_id)
+    return env
+
+
+def time_pheromone_ticks(env: EnvironmentGrid, groups: int, ticks: int) -> float:
+    active = set(range(groups - 1))
+    start = perf_counter()
+    for _ in range(ticks):
+        env.prune_pheromones(active)
+        env.tick(1.0)
+        env.export_pheromone_field()
+    return (perf_counter() - start) * 1000.0 / ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--world-size", type=float, nargs="+", default=[100.0, 400.0, 1000.0])
+    parser.add_argument("--cell-size", type=float, default=5.5)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=12)
+    args = parser.parse_args()
+
+    print("world_size  cells  sparse_ms  dense_ms  speedup")
+    for world_size in args.world_size:
+        sparse = build(EnvironmentGrid, world_size, args.cell_size)
+        dense = build(DenseEnvironmentGrid, world_size, args.cell_size)
+        sparse_ms = time_ticks(sparse, args.ticks)
+        dense_ms = time_ticks(dense, args.ticks)
+        print(
+            f"{world_size:>10.0f}  {sparse._max_index ** 2:>5}  {sparse_ms:>9.3f}  {dense_ms:>8.3f}"
+            f"  {sparse_ms / max(dense_ms, 1e-9):>6.1f}x"
+        )
+
+    print()
+    print("world_size  groups  flat_ms  layers_ms  speedup")
+    for world_size in args.world_size:
+        flat = build_pheromones("flat", world_size, args.cell_size, args.groups)
+        layers = build_pheromones("layers", world_size, args.cell_size, args.groups)
+        flat_ms = time_pheromone_ticks(flat, args.groups, args.ticks)
+        layers_ms = time_pheromone_ticks(layers, args.groups, args.ticks)
+        print(
+            f"{world_size:>10.0f}  {args.groups:>6}  {flat_ms:>7.3f}  {layers_ms:>9.3f}"
+            f"  {flat_ms / max(layers_ms, 1e-9):>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Time a per-tick rebuild (inserts plus the dense CSR build) and one neighbor query per agent for the hash and dense grids."""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from pygame.math import Vector2
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from terrarium.sim.core.agent import Agent, AgentState  # noqa: E402
+from terrarium.sim.core.config import SimulationConfig  # noqa: E402
+from terrarium.sim.core.spatial_grid import DenseSpatialGrid, SpatialGrid  # noqa: E402
+
+
+def build_agents(population: int, world_size: float, seed: int) -> list[Agent]:
+    rng = random.Random(seed)
+    return [
+        Agent(
+            id=index,
+            generation=0,
+            group_id=-1,
+            position=Vector2(rng.uniform(0.0, world_size), rng.uniform(0.0, world_size)),
+            velocity=Vector2(),
+            energy=10.0,
+            age=0.0,
+            state=AgentState.IDLE,
+        )
+        for index in range(population)
+    ]
+
+
+def measure(grid: SpatialGrid | DenseSpatialGrid, agents: list[Agent], radius: float, ticks: int) -> tuple[float, float]:
+    offsets = grid.build_neighbor_cell_offsets(radius)
+    radius_sq = radius * radius
+    out_agents: list[Agent] = []
+    out_offsets: list[Vector2] = []
+    out_dist_sq: list[float] = []
+    rebuild = 0.0
+    query = 0.0
+    for _ in range(ticks):
+        start = perf_counter()
+        grid.clear()
+        for agent in agents:
+            grid.insert(agent)
+        if isinstance(grid, DenseSpatialGrid):
+            # Count the deferred CSR build as part of the rebuild, not the first query.
+            grid.sorted_agents
+        middle = perf_counter()
+        for agent in agents:
+            grid.collect_neighbors_precomputed(
+                agent.position, offsets, radius_sq, out_agents, out_offsets, agent.id, out_dist_sq
+            )
+        end = perf_counter()
+        rebuild += middle - start
+        query += end - middle
+    return rebuild * 1000.0 / ticks, query * 1000.0 / ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--population", type=int, nargs="+", default=[700, 5000])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    config = SimulationConfig()
+    radius = config.species.vision_radius
+    print("grid   population  rebuild_ms  query_ms")
+    for population in args.population:
+        agents = build_agents(population, config.world_size, args.seed)
+        grids = {
+            "hash": SpatialGrid(config.cell_size),
+            "dense": DenseSpatialGrid(config.cell_size, config.world_size),
+        }
+        for name, grid in grids.items():
+            rebuild_ms, query_ms = measure(grid, agents, radius, args.ticks)
+            print(f"{name:<6} {population:>10}  {rebuild_ms:>10.3f}  {query_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Time one full steering pass with the scalar and batch backends (directed and half-shell pairs) on the same world state."""
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from terrarium.sim.core.config import SimulationConfig  # noqa: E402
+from terrarium.sim.core.world import World  # noqa: E402
+from terrarium.sim.systems import steering, steering_batch  # noqa: E402
+
+
+def build_world(population: int, seed: int, warmup: int) -> World:
+    config = SimulationConfig(seed=seed, initial_population=population, max_population=population)
+    config.feedback.steering_update_population_threshold = population + 1
+    world = World(config)
+    for tick in range(warmup):
+        world.step(tick)
+    return world
+
+
+def scalar_pass(world: World, tick: int) -> float:
+    ctx = world._begin_tick(tick)
+    world._rebuild_spatial_index(ctx)
+    start = perf_counter()
+    for agent in world.agents:
+        traits, speed_limit = world._prepare_agent(agent)
+        world._collect_neighbors(agent, ctx)
+        steering.compute_desired_velocity(
+            world,
+            agent,
+            world._neighbor_agents,
+            world._neighbor_offsets,
+            speed_limit,
+            return_sensed=True,
+            neighbor_dist_sq=world._neighbor_dist_sq,
+            traits=traits,
+            danger_present=ctx.danger_present,
+            base_cell_key=world._cell_key(agent.position),
+        )
+    return (perf_counter() - start) * 1000.0
+
+
+def batch_pass(world: World, tick: int, pair_enumeration: str) -> float:
+    world._config.performance.pair_enumeration = pair_enumeration
+    ctx = world._begin_tick(tick)
+    start = perf_counter()
+    steering_batch.compute_tick(world, ctx)
+    return (perf_counter() - start) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--population", type=int, nargs="+", default=[700, 2000, 5000])
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("population  agents  scalar_ms  batch_ms  half_shell_ms  speedup")
+    for population in args.population:
+        world = build_world(population, args.seed, args.warmup)
+        tick = args.warmup
+        scalar_ms = min(scalar_pass(copy.deepcopy(world), tick) for _ in range(args.repeats))
+        batch_ms = min(batch_pass(copy.deepcopy(world), tick, "directed") for _ in range(args.repeats))
+        half_ms = min(batch_pass(copy.deepcopy(world), tick, "half_shell") for _ in range(args.repeats))
+        print(
+            f"{population:>10}  {len(world.agents):>6}  {scalar_ms:>9.2f}  {batch_ms:>8.2f}  {half_ms:>13.2f}"
+            f"  {scalar_ms / max(batch_ms, 1e-9):>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from ..sim.core.config import SimulationConfig
+from ..sim.core.tick_governor import governed_strides
 from ..sim.core.world import World
 
 
@@ -54,6 +55,17 @@ _DETAILED_HEADER = [
     "group_stride_active",
     "group_stride_active_agents",
     "group_stride_skipped_agents",
+    "neighbor_list_rebuilds",
+    "neighbor_candidates",
+    "danger_cells",
+    "food_regen_cells",
+    "group_updates_evaluated",
+    "group_updates_skipped",
+    "steering_reused",
+    "steering_recomputed",
+    "steering_reuse_ratio",
+    "steering_max_deviation",
+    "governor_level",
 ]
 
 
@@ -74,6 +86,8 @@ def _format_basic_row(metrics: object, tick_ms: float) -> list[object]:
 def _format_detailed_row(world: World, metrics: object, tick: int, tick_ms: float) -> list[object]:
     population = metrics.population
     ungrouped = metrics.ungrouped
+    steered = metrics.steering_reused + metrics.steering_recomputed
+    steering_reuse_ratio = metrics.steering_reused / steered if steered > 0 else 0.0
     if population <= 0:
         ungrouped_ratio = 0.0
         births_per_agent = 0.0
@@ -90,8 +104,7 @@ def _format_detailed_row(world: World, metrics: object, tick: int, tick_ms: floa
         avg_agents_per_cell = 0.0
         max_cell_occupancy = 0
         population_density = 0.0
-        group_stride = max(1, int(world._config.feedback.group_update_stride))
-        group_stride_threshold = max(0, int(world._config.feedback.group_update_population_threshold))
+        group_stride, group_stride_threshold, _, _ = governed_strides(world._config.feedback, metrics.governor_level)
         group_stride_active = 0
         group_stride_active_agents = 0
         group_stride_skipped_agents = 0
@@ -104,9 +117,10 @@ def _format_detailed_row(world: World, metrics: object, tick: int, tick_ms: floa
 
         config = world._config
         cell_size = config.cell_size
-        group_stride = max(1, int(config.feedback.group_update_stride))
-        group_stride_threshold = max(0, int(config.feedback.group_update_population_threshold))
-        group_stride_active = int(population >= group_stride_threshold and group_stride > 1)
+        group_stride, group_stride_threshold, _, _ = governed_strides(config.feedback, metrics.governor_level)
+        group_stride_active = int(
+            config.performance.group_updates == "stride" and population >= group_stride_threshold and group_stride > 1
+        )
         group_stride_active_agents = 0
 
         speed_sum = 0.0
@@ -195,6 +209,17 @@ def _format_detailed_row(world: World, metrics: object, tick: int, tick_ms: floa
         group_stride_active,
         group_stride_active_agents,
         group_stride_skipped_agents,
+        metrics.neighbor_list_rebuilds,
+        metrics.neighbor_candidates,
+        metrics.danger_cells,
+        metrics.food_regen_cells,
+        metrics.group_updates_evaluated,
+        metrics.group_updates_skipped,
+        metrics.steering_reused,
+        metrics.steering_recomputed,
+        f"{steering_reuse_ratio:.4f}",
+        f"{metrics.steering_max_deviation:.4f}",
+        metrics.governor_level,
     ]
 
 
@@ -249,6 +274,14 @@ def _correlation(xs: list[float], ys: list[float]) -> float:
     return float(num / denom)
 
 
+def _read_governor_trace(path: Path) -> dict[int, int]:
+    with Path(path).open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        if reader.fieldnames is None or "governor_level" not in reader.fieldnames:
+            raise ValueError(f"No governor_level column in governor trace: {path}")
+        return {int(row["tick"]): int(row["governor_level"]) for row in reader}
+
+
 def run_headless(
     steps: int,
     seed: Optional[int],
@@ -257,11 +290,19 @@ def run_headless(
     log_format: str = "detailed",
     summary_path: Optional[Path] = None,
     summary_window: int = 5000,
+    tick_budget_ms: Optional[float] = None,
+    governor_trace: Optional[Path] = None,
 ) -> None:
     config = SimulationConfig()
     if seed is not None:
         config.seed = seed
+    if tick_budget_ms is not None or governor_trace is not None:
+        config.performance.tick_governor = "budget"
+        if tick_budget_ms is not None:
+            config.performance.tick_budget_ms = tick_budget_ms
     world = World(config)
+    if governor_trace is not None:
+        world.replay_governor_trace(_read_governor_trace(governor_trace))
 
     log_mode = log_format.lower().strip()
     if log_mode not in {"basic", "detailed"}:
@@ -375,6 +416,18 @@ def main() -> None:
         action="store_true",
         help="Write deterministic CSV (tick_ms is forced to 0.000 so identical seeds match).",
     )
+    parser.add_argument(
+        "--tick-budget-ms",
+        type=float,
+        default=None,
+        help="Enable the tick governor, which moves stride levels to keep tick time under this budget.",
+    )
+    parser.add_argument(
+        "--governor-trace",
+        type=Path,
+        default=None,
+        help="Detailed CSV log whose governor_level column is replayed instead of measuring tick time.",
+    )
     args = parser.parse_args()
     run_headless(
         args.steps,
@@ -384,6 +437,8 @@ def main() -> None:
         log_format=args.log_format,
         summary_path=args.summary,
         summary_window=args.summary_window,
+        tick_budget_ms=args.tick_budget_ms,
+        governor_trace=args.governor_trace,
     )
 
 
@@ -27,6 +27,16 @@ class AgentTraits:
     kin_bias: float = 1.0
 
 
+@dataclass(slots=True)
+class DerivedTraits:
+    """Per-agent values computed from clamped traits; see `World.set_agent_traits`."""
+
+    speed_limit: float
+    metabolism_multiplier: float
+    disease_resistance: float
+    reproduction_factor: float
+
+
 @dataclass(slots=True)
 class Agent:
     id: int
@@ -52,3 +62,4 @@ class Agent:
     wander_time: float = 0.0
     last_desired: Vector2 = field(default_factory=Vector2)
     last_sensed_danger: bool = False
+    derived: DerivedTraits | None = None
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+from pygame.math import Vector2
+
+from .agent import AgentState, AgentTraits, DerivedTraits
+
+TRAIT_NAMES: tuple[str, ...] = (
+    "speed",
+    "metabolism",
+    "disease_resistance",
+    "fertility",
+    "sociality",
+    "territoriality",
+    "loyalty",
+    "founder",
+    "kin_bias",
+)
+
+_STATES: tuple[AgentState, ...] = tuple(AgentState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+_FLOAT_COLUMNS: tuple[str, ...] = (
+    "pos_x",
+    "pos_y",
+    "vel_x",
+    "vel_y",
+    "energy",
+    "age",
+    "stress",
+    "heading",
+    "group_lonely_seconds",
+    "group_cooldown",
+    "wander_x",
+    "wander_y",
+    "wander_time",
+    "last_desired_x",
+    "last_desired_y",
+    "appearance_h",
+    "appearance_s",
+    "appearance_l",
+)
+_INT_COLUMNS: tuple[str, ...] = ("id", "generation", "group_id", "lineage_id")
+_BOOL_COLUMNS: tuple[str, ...] = ("alive", "traits_dirty", "last_sensed_danger")
+
+
+class AgentStore:
+    """
+    Contiguous structure-of-arrays storage for agent state, indexed by slot.
+
+    Columns are plain NumPy arrays so batch kernels can read them directly; `AgentView`
+    gives per-agent attribute access with the same field names as `Agent`.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._capacity = max(1, int(capacity))
+        self._size = 0
+        self._views: List[AgentView] = []
+        for name in _FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(self._capacity, dtype=np.float64))
+        for name in _INT_COLUMNS:
+            setattr(self, name, np.zeros(self._capacity, dtype=np.int64))
+        for name in _BOOL_COLUMNS:
+            setattr(self, name, np.zeros(self._capacity, dtype=np.bool_))
+        self.state = np.zeros(self._capacity, dtype=np.int8)
+        self.traits = np.ones((self._capacity, len(TRAIT_NAMES)), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def views(self) -> List[AgentView]:
+        return self._views
+
+    def clear(self) -> None:
+        for view in self._views:
+            view._slot = -1
+        self._views.clear()
+        self._size = 0
+
+    def allocate(
+        self,
+        id: int,
+        generation: int,
+        group_id: int,
+        position: Vector2,
+        velocity: Vector2,
+        energy: float,
+        age: float,
+        state: AgentState,
+        lineage_id: int = 0,
+        traits: AgentTraits | None = None,
+        appearance_h: float = 50.0,
+        appearance_s: float = 1.0,
+        appearance_l: float = 0.83,
+        traits_dirty: bool = True,
+        alive: bool = True,
+        stress: float = 0.0,
+        group_lonely_seconds: float = 0.0,
+        group_cooldown: float = 0.0,
+        heading: float = 0.0,
+        wander_dir: Vector2 | None = None,
+        wander_time: float = 0.0,
+        last_desired: Vector2 | None = None,
+        last_sensed_danger: bool = False,
+    ) -> AgentView:
+        """Append a new agent row (same keywords and defaults as `Agent`) and return its view."""
+
+        if self._size >= self._capacity:
+            self._grow(self._capacity * 2)
+        slot = self._size
+        self._size += 1
+        self.id[slot] = id
+        self.generation[slot] = generation
+        self.group_id[slot] = group_id
+        self.lineage_id[slot] = lineage_id
+        self.pos_x[slot] = position.x
+        self.pos_y[slot] = position.y
+        self.vel_x[slot] = velocity.x
+        self.vel_y[slot] = velocity.y
+        self.energy[slot] = energy
+        self.age[slot] = age
+        self.state[slot] = _STATE_CODES[state]
+        self._write_traits(slot, traits if traits is not None else AgentTraits())
+        self.appearance_h[slot] = appearance_h
+        self.appearance_s[slot] = appearance_s
+        self.appearance_l[slot] = appearance_l
+        self.traits_dirty[slot] = traits_dirty
+        self.alive[slot] = alive
+        self.stress[slot] = stress
+        self.group_lonely_seconds[slot] = group_lonely_seconds
+        self.group_cooldown[slot] = group_cooldown
+        self.heading[slot] = heading
+        self.wander_x[slot] = wander_dir.x if wander_dir is not None else 0.0
+        self.wander_y[slot] = wander_dir.y if wander_dir is not None else 0.0
+        self.wander_time[slot] = wander_time
+        self.last_desired_x[slot] = last_desired.x if last_desired is not None else 0.0
+        self.last_desired_y[slot] = last_desired.y if last_desired is not None else 0.0
+        self.last_sensed_danger[slot] = last_sensed_danger
+        view = AgentView(self, slot)
+        self._views.append(view)
+        return view
+
+    def retain(self, views: List[AgentView]) -> None:
+        """
+        Compact the store so that `views` occupy slots 0..n-1 in the given order.
+
+        Rows not listed are dropped and their views detached (slot -1).
+        """
+
+        kept = np.fromiter((view._slot for view in views), dtype=np.int64, count=len(views))
+        count = len(views)
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS + _BOOL_COLUMNS + ("state",):
+            column = getattr(self, name)
+            column[:count] = column[kept]
+        self.traits[:count] = self.traits[kept]
+        for view in self._views:
+            view._slot = -1
+        for slot, view in enumerate(views):
+            view._slot = slot
+        self._views = list(views)
+        self._size = count
+
+    def move(self, view: AgentView, slot: int) -> None:
+        """Copy `view`'s row into `slot` and rebind it there; the view previously at `slot` is detached."""
+
+        source = view._slot
+        if source == slot:
+            return
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS + _BOOL_COLUMNS + ("state",):
+            column = getattr(self, name)
+            column[slot] = column[source]
+        self.traits[slot] = self.traits[source]
+        previous = self._views[slot]
+        if previous is not view and previous._slot == slot:
+            previous._slot = -1
+        self._views[slot] = view
+        view._slot = slot
+
+    def truncate(self, size: int) -> None:
+        """Drop rows from `size` on; views still bound to those rows are detached."""
+
+        for view in self._views[size:]:
+            if view._slot >= size:
+                view._slot = -1
+        del self._views[size:]
+        self._size = size
+
+    def _grow(self, capacity: int) -> None:
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS + _BOOL_COLUMNS + ("state",):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+        traits = np.ones((capacity, len(TRAIT_NAMES)), dtype=np.float64)
+        traits[: self._size] = self.traits[: self._size]
+        self.traits = traits
+        self._capacity = capacity
+
+    def _write_traits(self, slot: int, traits: AgentTraits) -> None:
+        row = self.traits[slot]
+        for index, name in enumerate(TRAIT_NAMES):
+            row[index] = getattr(traits, name)
+
+    def _read_traits(self, slot: int) -> AgentTraits:
+        row = self.traits[slot].tolist()
+        return AgentTraits(*row)
+
+    def nbytes(self) -> int:
+        total = self.state.nbytes + self.traits.nbytes
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS + _BOOL_COLUMNS:
+            total += getattr(self, name).nbytes
+        return total
+
+
+def _column_property(column: str) -> property:
+    # `ndarray.item` returns plain Python int/float/bool values, keeping NumPy scalars out of
+    # the scalar systems and JSON snapshots.
+    def getter(view: AgentView) -> object:
+        return getattr(view._store, column).item(view._slot)
+
+    def setter(view: AgentView, value: object) -> None:
+        getattr(view._store, column)[view._slot] = value
+
+    return property(getter, setter)
+
+
+def _vector_property(column_x: str, column_y: str) -> property:
+    def getter(view: AgentView) -> Vector2:
+        store = view._store
+        slot = view._slot
+        return Vector2(getattr(store, column_x).item(slot), getattr(store, column_y).item(slot))
+
+    def setter(view: AgentView, value: Vector2) -> None:
+        store = view._store
+        slot = view._slot
+        getattr(store, column_x)[slot] = value.x
+        getattr(store, column_y)[slot] = value.y
+
+    return property(getter, setter)
+
+
+class AgentView:
+    """
+    Thin facade over one `AgentStore` row exposing the `Agent` attribute names.
+
+    Vector attributes return copies; callers that mutate them in place must assign the
+    vector back (e.g. `agent.position = position`) for the store to see the change.
+    """
+
+    __slots__ = ("_store", "_slot", "derived")
+
+    def __init__(self, store: AgentStore, slot: int) -> None:
+        self._store = store
+        self._slot = slot
+        # Derived trait block; kept on the view (not a column) so it follows the agent across slots.
+        self.derived: DerivedTraits | None = None
+
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    id = _column_property("id")
+    generation = _column_property("generation")
+    group_id = _column_property("group_id")
+    lineage_id = _column_property("lineage_id")
+    energy = _column_property("energy")
+    age = _column_property("age")
+    stress = _column_property("stress")
+    heading = _column_property("heading")
+    group_lonely_seconds = _column_property("group_lonely_seconds")
+    group_cooldown = _column_property("group_cooldown")
+    wander_time = _column_property("wander_time")
+    appearance_h = _column_property("appearance_h")
+    appearance_s = _column_property("appearance_s")
+    appearance_l = _column_property("appearance_l")
+    alive = _column_property("alive")
+    traits_dirty = _column_property("traits_dirty")
+    last_sensed_danger = _column_property("last_sensed_danger")
+    position = _vector_property("pos_x", "pos_y")
+    velocity = _vector_property("vel_x", "vel_y")
+    wander_dir = _vector_property("wander_x", "wander_y")
+    last_desired = _vector_property("last_desired_x", "last_desired_y")
+
+    @property
+    def state(self) -> AgentState:
+        return _STATES[self._store.state.item(self._slot)]
+
+    @state.setter
+    def state(self, value: AgentState) -> None:
+        self._store.state[self._slot] = _STATE_CODES[value]
+
+    @property
+    def traits(self) -> AgentTraits:
+        return self._store._read_traits(self._slot)
+
+    @traits.setter
+    def traits(self, value: AgentTraits) -> None:
+        self._store._write_traits(self._slot, value)
+
+    def __repr__(self) -> str:
+        return f"AgentView(slot={self._slot}, id={self.id})"
+
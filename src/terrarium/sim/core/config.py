@@ -157,6 +157,70 @@ class AppearanceConfig:
     mutation_delta_l: float = 0.08
 
 
+@dataclass
+class PerformanceConfig:
+    # "objects" keeps one slotted `Agent` per agent; "soa" backs agents with `AgentStore` columns.
+    agent_storage: str = "objects"
+    # "scalar" steers agent by agent; "batch" computes every desired velocity from tick-start state
+    # in one vectorized pass (see `systems/steering_batch.py`).
+    steering_backend: str = "scalar"
+    # "hash" buckets agents in a dict keyed by cell tuple; "dense" uses `DenseSpatialGrid` CSR arrays.
+    spatial_grid: str = "hash"
+    # Batch steering pair source: "directed" finds every pair from both sides in grid order;
+    # "half_shell" finds each unordered pair once and mirrors it (same forces up to rounding).
+    pair_enumeration: str = "directed"
+    # "grid" queries the spatial grid every tick; "verlet" reuses `VerletNeighborList` candidates
+    # gathered at vision_radius + neighbor_skin until an agent may have moved skin / 2.
+    neighbor_search: str = "grid"
+    neighbor_skin: float = 1.0
+    # "in_place" lets later agents see earlier agents' moves within a tick; "double_buffer" makes
+    # every neighbor read see the previous tick and defers cross-agent writes to `TickIntents`.
+    tick_update: str = "in_place"
+    # "compact" rebuilds the agent list without the dead every tick; "free_list" refills dead slots
+    # with newborns and fills leftover holes from the tail (changes update order, so results differ).
+    agent_slots: str = "compact"
+    # "sparse" keeps food cells in a dict; "dense" uses `DenseEnvironmentGrid` 2-D arrays with
+    # whole-array regen/diffusion (same values up to rounding in the diffusion sums).
+    food_field: str = "sparse"
+    # "flat" keeps pheromones in one dict keyed by (x, y, group); "layers" keeps one pooled array per
+    # group (`PheromoneLayers`), so pruning a dead group is one pop. Same values up to rounding.
+    pheromone_field: str = "flat"
+    # "direct" recomputes food/danger/pheromone gradients from 4 neighbor lookups on every read;
+    # "cached" keeps per-cell gradients until an event or environment tick touches the cell.
+    field_gradients: str = "direct"
+    # "dict" diffuses every danger cell down to 1e-5; "region" diffuses only the bounding box of live
+    # cells and drops cells at or below `DANGER_FLOOR` (too weak to steer), so pulses die out sooner.
+    danger_field: str = "dict"
+    # "explicit" spreads `rate * dt` per environment tick (clamped at 1, so large intervals overshoot);
+    # "spectral" solves each tick's diffusion/decay exactly for food, pheromone and danger fields.
+    diffusion_solver: str = "explicit"
+    # "sequential" lets each agent eat from its cell in update order; "batched" records demand per
+    # cell and splits each cell's food evenly at tick end (order-independent; gains land next tick).
+    food_consumption: str = "sequential"
+    # "stride" runs the full group update for every (tick + id) % group_update_stride == 0 agent above
+    # the population threshold; "on_change" runs it only when the agent's neighbor group histogram
+    # signature changes, its detach timer expires or its merge cooldown ends (other agents coast).
+    group_updates: str = "stride"
+    # "stride" reuses last_desired for agents off the (tick + id) % steering_update_stride beat above
+    # the population threshold; "coherent" (scalar backend) reuses it at any population while the
+    # neighbor ids, group, cell, behavior branch and base are unchanged, position / neighbor offsets /
+    # neighbor velocities are within steering_reuse_tolerance and own-cell food / danger are within
+    # steering_field_tolerance of the last recompute (see `core/steering_cache.py`).
+    steering_reuse: str = "stride"
+    steering_reuse_tolerance: float = 0.25
+    steering_field_tolerance: float = 0.05
+    # "off" keeps the configured strides; "budget" lets `TickGovernor` move a stride level at tick
+    # boundaries from the mean tick_duration_ms of the last tick_governor_window ticks: up when over
+    # tick_budget_ms, down when under tick_budget_ms * tick_governor_low_ratio. Level -1 updates every
+    # agent, 0 is the configured strides, each level above adds 1 to both strides and halves their
+    # population thresholds, up to tick_governor_max_level (see `core/tick_governor.py`).
+    tick_governor: str = "off"
+    tick_budget_ms: float = 20.0
+    tick_governor_window: int = 30
+    tick_governor_low_ratio: float = 0.6
+    tick_governor_max_level: int = 3
+
+
 @dataclass
 class SimulationConfig:
     time_step: float = 1.0 / 50.0
@@ -169,12 +233,16 @@ class SimulationConfig:
     boundary_turn_weight: float = 0.85
     cell_size: float = 5.5
     seed: int = 42
+    # 1 draws from one sequential `random.Random` (results depend on update order);
+    # 2 keys draws by (seed, tick, agent id, stream) through `CounterRng`.
+    rng_version: int = 1
     config_version: str = "v1"
     species: SpeciesConfig = field(default_factory=SpeciesConfig)
     environment: EnvironmentConfig = field(default_factory=EnvironmentConfig)
     feedback: FeedbackConfig = field(default_factory=FeedbackConfig)
     evolution: EvolutionConfig = field(default_factory=EvolutionConfig)
     appearance: AppearanceConfig = field(default_factory=AppearanceConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
 
     @staticmethod
     def from_yaml(path: Path) -> "SimulationConfig":
@@ -222,10 +290,12 @@ def load_config(raw: dict) -> SimulationConfig:
     evolution_values = {k: v for k, v in evolution_raw.items() if k != "clamp"}
     evolution = EvolutionConfig(clamp=clamp, **evolution_values)
     appearance = AppearanceConfig(**raw.get("appearance", {}))
+    performance = PerformanceConfig(**raw.get("performance", {}))
     sim_values = {
         k: v
         for k, v in raw.items()
-        if k not in {"species", "environment", "feedback", "resource_patches", "evolution", "appearance"}
+        if k
+        not in {"species", "environment", "feedback", "resource_patches", "evolution", "appearance", "performance"}
     }
     return SimulationConfig(
         species=species,
@@ -233,5 +303,6 @@ def load_config(raw: dict) -> SimulationConfig:
         feedback=feedback,
         evolution=evolution,
         appearance=appearance,
+        performance=performance,
         **sim_values,
     )
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from ..utils.diffusion import SpectralDiffusion
+from ..utils.stencil import _scatter_orthogonal
+
+# Below this level a cell cannot affect steering: the sense threshold is 0.1, and a gradient built
+# from cells that are all <= 0.007 has length^2 <= 2 * 0.007^2 < 1e-4, the steering cutoff.
+DANGER_FLOOR = 0.007
+
+
+class DangerRegion:
+    """
+    Danger field as one grid-sized array plus the bounding box of its nonzero cells.
+
+    Diffusion and decay only touch the box widened by one halo cell, and cells that fall to
+    `floor` or below are zeroed, so a fading pulse collapses to "no danger" (re-enabling the
+    `danger_present=False` steering path) instead of keeping a long 1e-5 tail alive.
+    """
+
+    def __init__(self, size: int, floor: float = DANGER_FLOOR) -> None:
+        self._size = max(1, int(size))
+        self._floor = floor
+        self._field = np.zeros((self._size, self._size), dtype=np.float64)
+        self._box: Tuple[int, int, int, int] | None = None
+        self._cells = 0
+
+    def __bool__(self) -> bool:
+        return self._box is not None
+
+    @property
+    def cells(self) -> int:
+        return self._cells
+
+    @property
+    def box(self) -> Tuple[int, int, int, int] | None:
+        """Half-open `(x0, x1, y0, y1)` bounds of the nonzero cells, or None when empty."""
+
+        return self._box
+
+    def clear(self) -> None:
+        if self._box is not None:
+            x0, x1, y0, y1 = self._box
+            self._field[x0:x1, y0:y1] = 0.0
+        self._box = None
+        self._cells = 0
+
+    def _index(self, key: Tuple[int, int]) -> Tuple[int, int]:
+        last = self._size - 1
+        return (max(0, min(last, key[0])), max(0, min(last, key[1])))
+
+    def sample(self, key: Tuple[int, int]) -> float:
+        x, y = key
+        if 0 <= x < self._size and 0 <= y < self._size:
+            return self._field.item(x, y)
+        return 0.0
+
+    def add(self, key: Tuple[int, int], amount: float) -> None:
+        x, y = self._index(key)
+        previous = self._field.item(x, y)
+        value = previous + amount
+        self._field[x, y] = value
+        if previous == 0.0 and value != 0.0:
+            self._cells += 1
+        if self._box is None:
+            self._box = (x, x + 1, y, y + 1)
+        else:
+            x0, x1, y0, y1 = self._box
+            self._box = (min(x0, x), max(x1, x + 1), min(y0, y), max(y1, y + 1))
+
+    def add_many(self, xs: np.ndarray, ys: np.ndarray, amounts: np.ndarray) -> None:
+        """`add` for distinct in-range cells in one scatter."""
+
+        if xs.shape[0] == 0:
+            return
+        previous = self._field[xs, ys]
+        values = previous + amounts
+        self._field[xs, ys] = values
+        self._cells += int(np.count_nonzero((previous == 0.0) & (values != 0.0)))
+        x0, x1 = int(xs.min()), int(xs.max()) + 1
+        y0, y1 = int(ys.min()), int(ys.max()) + 1
+        if self._box is not None:
+            x0, x1 = min(x0, self._box[0]), max(x1, self._box[1])
+            y0, y1 = min(y0, self._box[2]), max(y1, self._box[3])
+        self._box = (x0, x1, y0, y1)
+
+    def diffuse(
+        self,
+        diffusion_rate: float,
+        decay_rate: float,
+        delta_time: float,
+        solver: SpectralDiffusion | None = None,
+    ) -> None:
+        if self._box is None:
+            return
+        if solver is not None:
+            # The exact step reaches every cell, so it runs on the whole grid and the floor trims it.
+            x0, x1, y0, y1 = 0, self._size, 0, self._size
+            window = self._field
+            window[...] = solver.step(window, diffusion_rate, decay_rate, delta_time)
+        else:
+            x0, x1, y0, y1 = self._box
+            x0 = max(0, x0 - 1)
+            y0 = max(0, y0 - 1)
+            x1 = min(self._size, x1 + 1)
+            y1 = min(self._size, y1 + 1)
+            window = self._field[x0:x1, y0:y1]
+            # The halo ring is empty, so clamping shares at the window edge only matters where the
+            # window edge is the grid edge, which is exactly the clamped-key behavior of the dict field.
+            decayed = np.where(window > 0, window, 0.0) * max(0.0, 1.0 - decay_rate * delta_time)
+            spread = decayed * min(1.0, diffusion_rate * delta_time)
+            np.subtract(decayed, spread, out=window)
+            _scatter_orthogonal(window, spread * 0.25)
+        window[window <= self._floor] = 0.0
+        xs, ys = np.nonzero(window)
+        self._cells = int(xs.shape[0])
+        if self._cells == 0:
+            self._box = None
+        else:
+            self._box = (x0 + int(xs.min()), x0 + int(xs.max()) + 1, y0 + int(ys.min()), y0 + int(ys.max()) + 1)
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Dict, Iterable, Set, Tuple
+from typing import AbstractSet, Dict, Iterable, Sequence, Set, Tuple
 
+import numpy as np
 from pygame.math import Vector2
 
 from .config import EnvironmentConfig, ResourcePatchConfig
+from .danger import DangerRegion
+from .pheromones import PheromoneLayers
+from ..utils.diffusion import SpectralDiffusion
+from ..utils.stencil import _scatter_orthogonal
 
 _ORTHOGONAL_OFFSETS: Tuple[Tuple[int, int], ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
 
@@ -19,7 +24,16 @@ class FoodCell:
 
 
 class EnvironmentGrid:
-    def __init__(self, cell_size: float, config: EnvironmentConfig, world_size: float):
+    def __init__(
+        self,
+        cell_size: float,
+        config: EnvironmentConfig,
+        world_size: float,
+        pheromone_field: str = "flat",
+        cache_gradients: bool = False,
+        danger_field: str = "dict",
+        diffusion_solver: str = "explicit",
+    ):
         self._cell_size = cell_size
         self._world_size = world_size
         self._max_index = max(1, int(math.ceil(world_size / cell_size)))
@@ -33,14 +47,45 @@ class EnvironmentGrid:
         self._danger_diffusion_rate = config.danger_diffusion_rate
         self._danger_decay_rate = config.danger_decay_rate
         self._patches: Iterable[ResourcePatchConfig] = config.resource_patches or []
+        self._build_patch_raster()
 
         self._food_cells: Dict[Tuple[int, int], FoodCell] = {}
         self._food_buffer: Dict[Tuple[int, int], float] = {}
+        # Cells that the next regen step would change; `_food_stray_keys` marks out-of-range keys,
+        # which only the full clamping pass in `_regen_food` knows how to fold back in.
+        self._food_regen_active: Set[Tuple[int, int]] = set()
+        self._food_stray_keys = False
         self._danger_field: Dict[Tuple[int, int], float] = {}
         self._danger_buffer: Dict[Tuple[int, int], float] = {}
         self._pheromone_field: Dict[Tuple[int, int, int], float] = {}
         self._pheromone_buffer: Dict[Tuple[int, int, int], float] = {}
+        # "flat" keeps `_pheromone_field` keyed by (x, y, group); "layers" uses one array per group.
+        if pheromone_field == "flat":
+            self._pheromone_layers: PheromoneLayers | None = None
+        elif pheromone_field == "layers":
+            self._pheromone_layers = PheromoneLayers(self._max_index)
+        else:
+            raise ValueError(f"Unknown pheromone field: {pheromone_field}")
+        # "dict" keeps `_danger_field` keyed by cell; "region" uses a `DangerRegion` bounding box.
+        if danger_field == "dict":
+            self._danger_region: DangerRegion | None = None
+        elif danger_field == "region":
+            self._danger_region = DangerRegion(self._max_index)
+        else:
+            raise ValueError(f"Unknown danger field: {danger_field}")
+        # "explicit" spreads `rate * dt` per tick (clamped at 1); "spectral" solves the step exactly.
+        if diffusion_solver == "explicit":
+            self._spectral: SpectralDiffusion | None = None
+        elif diffusion_solver == "spectral":
+            self._spectral = SpectralDiffusion(self._max_index)
+        else:
+            raise ValueError(f"Unknown diffusion solver: {diffusion_solver}")
         self._food_regen_multiplier = 1.0
+        # Per-cell (dx, dy) gradients, filled on first read; mutators drop the entries they affect.
+        self._cache_gradients = cache_gradients
+        self._food_gradients: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self._danger_gradients: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self._pheromone_gradients: Dict[Tuple[int, int, int], Tuple[float, float]] = {}
 
         self._initialize_patches()
 
@@ -53,6 +98,9 @@ class EnvironmentGrid:
         return {"cells": cells, "resolution": self._max_index, "cell_size": self._cell_size}
 
     def export_pheromone_field(self) -> Dict[str, object]:
+        if self._pheromone_layers is not None:
+            cells = self._pheromone_layers.export()
+            return {"cells": cells, "resolution": self._max_index, "cell_size": self._cell_size}
         if not self._pheromone_field:
             return {"cells": [], "resolution": self._max_index, "cell_size": self._cell_size}
 
@@ -74,11 +122,18 @@ class EnvironmentGrid:
     def reset(self) -> None:
         self._food_cells.clear()
         self._food_buffer.clear()
+        self._food_regen_active.clear()
+        self._food_stray_keys = False
         self._danger_field.clear()
         self._danger_buffer.clear()
+        if self._danger_region is not None:
+            self._danger_region.clear()
         self._pheromone_field.clear()
         self._pheromone_buffer.clear()
+        if self._pheromone_layers is not None:
+            self._pheromone_layers.clear()
         self._food_regen_multiplier = 1.0
+        self._clear_gradients()
         self._initialize_patches()
 
     @property
@@ -99,10 +154,13 @@ class EnvironmentGrid:
             if clamped_key != key:
                 self._food_cells.pop(key, None)
                 existing = self._food_cells.get(clamped_key)
+                self._food_regen_active.discard(key)
                 if existing:
                     existing.value = min(existing.max, existing.value + cell.value)
+                    self._track_food_regen(clamped_key, existing)
                 else:
                     self._food_cells[clamped_key] = cell
+                    self._track_food_regen(clamped_key, cell)
 
     def sample_food(self, position: Vector2 | tuple[int, int]) -> float:
         key = position if isinstance(position, tuple) else self._cell_key(position)
@@ -120,6 +178,8 @@ class EnvironmentGrid:
         cell = self._get_or_create_food_cell(key)
         cell.value = max(0.0, cell.value - amount)
         self._food_cells[key] = cell
+        self._track_food_regen(key, cell)
+        self._invalidate_gradients(self._food_gradients, key)
 
     def add_food(self, position: Vector2 | tuple[int, int], amount: float) -> None:
         if amount <= 0:
@@ -128,64 +188,238 @@ class EnvironmentGrid:
         cell = self._get_or_create_food_cell(key, initial_value=0.0)
         cell.value = min(cell.max, cell.value + amount)
         self._food_cells[key] = cell
+        self._track_food_regen(key, cell)
+        self._invalidate_gradients(self._food_gradients, key)
 
     def sample_danger(self, position: Vector2 | tuple[int, int]) -> float:
         key = position if isinstance(position, tuple) else self._cell_key(position)
+        if self._danger_region is not None:
+            return self._danger_region.sample(key)
         return self._danger_field.get(key, 0.0)
 
     def add_danger(self, position: Vector2 | tuple[int, int], amount: float) -> None:
         key = position if isinstance(position, tuple) else self._cell_key(position)
-        self._danger_field[key] = self._danger_field.get(key, 0.0) + amount
+        if self._danger_region is not None:
+            self._danger_region.add(key, amount)
+        else:
+            self._danger_field[key] = self._danger_field.get(key, 0.0) + amount
+        self._invalidate_gradients(self._danger_gradients, key)
 
     def has_danger(self) -> bool:
+        if self._danger_region is not None:
+            return bool(self._danger_region)
         return bool(self._danger_field)
 
+    def danger_cell_count(self) -> int:
+        if self._danger_region is not None:
+            return self._danger_region.cells
+        return len(self._danger_field)
+
     def sample_pheromone(self, position: Vector2 | tuple[int, int], group_id: int) -> float:
         key = position if isinstance(position, tuple) else self._cell_key(position)
+        if self._pheromone_layers is not None:
+            return self._pheromone_layers.sample(key, group_id)
         field_key = (*key, group_id)
         return self._pheromone_field.get(field_key, 0.0)
 
     def add_pheromone(self, position: Vector2 | tuple[int, int], group_id: int, amount: float) -> None:
-        key = (*position, group_id) if isinstance(position, tuple) else (*self._cell_key(position), group_id)
+        cell = position if isinstance(position, tuple) else self._cell_key(position)
+        if self._pheromone_gradients:
+            for key in self._gradient_dependents(cell):
+                self._pheromone_gradients.pop((*key, group_id), None)
+        if self._pheromone_layers is not None:
+            self._pheromone_layers.add(cell, group_id, amount)
+            return
+        key = (*cell, group_id)
         self._pheromone_field[key] = self._pheromone_field.get(key, 0.0) + amount
 
+    def add_food_events(self, xs: Sequence[int], ys: Sequence[int], amounts: Sequence[float]) -> None:
+        """`add_food` for each distinct in-range cell `(xs[i], ys[i])`, in order."""
+
+        for x, y, amount in zip(xs, ys, amounts):
+            self.add_food((x, y), amount)
+
+    def add_danger_events(self, xs: Sequence[int], ys: Sequence[int], amounts: Sequence[float]) -> None:
+        """`add_danger` for each distinct in-range cell `(xs[i], ys[i])`, in order."""
+
+        if self._danger_region is None:
+            for x, y, amount in zip(xs, ys, amounts):
+                self.add_danger((x, y), amount)
+            return
+        self._danger_region.add_many(
+            np.asarray(xs, dtype=np.intp), np.asarray(ys, dtype=np.intp), np.asarray(amounts, dtype=np.float64)
+        )
+        if self._danger_gradients:
+            for key in zip(xs, ys):
+                self._invalidate_gradients(self._danger_gradients, key)
+
+    def add_pheromone_events(
+        self, xs: Sequence[int], ys: Sequence[int], groups: Sequence[int], amounts: Sequence[float]
+    ) -> None:
+        """`add_pheromone` for each distinct in-range `(xs[i], ys[i], groups[i])`, in order."""
+
+        if self._pheromone_layers is None:
+            for x, y, group_id, amount in zip(xs, ys, groups, amounts):
+                self.add_pheromone((x, y), group_id, amount)
+            return
+        self._pheromone_layers.add_many(
+            np.asarray(xs, dtype=np.intp),
+            np.asarray(ys, dtype=np.intp),
+            np.asarray(groups, dtype=np.int64),
+            np.asarray(amounts, dtype=np.float64),
+        )
+        if self._pheromone_gradients:
+            for x, y, group_id in zip(xs, ys, groups):
+                for key in self._gradient_dependents((x, y)):
+                    self._pheromone_gradients.pop((*key, group_id), None)
+
+    def food_gradient(self, key: Tuple[int, int]) -> Tuple[float, float]:
+        """(right - left, up - down) food around in-range cell `key`; cached when enabled."""
+
+        gradient = self._food_gradients.get(key)
+        if gradient is None:
+            right, left, up, down = self._orthogonal_keys(key)
+            peek = self.peek_food
+            gradient = (peek(right) - peek(left), peek(up) - peek(down))
+            if self._cache_gradients:
+                self._food_gradients[key] = gradient
+        return gradient
+
+    def danger_gradient(self, key: Tuple[int, int]) -> Tuple[float, float]:
+        gradient = self._danger_gradients.get(key)
+        if gradient is None:
+            right, left, up, down = self._orthogonal_keys(key)
+            sample = self.sample_danger
+            gradient = (sample(right) - sample(left), sample(up) - sample(down))
+            if self._cache_gradients:
+                self._danger_gradients[key] = gradient
+        return gradient
+
+    def pheromone_gradient(self, key: Tuple[int, int], group_id: int) -> Tuple[float, float]:
+        field_key = (*key, group_id)
+        gradient = self._pheromone_gradients.get(field_key)
+        if gradient is None:
+            right, left, up, down = self._orthogonal_keys(key)
+            sample = self.sample_pheromone
+            gradient = (
+                sample(right, group_id) - sample(left, group_id),
+                sample(up, group_id) - sample(down, group_id),
+            )
+            if self._cache_gradients:
+                self._pheromone_gradients[field_key] = gradient
+        return gradient
+
+    def _orthogonal_keys(self, key: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        return (
+            self._add_key2(key, 1, 0),
+            self._add_key2(key, -1, 0),
+            self._add_key2(key, 0, 1),
+            self._add_key2(key, 0, -1),
+        )
+
+    def _gradient_dependents(self, key: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        # A cell's value feeds the gradients of its 4 neighbors, and its own when clamped at an edge.
+        return (key, *self._orthogonal_keys(key))
+
+    def _invalidate_gradients(self, cache: Dict[Tuple[int, int], Tuple[float, float]], key: Tuple[int, int]) -> None:
+        if not cache:
+            return
+        for dependent in self._gradient_dependents(key):
+            cache.pop(dependent, None)
+
+    def _clear_gradients(self) -> None:
+        self._food_gradients.clear()
+        self._danger_gradients.clear()
+        self._pheromone_gradients.clear()
+
     def tick(self, delta_time: float) -> None:
+        self._clear_gradients()
         self._regen_food(delta_time)
         self._diffuse_food(delta_time)
-        if self._danger_diffusion_rate > 0 or self._danger_decay_rate > 0:
+        if self._danger_region is not None:
+            if self._danger_diffusion_rate > 0 or self._danger_decay_rate > 0:
+                self._danger_region.diffuse(
+                    self._danger_diffusion_rate, self._danger_decay_rate, delta_time, self._spectral
+                )
+        elif self._danger_diffusion_rate > 0 or self._danger_decay_rate > 0:
             self._diffuse_field(self._danger_field, self._danger_buffer, self._danger_diffusion_rate, self._danger_decay_rate, delta_time)
-        if self._pheromone_diffusion_rate > 0 or self._pheromone_decay_rate > 0:
+        if self._pheromone_layers is not None:
+            if self._pheromone_diffusion_rate > 0 or self._pheromone_decay_rate > 0:
+                self._pheromone_layers.diffuse(
+                    self._pheromone_diffusion_rate, self._pheromone_decay_rate, delta_time, self._spectral
+                )
+        elif self._pheromone_diffusion_rate > 0 or self._pheromone_decay_rate > 0:
             self._diffuse_field(self._pheromone_field, self._pheromone_buffer, self._pheromone_diffusion_rate, self._pheromone_decay_rate, delta_time)
 
+    def food_regen_cell_count(self) -> int:
+        """Food cells the next regen step will visit."""
+
+        return len(self._food_regen_active)
+
+    def _track_food_regen(self, key: Tuple[int, int], cell: FoodCell) -> None:
+        # Regen leaves a cell as is when it is full (and regen is not negative) or has no regen.
+        if (cell.value == cell.max and cell.regen_per_second >= 0) or (
+            cell.value < cell.max and cell.regen_per_second == 0
+        ):
+            self._food_regen_active.discard(key)
+        else:
+            self._food_regen_active.add(key)
+
     def _regen_food(self, delta_time: float) -> None:
         multiplier = self._food_regen_multiplier
-        for key, cell in list(self._food_cells.items()):
-            clamped_key = (
-                max(0, min(self._max_index - 1, key[0])),
-                max(0, min(self._max_index - 1, key[1])),
-            )
-            if clamped_key != key:
-                self._food_cells.pop(key, None)
-                key = clamped_key
+        if self._food_stray_keys:
+            for key, cell in list(self._food_cells.items()):
+                clamped_key = (
+                    max(0, min(self._max_index - 1, key[0])),
+                    max(0, min(self._max_index - 1, key[1])),
+                )
+                if clamped_key != key:
+                    self._food_cells.pop(key, None)
+                    key = clamped_key
+                cell.value = min(cell.max, cell.value + cell.regen_per_second * multiplier * delta_time)
+                self._food_cells[key] = cell
+            self._food_stray_keys = False
+            self._food_regen_active.clear()
+            for key, cell in self._food_cells.items():
+                self._track_food_regen(key, cell)
+            return
+        cells = self._food_cells
+        for key in list(self._food_regen_active):
+            cell = cells.get(key)
+            if cell is None:
+                self._food_regen_active.discard(key)
+                continue
             cell.value = min(cell.max, cell.value + cell.regen_per_second * multiplier * delta_time)
-            self._food_cells[key] = cell
+            self._track_food_regen(key, cell)
 
     def _diffuse_food(self, delta_time: float) -> None:
         if self._food_diffusion_rate <= 0 and self._food_decay_rate <= 0:
             return
 
         self._food_buffer.clear()
-        for key, cell in self._food_cells.items():
-            if cell.value <= 0:
-                continue
-            decayed = cell.value * max(0.0, 1.0 - self._food_decay_rate * delta_time)
-            spread_portion = decayed * min(1.0, self._food_diffusion_rate * delta_time)
-            remain = decayed - spread_portion
-            share = spread_portion * 0.25
-
-            self._accumulate(self._food_buffer, key, remain)
-            for ox, oy in _ORTHOGONAL_OFFSETS:
-                self._accumulate(self._food_buffer, self._add_key(key, ox, oy), share)
+        if self._spectral is not None:
+            field = np.zeros((self._max_index, self._max_index), dtype=np.float64)
+            for key, cell in self._food_cells.items():
+                if cell.value > 0:
+                    field[key] = cell.value
+            self._fill_buffer(
+                self._food_buffer,
+                self._spectral.step(field, self._food_diffusion_rate, self._food_decay_rate, delta_time),
+                (),
+                0.0,
+            )
+        else:
+            for key, cell in self._food_cells.items():
+                if cell.value <= 0:
+                    continue
+                decayed = cell.value * max(0.0, 1.0 - self._food_decay_rate * delta_time)
+                spread_portion = decayed * min(1.0, self._food_diffusion_rate * delta_time)
+                remain = decayed - spread_portion
+                share = spread_portion * 0.25
+
+                self._accumulate(self._food_buffer, key, remain)
+                for ox, oy in _ORTHOGONAL_OFFSETS:
+                    self._accumulate(self._food_buffer, self._add_key(key, ox, oy), share)
 
         for key, value in self._food_buffer.items():
             if value <= 1e-4:
@@ -193,13 +427,18 @@ class EnvironmentGrid:
             cell = self._get_or_create_food_cell(key, create_if_missing=True, initial_value=0.0)
             cell.value = min(cell.max, value)
             self._food_cells[key] = cell
+            self._track_food_regen(key, cell)
 
         for key in list(self._food_cells.keys()):
             if key not in self._food_buffer and self._food_cells[key].value <= 1e-4:
                 self._food_cells.pop(key, None)
+                self._food_regen_active.discard(key)
 
     def _diffuse_field(self, field: Dict[Tuple[int, ...], float], buffer: Dict[Tuple[int, ...], float], diffusion_rate: float, decay_rate: float, delta_time: float) -> None:
         buffer.clear()
+        if self._spectral is not None:
+            self._diffuse_field_spectral(field, diffusion_rate, decay_rate, delta_time)
+            return
         for key, value in field.items():
             if value <= 0:
                 continue
@@ -217,7 +456,31 @@ class EnvironmentGrid:
             if value > 1e-5:
                 field[key] = value
 
-    def prune_pheromones(self, active_groups: Set[int]) -> None:
+    def _diffuse_field_spectral(self, field: Dict[Tuple[int, ...], float], diffusion_rate: float, decay_rate: float, delta_time: float) -> None:
+        assert self._spectral is not None
+        # One array per key suffix: () for danger, (group_id,) for pheromones.
+        layers: Dict[Tuple[int, ...], np.ndarray] = {}
+        for key, value in field.items():
+            if value <= 0:
+                continue
+            layer = layers.get(key[2:])
+            if layer is None:
+                layer = layers[key[2:]] = np.zeros((self._max_index, self._max_index), dtype=np.float64)
+            layer[self._add_key2((key[0], key[1]), 0, 0)] += value
+        field.clear()
+        for suffix, layer in layers.items():
+            self._fill_buffer(field, self._spectral.step(layer, diffusion_rate, decay_rate, delta_time), suffix, 1e-5)
+
+    def _fill_buffer(self, buffer: Dict[Tuple[int, ...], float], values: np.ndarray, suffix: Tuple[int, ...], floor: float) -> None:
+        xs, ys = np.nonzero(values > floor)
+        for x, y, value in zip(xs.tolist(), ys.tolist(), values[xs, ys].tolist()):
+            buffer[(x, y, *suffix)] = value
+
+    def prune_pheromones(self, active_groups: AbstractSet[int]) -> None:
+        self._pheromone_gradients.clear()
+        if self._pheromone_layers is not None:
+            self._pheromone_layers.prune(active_groups)
+            return
         if not self._pheromone_field:
             return
         if not active_groups:
@@ -251,23 +514,56 @@ class EnvironmentGrid:
         if not create_if_missing:
             return FoodCell(0.0, 0.0, 0.0)
 
-        max_food = self._default_max_food
-        regen = self._default_food_regen_per_second
-        start_value = self._default_initial_food if initial_value is None else initial_value
-        for patch in self._patches:
-            px, py = patch.position
-            dx = key[0] * self._cell_size - px
-            dy = key[1] * self._cell_size - py
-            if math.hypot(dx, dy) <= patch.radius:
-                max_food = patch.resource_per_cell
-                regen = patch.regen_per_second
-                start_value = patch.initial_resource
-                break
-
-        cell = FoodCell(value=start_value, max=max_food, regen_per_second=regen)
+        patch = self._patch_at(key)
+        if patch:
+            start_value = self._patch_initial[patch]
+        else:
+            start_value = self._default_initial_food if initial_value is None else initial_value
+        cell = FoodCell(value=start_value, max=self._patch_max[patch], regen_per_second=self._patch_regen[patch])
         self._food_cells[key] = cell
+        if 0 <= key[0] < self._max_index and 0 <= key[1] < self._max_index:
+            self._track_food_regen(key, cell)
+        else:
+            self._food_stray_keys = True
+        self._invalidate_gradients(self._food_gradients, key)
         return cell
 
+    def _build_patch_raster(self) -> None:
+        """
+        Rasterize patch membership once: `_patch_index[x, y]` is 0 outside every patch, else 1 + the
+        index of the first patch whose radius covers the cell's corner. Row 0 of the lookup tables
+        holds the environment defaults. `reset()` keeps the raster.
+        """
+
+        patches = list(self._patches)
+        self._patch_max = [self._default_max_food] + [patch.resource_per_cell for patch in patches]
+        self._patch_regen = [self._default_food_regen_per_second] + [patch.regen_per_second for patch in patches]
+        self._patch_initial = [self._default_initial_food] + [patch.initial_resource for patch in patches]
+        size = self._max_index
+        raster = np.zeros((size, size), dtype=np.int32)
+        corner = np.arange(size, dtype=np.float64) * self._cell_size
+        for number in range(len(patches), 0, -1):
+            px, py = patches[number - 1].position
+            radius = patches[number - 1].radius
+            distance = np.hypot(corner[:, None] - px, corner[None, :] - py)
+            inside = distance <= radius
+            # Settle cells right at the rim with `math.hypot`, the scalar test this raster replaces.
+            for x, y in zip(*np.nonzero(np.abs(distance - radius) <= 1e-9 * max(1.0, abs(radius)))):
+                inside[x, y] = math.hypot(x * self._cell_size - px, y * self._cell_size - py) <= radius
+            raster[inside] = number
+        self._patch_index = raster
+
+    def _patch_at(self, key: Tuple[int, int]) -> int:
+        x, y = key
+        size = self._max_index
+        if 0 <= x < size and 0 <= y < size:
+            return self._patch_index.item(x, y)
+        for number, patch in enumerate(self._patches, start=1):
+            px, py = patch.position
+            if math.hypot(x * self._cell_size - px, y * self._cell_size - py) <= patch.radius:
+                return number
+        return 0
+
     def _cell_key(self, position: Vector2) -> Tuple[int, int]:
         clamped_x = max(0.0, min(self._world_size, position.x))
         clamped_y = max(0.0, min(self._world_size, position.y))
@@ -292,3 +588,161 @@ class EnvironmentGrid:
                         regen_per_second=patch.regen_per_second,
                     )
                     self._food_cells[key] = cell
+                    self._track_food_regen(key, cell)
+
+
+class DenseEnvironmentGrid(EnvironmentGrid):
+    """
+    `EnvironmentGrid` with the food field held in dense `(x, y)` arrays over the bounded cell range.
+
+    `_food_active` marks the cells the sparse grid would hold in its dict, so untouched cells still
+    read as empty, start at the default/patch value when first sampled and only regenerate once
+    they exist. Keys are clamped into range on access. Regen, decay and 4-neighbor diffusion (edge
+    shares fall back onto the edge cell) run as whole-array operations; per-cell terms match the
+    sparse grid exactly, but diffusion sums neighbor shares in a fixed order instead of dict order,
+    so values can differ from the sparse grid by rounding.
+    """
+
+    def _reset_food_arrays(self) -> None:
+        shape = (self._max_index, self._max_index)
+        self._food_value = np.zeros(shape, dtype=np.float64)
+        self._food_max = np.zeros(shape, dtype=np.float64)
+        self._food_regen = np.zeros(shape, dtype=np.float64)
+        self._food_active = np.zeros(shape, dtype=np.bool_)
+
+    def _build_patch_raster(self) -> None:
+        super()._build_patch_raster()
+        raster = self._patch_index
+        self._default_food = (
+            np.asarray(self._patch_max, dtype=np.float64)[raster],
+            np.asarray(self._patch_regen, dtype=np.float64)[raster],
+        )
+
+    def _food_index(self, position: Vector2 | tuple[int, int]) -> Tuple[int, int]:
+        if not isinstance(position, tuple):
+            return self._cell_key(position)
+        last = self._max_index - 1
+        return (max(0, min(last, position[0])), max(0, min(last, position[1])))
+
+    def _activate_food_cell(self, index: Tuple[int, int], initial_value: float | None) -> None:
+        self._invalidate_gradients(self._food_gradients, index)
+        max_food, regen = self._default_food
+        self._food_active[index] = True
+        self._food_max[index] = max_food[index]
+        self._food_regen[index] = regen[index]
+        patch = self._patch_index.item(index)
+        if patch:
+            self._food_value[index] = self._patch_initial[patch]
+        else:
+            self._food_value[index] = self._default_initial_food if initial_value is None else initial_value
+
+    def export_food_cells(self) -> Dict[str, object]:
+        xs, ys = np.nonzero(self._food_active & (self._food_value > 0.0))
+        values = self._food_value[xs, ys].tolist()
+        cells = [{"x": x, "y": y, "value": value} for x, y, value in zip(xs.tolist(), ys.tolist(), values)]
+        return {"cells": cells, "resolution": self._max_index, "cell_size": self._cell_size}
+
+    def _sanitize_food_keys(self) -> None:
+        return
+
+    def sample_food(self, position: Vector2 | tuple[int, int]) -> float:
+        index = self._food_index(position)
+        if not self._food_active[index]:
+            self._activate_food_cell(index, None)
+        return self._food_value.item(index)
+
+    def peek_food(self, position: Vector2 | tuple[int, int]) -> float:
+        return self._food_value.item(self._food_index(position))
+
+    def consume_food(self, position: Vector2 | tuple[int, int], amount: float) -> None:
+        index = self._food_index(position)
+        if not self._food_active[index]:
+            self._activate_food_cell(index, None)
+        self._food_value[index] = max(0.0, self._food_value.item(index) - amount)
+        self._invalidate_gradients(self._food_gradients, index)
+
+    def add_food(self, position: Vector2 | tuple[int, int], amount: float) -> None:
+        if amount <= 0:
+            return
+        index = self._food_index(position)
+        if not self._food_active[index]:
+            self._activate_food_cell(index, 0.0)
+        self._food_value[index] = min(self._food_max.item(index), self._food_value.item(index) + amount)
+        self._invalidate_gradients(self._food_gradients, index)
+
+    def add_food_events(self, xs: Sequence[int], ys: Sequence[int], amounts: Sequence[float]) -> None:
+        amount = np.asarray(amounts, dtype=np.float64)
+        keep = amount > 0
+        x = np.asarray(xs, dtype=np.intp)[keep]
+        y = np.asarray(ys, dtype=np.intp)[keep]
+        amount = amount[keep]
+        inactive = np.flatnonzero(~self._food_active[x, y])
+        for key in zip(x[inactive].tolist(), y[inactive].tolist()):
+            self._activate_food_cell(key, 0.0)
+        self._food_value[x, y] = np.minimum(self._food_max[x, y], self._food_value[x, y] + amount)
+        if self._food_gradients:
+            for key in zip(x.tolist(), y.tolist()):
+                self._invalidate_gradients(self._food_gradients, key)
+
+    def food_regen_cell_count(self) -> int:
+        value = self._food_value
+        full = (value == self._food_max) & (self._food_regen >= 0)
+        idle = (value < self._food_max) & (self._food_regen == 0)
+        return int(np.count_nonzero(self._food_active & ~(full | idle)))
+
+    def _regen_food(self, delta_time: float) -> None:
+        value = self._food_value
+        grown = value + self._food_regen * self._food_regen_multiplier * delta_time
+        np.minimum(self._food_max, grown, out=value, where=self._food_active)
+
+    def _diffuse_food(self, delta_time: float) -> None:
+        if self._food_diffusion_rate <= 0 and self._food_decay_rate <= 0:
+            return
+
+        value = self._food_value
+        active = self._food_active
+        source = active & (value > 0)
+        if self._spectral is not None:
+            buffer = self._spectral.step(
+                np.where(source, value, 0.0), self._food_diffusion_rate, self._food_decay_rate, delta_time
+            )
+            touched = source | (buffer > 0.0)
+        else:
+            decayed = np.where(source, value, 0.0) * max(0.0, 1.0 - self._food_decay_rate * delta_time)
+            spread_portion = decayed * min(1.0, self._food_diffusion_rate * delta_time)
+            buffer = decayed - spread_portion
+            share = spread_portion * 0.25
+            _scatter_orthogonal(buffer, share)
+            touched = source.copy()
+            _scatter_orthogonal(touched, source)
+
+        updated = touched & (buffer > 1e-4)
+        created = updated & ~active
+        if created.any():
+            max_food, regen = self._default_food
+            active |= created
+            self._food_max[created] = max_food[created]
+            self._food_regen[created] = regen[created]
+        np.minimum(self._food_max, buffer, out=value, where=updated)
+
+        removed = active & ~touched & (value <= 1e-4)
+        active &= ~removed
+        value[removed] = 0.0
+
+    def _initialize_patches(self) -> None:
+        self._reset_food_arrays()
+        if not self._patches:
+            return
+
+        for patch in self._patches:
+            cx = int(patch.position[0] // self._cell_size)
+            cy = int(patch.position[1] // self._cell_size)
+            radius_cells = int(max(1, patch.radius // self._cell_size))
+            for dx in range(-radius_cells, radius_cells + 1):
+                for dy in range(-radius_cells, radius_cells + 1):
+                    index = self._add_key((cx, cy), dx, dy)
+                    self._food_active[index] = True
+                    self._food_value[index] = patch.initial_resource
+                    self._food_max[index] = patch.resource_per_cell
+                    self._food_regen[index] = patch.regen_per_second
+
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterator, List, MutableMapping, Tuple
+
+from pygame.math import Vector2
+
+
+class GroupBaseIndex(MutableMapping[int, Vector2]):
+    """
+    Group id -> base position, iterated in insertion order like the dict it replaces, with every
+    base also bucketed by grid cell.
+
+    `nearest` answers "closest base strictly inside the radius" from the buckets the radius
+    overlaps. Ties go to the base inserted first, which is what a strict `<` scan over the dict
+    picks, so results match the linear scan exactly. Stored positions must not be mutated in
+    place; assign a new `Vector2` instead so the base moves to its new bucket.
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        self._cell_size = max(1e-6, float(cell_size))
+        self._bases: Dict[int, Vector2] = {}
+        self._order: Dict[int, int] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._next_order = 0
+
+    def __getitem__(self, group_id: int) -> Vector2:
+        return self._bases[group_id]
+
+    def __setitem__(self, group_id: int, position: Vector2) -> None:
+        if group_id in self._bases:
+            self._unbucket(group_id)
+        else:
+            self._order[group_id] = self._next_order
+            self._next_order += 1
+        self._bases[group_id] = position
+        cell = (int(math.floor(position.x / self._cell_size)), int(math.floor(position.y / self._cell_size)))
+        self._cell_of[group_id] = cell
+        self._cells.setdefault(cell, []).append(group_id)
+
+    def __delitem__(self, group_id: int) -> None:
+        del self._bases[group_id]
+        self._unbucket(group_id)
+        del self._order[group_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._bases)
+
+    def __len__(self) -> int:
+        return len(self._bases)
+
+    def get(self, group_id: int, default: Vector2 | None = None) -> Vector2 | None:  # type: ignore[override]
+        return self._bases.get(group_id, default)
+
+    def values(self):  # type: ignore[override]
+        return self._bases.values()
+
+    def items(self):  # type: ignore[override]
+        return self._bases.items()
+
+    def clear(self) -> None:
+        self._bases.clear()
+        self._order.clear()
+        self._cell_of.clear()
+        self._cells.clear()
+
+    def _unbucket(self, group_id: int) -> None:
+        cell = self._cell_of.pop(group_id)
+        bucket = self._cells[cell]
+        bucket.remove(group_id)
+        if not bucket:
+            del self._cells[cell]
+
+    def nearest(self, x: float, y: float, radius_sq: float) -> Tuple[int, float, float, float] | None:
+        """`(group_id, dx, dy, dist_sq)` of the closest base with `1e-12 < dist_sq < radius_sq`, or None."""
+
+        if not self._bases:
+            return None
+        radius = math.sqrt(radius_sq)
+        size = self._cell_size
+        x0 = int(math.floor((x - radius) / size))
+        x1 = int(math.floor((x + radius) / size))
+        y0 = int(math.floor((y - radius) / size))
+        y1 = int(math.floor((y + radius) / size))
+        if (x1 - x0 + 1) * (y1 - y0 + 1) >= len(self._bases):
+            candidates: List[int] | Iterator[int] = iter(self._bases)
+        else:
+            cells = self._cells
+            candidates = [
+                group_id
+                for cx in range(x0, x1 + 1)
+                for cy in range(y0, y1 + 1)
+                for group_id in cells.get((cx, cy), ())
+            ]
+        bases = self._bases
+        order = self._order
+        best = None
+        best_dist_sq = radius_sq
+        best_order = -1
+        for group_id in candidates:
+            base = bases[group_id]
+            dx = base.x - x
+            dy = base.y - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= 1e-12 or dist_sq > best_dist_sq:
+                continue
+            rank = order[group_id]
+            if dist_sq == best_dist_sq and (best is None or rank > best_order):
+                continue
+            best = (group_id, dx, dy, dist_sq)
+            best_dist_sq = dist_sq
+            best_order = rank
+        return best
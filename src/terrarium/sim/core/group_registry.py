@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, KeysView, Set
+
+from .agent import Agent
+
+
+class GroupRegistry:
+    """
+    Member ids of every group among the agents in `World._agents`, kept current by `set_group`,
+    births (when they join the list) and deaths (when the dead leave it) instead of by rescanning.
+
+    A group with no members is dropped, so `active` is always the set of groups in the world.
+    `tick_size` still answers with the size a group had when the tick began: the first change to
+    a group in a tick records its old size, which keeps mid-tick reads the same as the per-tick
+    recount this replaces.
+    """
+
+    def __init__(self) -> None:
+        self._members: Dict[int, Set[int]] = {}
+        self._tick_sizes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def active(self) -> KeysView[int]:
+        return self._members.keys()
+
+    def members(self, group_id: int) -> Set[int]:
+        return self._members.get(group_id, set())
+
+    def size(self, group_id: int) -> int:
+        members = self._members.get(group_id)
+        return 0 if members is None else len(members)
+
+    def tick_size(self, group_id: int, default: int = 0) -> int:
+        """Size of `group_id` at the start of the tick, or `default` if it had no members then."""
+
+        size = self._tick_sizes.get(group_id)
+        if size is None:
+            size = self.size(group_id)
+        return size if size > 0 else default
+
+    def begin_tick(self) -> None:
+        self._tick_sizes.clear()
+
+    def add(self, agent_id: int, group_id: int) -> None:
+        if group_id < 0:
+            return
+        members = self._members.get(group_id)
+        if members is None:
+            self._tick_sizes.setdefault(group_id, 0)
+            self._members[group_id] = {agent_id}
+            return
+        self._tick_sizes.setdefault(group_id, len(members))
+        members.add(agent_id)
+
+    def remove(self, agent_id: int, group_id: int) -> None:
+        if group_id < 0:
+            return
+        members = self._members.get(group_id)
+        if members is None or agent_id not in members:
+            return
+        self._tick_sizes.setdefault(group_id, len(members))
+        members.discard(agent_id)
+        if not members:
+            del self._members[group_id]
+
+    def move(self, agent_id: int, old_group: int, new_group: int) -> None:
+        if old_group == new_group:
+            return
+        self.remove(agent_id, old_group)
+        self.add(agent_id, new_group)
+
+    def rebuild(self, agents: Iterable[Agent]) -> None:
+        self._members.clear()
+        self._tick_sizes.clear()
+        for agent in agents:
+            if agent.group_id >= 0:
+                self._members.setdefault(agent.group_id, set()).add(agent.id)
+
+    def clear(self) -> None:
+        self._members.clear()
+        self._tick_sizes.clear()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+from pygame.math import Vector2
+
+from .spatial_grid import build_neighbor_pairs
+
+if TYPE_CHECKING:
+    from .agent import Agent
+
+
+class VerletNeighborList:
+    """
+    Per-agent neighbor candidates gathered at `radius + skin` and reused across ticks.
+
+    A pair missing from the lists can only come within `radius` once the two agents together
+    have moved more than `skin` since the lists were gathered. `note_moved` tracks the largest
+    displacement, and `collect` rebuilds from live positions before answering a query that could
+    miss such a pair (`begin_tick` also rebuilds once any agent has moved `skin / 2`). Agents born
+    since the last rebuild are inserted with a brute-force scan, and removed agents are skipped.
+
+    `collect` re-filters candidates by live distance and applies the same cell stencil as
+    `SpatialGrid` (neighbor cell from tick-start position, base cell from the live position),
+    then orders the result by stencil cell and list index, so the output matches a grid query.
+    """
+
+    def __init__(self, cell_size: float, radius: float, skin: float) -> None:
+        self._cell_size = cell_size
+        self._radius_sq = radius * radius
+        self._skin = max(0.0, float(skin))
+        self._reach = int(math.ceil(radius / cell_size))
+        self._stencil_width = 2 * self._reach + 1
+        build_radius = radius + self._skin
+        self._build_radius_sq = build_radius * build_radius
+        build_range = int(math.ceil(build_radius / cell_size))
+        self._build_offsets = [
+            (dx, dy) for dx in range(-build_range, build_range + 1) for dy in range(-build_range, build_range + 1)
+        ]
+        self._candidates: Dict[int, List["Agent"]] = {}
+        self._reference: Dict[int, Tuple[float, float]] = {}
+        self._tick_cells: Dict[int, Tuple[int, int, int]] = {}
+        self._found: List[tuple] = []
+        self._agents: Sequence["Agent"] = ()
+        self._max_disp = 0.0
+        self._built = False
+        self.rebuilds = 0
+        self.tick_rebuilds = 0
+        self.candidates_checked = 0
+
+    def clear(self) -> None:
+        self._candidates.clear()
+        self._reference.clear()
+        self._tick_cells.clear()
+        self._agents = ()
+        self._max_disp = 0.0
+        self._built = False
+        self.tick_rebuilds = 0
+        self.candidates_checked = 0
+
+    def begin_tick(self, agents: Sequence["Agent"]) -> None:
+        """Record tick-start cells, drop removed agents, add newborns or rebuild the lists."""
+
+        cell_size = self._cell_size
+        tick_cells = self._tick_cells
+        tick_cells.clear()
+        reference = self._reference
+        pos_x: List[float] = []
+        pos_y: List[float] = []
+        newborn: List[int] = []
+        max_disp_sq = 0.0
+        for index, agent in enumerate(agents):
+            position = agent.position
+            x = position.x
+            y = position.y
+            pos_x.append(x)
+            pos_y.append(y)
+            tick_cells[agent.id] = (int(x // cell_size), int(y // cell_size), index)
+            origin = reference.get(agent.id)
+            if origin is None:
+                newborn.append(index)
+                continue
+            dx = x - origin[0]
+            dy = y - origin[1]
+            disp_sq = dx * dx + dy * dy
+            if disp_sq > max_disp_sq:
+                max_disp_sq = disp_sq
+        self._agents = agents
+        self.tick_rebuilds = 0
+        self.candidates_checked = 0
+        max_disp = math.sqrt(max_disp_sq)
+
+        xs = np.asarray(pos_x, dtype=np.float64)
+        ys = np.asarray(pos_y, dtype=np.float64)
+        if not self._built or max_disp > 0.5 * self._skin or len(newborn) * 4 > len(agents):
+            self._rebuild(xs, ys)
+            return
+
+        self._max_disp = max_disp
+        if newborn:
+            self._insert_newborn(xs, ys, newborn, max_disp)
+        if len(reference) > len(tick_cells):
+            for agent_id in [agent_id for agent_id in reference if agent_id not in tick_cells]:
+                del reference[agent_id]
+                self._candidates.pop(agent_id, None)
+
+    def note_moved(self, agent: "Agent") -> None:
+        origin = self._reference.get(agent.id)
+        if origin is None:
+            return
+        position = agent.position
+        dx = position.x - origin[0]
+        dy = position.y - origin[1]
+        disp = math.sqrt(dx * dx + dy * dy)
+        if disp > self._max_disp:
+            self._max_disp = disp
+
+    def _rebuild_live(self) -> None:
+        agents = self._agents
+        xs = np.fromiter((agent.position.x for agent in agents), dtype=np.float64, count=len(agents))
+        ys = np.fromiter((agent.position.y for agent in agents), dtype=np.float64, count=len(agents))
+        self._rebuild(xs, ys)
+
+    def _rebuild(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        agents = self._agents
+        candidates = self._candidates
+        reference = self._reference
+        candidates.clear()
+        reference.clear()
+        pairs = build_neighbor_pairs(xs, ys, self._cell_size, self._build_offsets, self._build_radius_sq)
+        starts = np.searchsorted(pairs.agent_index, np.arange(len(agents) + 1)).tolist()
+        neighbor_index = pairs.neighbor_index.tolist()
+        for index, agent in enumerate(agents):
+            candidates[agent.id] = [agents[j] for j in neighbor_index[starts[index] : starts[index + 1]]]
+            reference[agent.id] = (float(xs[index]), float(ys[index]))
+        self._built = True
+        self._max_disp = 0.0
+        self.rebuilds += 1
+        self.tick_rebuilds += 1
+
+    def _insert_newborn(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        newborn: List[int],
+        max_disp: float,
+    ) -> None:
+        # Existing agents may already have drifted up to `max_disp` from their reference, so the
+        # newborn scan widens the build radius by that much to keep the skin guarantee.
+        radius = math.sqrt(self._build_radius_sq) + max_disp
+        radius_sq = radius * radius
+        agents = self._agents
+        is_newborn = np.zeros(len(agents), dtype=np.bool_)
+        is_newborn[newborn] = True
+        candidates = self._candidates
+        for index in newborn:
+            agent = agents[index]
+            dx = xs - xs[index]
+            dy = ys - ys[index]
+            near = np.flatnonzero(dx * dx + dy * dy <= radius_sq)
+            near = near[near != index]
+            own = [agents[j] for j in near.tolist()]
+            for j in near[~is_newborn[near]].tolist():
+                candidates[agents[j].id].append(agent)
+            candidates[agent.id] = own
+            self._reference[agent.id] = (float(xs[index]), float(ys[index]))
+
+    def collect(
+        self,
+        agent: "Agent",
+        out_agents: List["Agent"],
+        out_offsets: List[Vector2],
+        out_dist_sq: List[float] | None = None,
+    ) -> None:
+        """Fill the buffers like `SpatialGrid.collect_neighbors_precomputed` with `exclude_id=agent.id`."""
+
+        position = agent.position
+        pos_x = position.x
+        pos_y = position.y
+        origin = self._reference.get(agent.id)
+        if origin is not None:
+            dx = pos_x - origin[0]
+            dy = pos_y - origin[1]
+            if math.sqrt(dx * dx + dy * dy) + self._max_disp > self._skin:
+                self._rebuild_live()
+        cell_size = self._cell_size
+        base_x = int(pos_x // cell_size)
+        base_y = int(pos_y // cell_size)
+        reach = self._reach
+        width = self._stencil_width
+        radius_sq = self._radius_sq
+        tick_cells = self._tick_cells
+        agents = self._agents
+        found = self._found
+        found.clear()
+        candidates = self._candidates.get(agent.id, ())
+        self.candidates_checked += len(candidates)
+        for candidate in candidates:
+            cell = tick_cells.get(candidate.id)
+            if cell is None:
+                continue
+            dcx = cell[0] - base_x
+            dcy = cell[1] - base_y
+            if dcx < -reach or dcx > reach or dcy < -reach or dcy > reach:
+                continue
+            # Answer with this tick's object for the id; the candidate may be an older copy or view.
+            other = agents[cell[2]]
+            pos = other.position
+            offset_x = pos.x - pos_x
+            offset_y = pos.y - pos_y
+            dist_sq = offset_x * offset_x + offset_y * offset_y
+            if dist_sq <= radius_sq:
+                found.append(((dcx + reach) * width + dcy + reach, cell[2], other, offset_x, offset_y, dist_sq))
+        # (stencil cell, list index) is unique per neighbor, so the sort never compares agents.
+        found.sort()
+
+        out_agents.clear()
+        if out_dist_sq is not None:
+            out_dist_sq.clear()
+        count = 0
+        for _, _, other, offset_x, offset_y, dist_sq in found:
+            out_agents.append(other)
+            if count < len(out_offsets):
+                out_offsets[count].update(offset_x, offset_y)
+            else:
+                out_offsets.append(Vector2(offset_x, offset_y))
+            if out_dist_sq is not None:
+                out_dist_sq.append(dist_sq)
+            count += 1
+        del out_offsets[count:]
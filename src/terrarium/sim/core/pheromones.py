@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import AbstractSet, Dict, List, Tuple
+
+import numpy as np
+
+from ..utils.diffusion import SpectralDiffusion
+from ..utils.stencil import _scatter_orthogonal
+
+
+class PheromoneLayers:
+    """
+    Pheromone field stored as one dense `(x, y)` layer per group id.
+
+    Layers are taken from a pool when a group first deposits and returned to it when the group is
+    pruned or its layer has fully decayed, so dropping a dead group costs one dict pop instead of
+    a scan over every cell. Diffusion follows `EnvironmentGrid._diffuse_field` cell for cell
+    (values at or below 1e-5 are dropped) but sums neighbor shares in a fixed order, so values can
+    differ from the flat dict field by rounding.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = max(1, int(size))
+        self._layers: Dict[int, np.ndarray] = {}
+        self._pool: List[np.ndarray] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._layers)
+
+    @property
+    def groups(self) -> List[int]:
+        return list(self._layers)
+
+    def clear(self) -> None:
+        for group_id in list(self._layers):
+            self._release(group_id)
+
+    def _index(self, key: Tuple[int, int]) -> Tuple[int, int]:
+        last = self._size - 1
+        return (max(0, min(last, key[0])), max(0, min(last, key[1])))
+
+    def _acquire(self, group_id: int) -> np.ndarray:
+        layer = self._layers.get(group_id)
+        if layer is None:
+            layer = self._pool.pop() if self._pool else np.zeros((self._size, self._size), dtype=np.float64)
+            self._layers[group_id] = layer
+        return layer
+
+    def _release(self, group_id: int) -> None:
+        layer = self._layers.pop(group_id)
+        layer.fill(0.0)
+        self._pool.append(layer)
+
+    def sample(self, key: Tuple[int, int], group_id: int) -> float:
+        layer = self._layers.get(group_id)
+        if layer is None:
+            return 0.0
+        return layer.item(self._index(key))
+
+    def add(self, key: Tuple[int, int], group_id: int, amount: float) -> None:
+        index = self._index(key)
+        layer = self._acquire(group_id)
+        layer[index] = layer.item(index) + amount
+
+    def add_many(self, xs: np.ndarray, ys: np.ndarray, groups: np.ndarray, amounts: np.ndarray) -> None:
+        """`add` for distinct in-range (cell, group) targets; new groups get layers in first-seen order."""
+
+        for group_id in dict.fromkeys(groups.tolist()):
+            rows = groups == group_id
+            layer = self._acquire(group_id)
+            layer[xs[rows], ys[rows]] += amounts[rows]
+
+    def prune(self, active_groups: AbstractSet[int]) -> None:
+        for group_id in [group_id for group_id in self._layers if group_id not in active_groups]:
+            self._release(group_id)
+
+    def diffuse(
+        self,
+        diffusion_rate: float,
+        decay_rate: float,
+        delta_time: float,
+        solver: SpectralDiffusion | None = None,
+    ) -> None:
+        keep = max(0.0, 1.0 - decay_rate * delta_time)
+        spread_rate = min(1.0, diffusion_rate * delta_time)
+        for group_id, layer in list(self._layers.items()):
+            if solver is not None:
+                layer[...] = solver.step(layer, diffusion_rate, decay_rate, delta_time)
+            else:
+                decayed = np.where(layer > 0, layer, 0.0) * keep
+                spread = decayed * spread_rate
+                np.subtract(decayed, spread, out=layer)
+                _scatter_orthogonal(layer, spread * 0.25)
+            layer[layer <= 1e-5] = 0.0
+            if not layer.any():
+                self._release(group_id)
+
+    def export(self) -> List[Dict[str, object]]:
+        """Strongest group per cell, as `export_pheromone_field` cells."""
+
+        if not self._layers:
+            return []
+        group_ids = np.fromiter(self._layers, dtype=np.int64, count=len(self._layers))
+        stacked = np.stack(list(self._layers.values()))
+        best = stacked.argmax(axis=0)
+        values = np.take_along_axis(stacked, best[None], axis=0)[0]
+        xs, ys = np.nonzero(values > 0.0)
+        return [
+            {"x": x, "y": y, "value": value, "group": group}
+            for x, y, value, group in zip(
+                xs.tolist(), ys.tolist(), values[xs, ys].tolist(), group_ids[best[xs, ys]].tolist()
+            )
+        ]
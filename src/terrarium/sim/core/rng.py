@@ -4,6 +4,7 @@ import math
 import random
 from typing import Optional
 
+import numpy as np
 from pygame.math import Vector2
 
 
@@ -32,3 +33,123 @@ class DeterministicRng:
         if not items:
             return None
         return self._random.choice(items)
+
+    def begin_tick(self, tick: int) -> None:
+        pass
+
+    def bind(self, agent_id: int, stream: int) -> None:
+        pass
+
+
+# Purposes that key `CounterRng` draws; each per-agent system binds its own stream.
+STREAM_SPAWN = 0
+STREAM_STEERING = 1
+STREAM_GROUPS = 2
+STREAM_LIFECYCLE = 3
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_FLOAT_SCALE = 1.0 / (1 << 53)
+
+
+def _mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _mix64_array(z: np.ndarray) -> np.ndarray:
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def counter_key(seed: int, tick: int, agent_id: int, stream: int) -> int:
+    key = seed & _MASK64
+    for part in (tick, agent_id, stream):
+        key = _mix64(((key ^ (part & _MASK64)) + _GOLDEN) & _MASK64)
+    return key
+
+
+def counter_keys(seed: int, tick: int, agent_ids: np.ndarray, stream: int) -> np.ndarray:
+    """Vectorized `counter_key` for many agents at once (same bits as the scalar version)."""
+
+    base = seed & _MASK64
+    base = _mix64(((base ^ (tick & _MASK64)) + _GOLDEN) & _MASK64)
+    ids = np.asarray(agent_ids, dtype=np.int64).astype(np.uint64)
+    keys = _mix64_array((np.uint64(base) ^ ids) + np.uint64(_GOLDEN))
+    return _mix64_array((keys ^ np.uint64(stream & _MASK64)) + np.uint64(_GOLDEN))
+
+
+class CounterRng:
+    """
+    Counter-based generator: the n-th draw after `bind(agent_id, stream)` in tick `t` is
+    SplitMix64 output n of the key hashed from (seed, t, agent_id, stream). Draws therefore do
+    not depend on the order in which agents (or processes) consume them, and `floats` /
+    `angles` produce the same numbers for many agents at once.
+    """
+
+    def __init__(self, seed: int):
+        self._seed = seed
+        self._tick = -1
+        self._agent_id = 0
+        self._stream = STREAM_SPAWN
+        self._key: int | None = None
+        self._counter = 0
+
+    def reset(self) -> None:
+        self._tick = -1
+        self.bind(0, STREAM_SPAWN)
+
+    def begin_tick(self, tick: int) -> None:
+        self._tick = tick
+        self._key = None
+        self._counter = 0
+
+    def bind(self, agent_id: int, stream: int) -> None:
+        # Most binds never draw, so the key is hashed lazily on the first draw.
+        self._agent_id = agent_id
+        self._stream = stream
+        self._key = None
+        self._counter = 0
+
+    def _next_bits(self) -> int:
+        key = self._key
+        if key is None:
+            key = self._key = counter_key(self._seed, self._tick, self._agent_id, self._stream)
+        self._counter += 1
+        return _mix64((key + self._counter * _GOLDEN) & _MASK64)
+
+    def next_float(self) -> float:
+        return (self._next_bits() >> 11) * _FLOAT_SCALE
+
+    def next_range(self, low: float, high: float) -> float:
+        return low + (high - low) * self.next_float()
+
+    def next_int(self, max_value: int) -> int:
+        if max_value <= 0:
+            raise ValueError("max_value must be positive")
+        return self._next_bits() % max_value
+
+    def next_unit_circle(self) -> Vector2:
+        angle = self.next_range(0.0, 2.0 * math.pi)
+        return Vector2(math.cos(angle), math.sin(angle))
+
+    def sample_choice(self, items: list[Optional[int]]) -> Optional[int]:
+        if not items:
+            return None
+        return items[self.next_int(len(items))]
+
+    def floats(self, agent_ids: np.ndarray, stream: int, counter: int = 0) -> np.ndarray:
+        """Draw `counter` (0-based) of each agent's `stream` in the current tick, as float64."""
+
+        keys = counter_keys(self._seed, self._tick, agent_ids, stream)
+        bits = _mix64_array(keys + np.uint64(((counter + 1) * _GOLDEN) & _MASK64))
+        return (bits >> np.uint64(11)).astype(np.float64) * _FLOAT_SCALE
+
+    def angles(self, agent_ids: np.ndarray, stream: int, counter: int = 0) -> np.ndarray:
+        """The angle `next_unit_circle` would use for draw `counter` of each agent's `stream`."""
+
+        return (2.0 * math.pi) * self.floats(agent_ids, stream, counter)
@@ -1,14 +1,188 @@
 from __future__ import annotations
 
 import math
-from typing import TYPE_CHECKING, Dict, List, Tuple
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
 
+import numpy as np
 from pygame.math import Vector2
 
 if TYPE_CHECKING:
     from .agent import Agent
 
 
+@dataclass(slots=True)
+class NeighborPairs:
+    """Flattened directed neighbor pairs: `neighbor_index` is within the radius of `agent_index`."""
+
+    agent_index: np.ndarray
+    neighbor_index: np.ndarray
+    dx: np.ndarray
+    dy: np.ndarray
+    dist_sq: np.ndarray
+    # Filled by `mirror_pairs`, which already took the square roots once per unordered pair.
+    dist: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return int(self.agent_index.shape[0])
+
+
+def _empty_pairs() -> NeighborPairs:
+    empty_index = np.zeros(0, dtype=np.int64)
+    empty_value = np.zeros(0, dtype=np.float64)
+    return NeighborPairs(empty_index, empty_index, empty_value, empty_value, empty_value)
+
+
+def _cell_layout(
+    pos_x: np.ndarray, pos_y: np.ndarray, cell_size: float, reach: int
+) -> tuple[np.ndarray, int, np.ndarray, np.ndarray, np.ndarray]:
+    """Dense cell ids padded by `reach`, plus the stable counting-sort order and CSR arrays."""
+
+    cell_x = np.floor_divide(pos_x, cell_size).astype(np.int64)
+    cell_y = np.floor_divide(pos_y, cell_size).astype(np.int64)
+    min_x = int(cell_x.min()) - reach
+    min_y = int(cell_y.min()) - reach
+    height = int(cell_y.max()) - min_y + reach + 1
+    width = int(cell_x.max()) - min_x + reach + 1
+    cell = (cell_x - min_x) * height + (cell_y - min_y)
+    order = np.argsort(cell, kind="stable")
+    cell_count = np.bincount(cell, minlength=width * height)
+    cell_start = np.zeros_like(cell_count)
+    np.cumsum(cell_count[:-1], out=cell_start[1:])
+    return cell, height, order, cell_count, cell_start
+
+
+def _expand_cell_pairs(
+    agents: np.ndarray, first: np.ndarray, counts: np.ndarray, order: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pair each of `agents` with `counts` sorted slots starting at `first`."""
+
+    total = int(counts.sum())
+    block_start = np.cumsum(counts) - counts
+    local = np.arange(total, dtype=np.int64) - np.repeat(block_start, counts)
+    return np.repeat(agents, counts), order[np.repeat(first, counts) + local]
+
+
+def build_neighbor_pairs(
+    pos_x: np.ndarray,
+    pos_y: np.ndarray,
+    cell_size: float,
+    cell_offsets: Sequence[Tuple[int, int]],
+    radius_sq: float,
+) -> NeighborPairs:
+    """
+    Vectorized equivalent of calling `collect_neighbors_precomputed` for every agent.
+
+    Pairs are grouped by agent index and, per agent, ordered exactly like the scalar query:
+    stencil offset order first, then insertion (index) order within each cell.
+    """
+
+    count = int(pos_x.shape[0])
+    if count == 0 or not cell_offsets:
+        return _empty_pairs()
+    reach = max(max(abs(dx), abs(dy)) for dx, dy in cell_offsets)
+    cell, height, order, cell_count, cell_start = _cell_layout(pos_x, pos_y, cell_size, reach)
+
+    agent_blocks = []
+    neighbor_blocks = []
+    agent_ids = np.arange(count, dtype=np.int64)
+    for dx, dy in cell_offsets:
+        target = cell + dx * height + dy
+        counts = cell_count[target]
+        if not counts.any():
+            continue
+        agents, neighbors = _expand_cell_pairs(agent_ids, cell_start[target], counts, order)
+        agent_blocks.append(agents)
+        neighbor_blocks.append(neighbors)
+    if not agent_blocks:
+        return _empty_pairs()
+
+    agent_index = np.concatenate(agent_blocks)
+    neighbor_index = np.concatenate(neighbor_blocks)
+    by_agent = np.argsort(agent_index, kind="stable")
+    agent_index = agent_index[by_agent]
+    neighbor_index = neighbor_index[by_agent]
+    offset_x = pos_x[neighbor_index] - pos_x[agent_index]
+    offset_y = pos_y[neighbor_index] - pos_y[agent_index]
+    dist_sq = offset_x * offset_x + offset_y * offset_y
+    keep = (agent_index != neighbor_index) & (dist_sq <= radius_sq)
+    return NeighborPairs(
+        agent_index[keep], neighbor_index[keep], offset_x[keep], offset_y[keep], dist_sq[keep]
+    )
+
+
+def build_half_shell_pairs(
+    pos_x: np.ndarray,
+    pos_y: np.ndarray,
+    cell_size: float,
+    cell_offsets: Sequence[Tuple[int, int]],
+    radius_sq: float,
+) -> NeighborPairs:
+    """
+    Every unordered neighbor pair exactly once, using a half-shell stencil.
+
+    Only offsets after `(0, 0)` in `(dx, dy)` order are visited across cells; inside a cell each
+    agent is paired with the agents sorted after it. Offsets point from `agent_index` to
+    `neighbor_index`.
+    """
+
+    count = int(pos_x.shape[0])
+    if count == 0 or not cell_offsets:
+        return _empty_pairs()
+    reach = max(max(abs(dx), abs(dy)) for dx, dy in cell_offsets)
+    cell, height, order, cell_count, cell_start = _cell_layout(pos_x, pos_y, cell_size, reach)
+    agent_ids = np.arange(count, dtype=np.int64)
+
+    rank = np.empty(count, dtype=np.int64)
+    rank[order] = np.arange(count, dtype=np.int64)
+    after = cell_count[cell] - (rank - cell_start[cell]) - 1
+    agents, neighbors = _expand_cell_pairs(agent_ids, rank + 1, after, order)
+    agent_blocks = [agents]
+    neighbor_blocks = [neighbors]
+    for dx, dy in cell_offsets:
+        if (dx, dy) <= (0, 0):
+            continue
+        target = cell + dx * height + dy
+        counts = cell_count[target]
+        if not counts.any():
+            continue
+        agents, neighbors = _expand_cell_pairs(agent_ids, cell_start[target], counts, order)
+        agent_blocks.append(agents)
+        neighbor_blocks.append(neighbors)
+
+    agent_index = np.concatenate(agent_blocks)
+    neighbor_index = np.concatenate(neighbor_blocks)
+    offset_x = pos_x[neighbor_index] - pos_x[agent_index]
+    offset_y = pos_y[neighbor_index] - pos_y[agent_index]
+    dist_sq = offset_x * offset_x + offset_y * offset_y
+    keep = dist_sq <= radius_sq
+    return NeighborPairs(
+        agent_index[keep], neighbor_index[keep], offset_x[keep], offset_y[keep], dist_sq[keep]
+    )
+
+
+def mirror_pairs(half: NeighborPairs) -> NeighborPairs:
+    """
+    Expand unordered pairs into directed pairs grouped by agent, reusing each distance twice.
+
+    Per agent the pairs where it was the first member come before the mirrored ones, so the
+    order differs from `build_neighbor_pairs` and sums over them may differ in the last bits.
+    """
+
+    dist = np.sqrt(half.dist_sq)
+    agent_index = np.concatenate((half.agent_index, half.neighbor_index))
+    by_agent = np.argsort(agent_index, kind="stable")
+    return NeighborPairs(
+        agent_index[by_agent],
+        np.concatenate((half.neighbor_index, half.agent_index))[by_agent],
+        np.concatenate((half.dx, -half.dx))[by_agent],
+        np.concatenate((half.dy, -half.dy))[by_agent],
+        np.concatenate((half.dist_sq, half.dist_sq))[by_agent],
+        np.concatenate((dist, dist))[by_agent],
+    )
+
+
 class SpatialGrid:
     def __init__(self, cell_size: float) -> None:
         self._cell_size = cell_size
@@ -166,3 +340,247 @@ class SpatialGrid:
 
     def _cell_key(self, position: Vector2) -> Tuple[int, int]:
         return (int(position.x // self._cell_size), int(position.y // self._cell_size))
+
+
+class DenseSpatialGrid:
+    """
+    Bounded spatial grid with CSR cell lists (`cell_start` / `cell_count` / `sorted_agents`).
+
+    `insert` records each agent's cell index in a flat int buffer; the first query after a change
+    counts agents per cell, prefix-sums the counts into `cell_start` and orders agents by
+    `(cell, insertion index)` keys sorted in place, so neighbors come back in the same order as
+    `SpatialGrid` and each cell lookup is an array index instead of a dict probe. The count, key
+    and order buffers are preallocated and only grow (doubling) with the population, so a rebuild
+    allocates no NumPy arrays; only the `sorted_agents` list of agent references is refilled. Cells cover
+    `[0, world_size]` plus a padding ring wide enough for the largest stencil; positions beyond it
+    are clamped into the ring, which keeps queries complete but may reorder neighbors for agents
+    outside the world.
+    """
+
+    def __init__(self, cell_size: float, world_size: float, padding: int = 1) -> None:
+        self._cell_size = cell_size
+        self._inner = int(world_size // cell_size) + 1
+        self._agents: List["Agent"] = []
+        self._dirty = False
+        self._agent_cell = array("q")
+        self._sorted_agents: List["Agent"] = []
+        self._stencils: Dict[float, List[Tuple[int, int]]] = {}
+        self._offsets_source: Sequence[Tuple[int, int]] | None = None
+        self._offset_runs: List[Tuple[int, int]] = []
+        self._neighbor_scratch: List["Agent"] = []
+        self._reserve(256)
+        self._resize(max(1, int(padding)))
+
+    def _reserve(self, capacity: int) -> None:
+        # Sort keys pack `cell << index_bits | insertion index`, so every key is unique and an
+        # in-place (unstable) sort still keeps insertion order within a cell.
+        self._index_bits = max(1, capacity - 1).bit_length()
+        self._index_mask = (1 << self._index_bits) - 1
+        self._agent_index = np.arange(capacity, dtype=np.int64)
+        self._sort_keys = np.empty(capacity, dtype=np.int64)
+        self._order = np.empty(capacity, dtype=np.int64)
+        self._order_view = memoryview(self._order)
+
+    def _resize(self, padding: int) -> None:
+        # Agents are clamped `padding` cells outside the world and stencils reach another
+        # `padding` cells, so the allocated border is twice as wide.
+        self._padding = padding
+        self._side = self._inner + 4 * padding
+        self._cell_low = -padding
+        self._cell_high = self._inner - 1 + padding
+        self._index_shift = 2 * padding * self._side + 2 * padding
+        total = self._side * self._side
+        self._cell_count = np.zeros(total, dtype=np.int64)
+        self._cell_start = np.zeros(total + 1, dtype=np.int64)
+        # Queries index `cell_start` through a memoryview, which returns plain ints.
+        self._cell_start_view = memoryview(self._cell_start)
+        self._offsets_source = None
+        self._dirty = True
+        for index, agent in enumerate(self._agents):
+            position = agent.position
+            self._agent_cell[index] = self.cell_index(position.x, position.y)
+
+    @property
+    def cell_count(self) -> np.ndarray:
+        self._ensure_built()
+        return self._cell_count
+
+    @property
+    def cell_start(self) -> np.ndarray:
+        self._ensure_built()
+        return self._cell_start
+
+    @property
+    def sorted_agents(self) -> List["Agent"]:
+        self._ensure_built()
+        return self._sorted_agents
+
+    def build_neighbor_cell_offsets(self, radius: float) -> List[Tuple[int, int]]:
+        cell_range = int(math.ceil(radius / self._cell_size))
+        if cell_range > self._padding:
+            self._resize(cell_range)
+        return [(dx, dy) for dx in range(-cell_range, cell_range + 1) for dy in range(-cell_range, cell_range + 1)]
+
+    def clear(self) -> None:
+        del self._agent_cell[:]
+        self._agents.clear()
+        self._dirty = True
+
+    def insert(self, agent: "Agent") -> None:
+        # The cell is fixed at insert time, as in `SpatialGrid`; the sort is deferred to the
+        # first query.
+        position = agent.position
+        self._agents.append(agent)
+        self._agent_cell.append(self.cell_index(position.x, position.y))
+        self._dirty = True
+
+    def cell_index(self, x: float, y: float) -> int:
+        low = self._cell_low
+        high = self._cell_high
+        cx = int(x // self._cell_size)
+        cy = int(y // self._cell_size)
+        if cx < low:
+            cx = low
+        elif cx > high:
+            cx = high
+        if cy < low:
+            cy = low
+        elif cy > high:
+            cy = high
+        return cx * self._side + cy + self._index_shift
+
+    def _ensure_built(self) -> None:
+        if not self._dirty:
+            return
+        agents = self._agents
+        cell_count = self._cell_count
+        sorted_agents = self._sorted_agents
+        sorted_agents.clear()
+        cell_count.fill(0)
+        count = len(agents)
+        if count:
+            if count > self._order.shape[0]:
+                self._reserve(max(count, 2 * self._order.shape[0]))
+            cells = np.frombuffer(self._agent_cell, dtype=np.int64)
+            np.add.at(cell_count, cells, 1)
+            np.cumsum(cell_count, out=self._cell_start[1:])
+            keys = self._sort_keys[:count]
+            np.left_shift(cells, self._index_bits, out=keys)
+            np.bitwise_or(keys, self._agent_index[:count], out=keys)
+            keys.sort()
+            # Insertion order within each cell, like the hash grid's buckets.
+            np.bitwise_and(keys, self._index_mask, out=self._order[:count])
+            sorted_agents.extend(map(agents.__getitem__, self._order_view[:count]))
+        else:
+            self._cell_start.fill(0)
+        self._dirty = False
+
+    def _flatten_offsets(self, cell_offsets: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Turn stencil offsets into runs of consecutive flat cell offsets.
+
+        Cells are laid out column-major (`cx * side + cy`), so the `dy` sweep of each `dx` row is
+        contiguous in `cell_start` and a whole row is one slot range.
+        """
+
+        if cell_offsets is self._offsets_source:
+            return self._offset_runs
+        reach = max((max(abs(dx), abs(dy)) for dx, dy in cell_offsets), default=0)
+        if reach > self._padding:
+            self._resize(reach)
+        side = self._side
+        runs: List[Tuple[int, int]] = []
+        for dx, dy in cell_offsets:
+            flat = dx * side + dy
+            if runs and runs[-1][1] + 1 == flat:
+                runs[-1] = (runs[-1][0], flat + 1)
+            else:
+                runs.append((flat, flat + 1))
+        self._offset_runs = runs
+        self._offsets_source = cell_offsets
+        return runs
+
+    def get_neighbors(self, position: Vector2, radius: float) -> List["Agent"]:
+        self._neighbor_scratch.clear()
+        offsets: List[Vector2] = []
+        self.collect_neighbors(position, radius, self._neighbor_scratch, offsets)
+        return self._neighbor_scratch
+
+    def collect_neighbors(
+        self,
+        position: Vector2,
+        radius: float,
+        out_agents: List["Agent"],
+        out_offsets: List[Vector2],
+        exclude_id: int | None = None,
+    ) -> None:
+        cell_offsets = self._stencils.get(radius)
+        if cell_offsets is None:
+            # One stencil per radius, so `_flatten_offsets` sees the same list on every call.
+            cell_offsets = self.build_neighbor_cell_offsets(radius)
+            self._stencils[radius] = cell_offsets
+        self.collect_neighbors_precomputed(
+            position, cell_offsets, radius * radius, out_agents, out_offsets, exclude_id=exclude_id
+        )
+
+    def collect_neighbors_precomputed(
+        self,
+        position: Vector2,
+        cell_offsets: List[Tuple[int, int]],
+        radius_sq: float,
+        out_agents: List["Agent"],
+        out_offsets: List[Vector2],
+        exclude_id: int | None = None,
+        out_dist_sq: List[float] | None = None,
+    ) -> None:
+        """Same contract and output order as `SpatialGrid.collect_neighbors_precomputed`."""
+
+        offset_runs = self._offset_runs if cell_offsets is self._offsets_source else self._flatten_offsets(cell_offsets)
+        if self._dirty:
+            self._ensure_built()
+        out_agents.clear()
+        offset_count = 0
+        if out_dist_sq is not None:
+            out_dist_sq.clear()
+        pos_x = position.x
+        pos_y = position.y
+        cell_size = self._cell_size
+        cx = int(pos_x // cell_size)
+        cy = int(pos_y // cell_size)
+        if self._cell_low <= cx <= self._cell_high and self._cell_low <= cy <= self._cell_high:
+            base = cx * self._side + cy + self._index_shift
+        else:
+            base = self.cell_index(pos_x, pos_y)
+        cell_start = self._cell_start_view
+        sorted_agents = self._sorted_agents
+        append_agent = out_agents.append
+        append_offset = out_offsets.append
+        dist_buffer = out_dist_sq
+        append_dist = dist_buffer.append if dist_buffer is not None else None
+
+        for run_start, run_end in offset_runs:
+            for agent in sorted_agents[cell_start[base + run_start] : cell_start[base + run_end]]:
+                if exclude_id is not None and agent.id == exclude_id:
+                    continue
+                # Positions are read live so agents moved earlier in the tick are seen where
+                # they are now, exactly like the hash grid.
+                pos = agent.position
+                offset_x = pos.x - pos_x
+                offset_y = pos.y - pos_y
+                dist_sq = offset_x * offset_x + offset_y * offset_y
+                if dist_sq <= radius_sq:
+                    append_agent(agent)
+                    if offset_count < len(out_offsets):
+                        out_offsets[offset_count].update(offset_x, offset_y)
+                    else:
+                        append_offset(Vector2(offset_x, offset_y))
+                    if dist_buffer is not None:
+                        if offset_count < len(dist_buffer):
+                            dist_buffer[offset_count] = dist_sq
+                        else:
+                            append_dist(dist_sq)
+                    offset_count += 1
+
+        del out_offsets[offset_count:]
+        if dist_buffer is not None:
+            del dist_buffer[offset_count:]
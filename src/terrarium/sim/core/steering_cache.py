@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from pygame.math import Vector2
+
+from .agent import Agent, AgentState
+
+
+@dataclass(slots=True)
+class SteeringInputs:
+    """What one agent's steering read when its desired velocity was last computed."""
+
+    desired: Vector2
+    sensed_danger: bool
+    group_id: int
+    behavior: AgentState
+    speed_limit: float
+    cell: Tuple[int, int]
+    x: float
+    y: float
+    neighbor_ids: Tuple[int, ...]
+    # Neighbor group ids in neighbor order; steering switches ally / other-group terms on them.
+    neighbor_groups: Tuple[int, ...]
+    # Neighbor offsets and velocities as flat x, y pairs, in neighbor order.
+    offsets: List[float]
+    velocities: List[float]
+    food: float
+    danger: float
+    environment_ticks: int
+    base: Vector2 | None
+    reused: int = 0
+
+
+class SteeringCache:
+    """
+    Per-agent steering inputs for temporal-coherence reuse: an agent keeps its cached desired
+    velocity while its neighbor set, its own and its neighbors' groups, cell, behavior branch and
+    base are unchanged and its position, neighbor offsets and neighbor velocities stay within
+    `tolerance` of what the cached value was computed from (own-cell food and danger within
+    `field_tolerance`).
+
+    Drift is always measured against the inputs of the last recompute, never the previous tick,
+    so slow creep still triggers a recompute. Entries are carried to the next tick only for agents
+    that steered this tick, so the dead drop out without a sweep.
+    """
+
+    def __init__(self, tolerance: float, field_tolerance: float) -> None:
+        self.tolerance = max(0.0, float(tolerance))
+        self.field_tolerance = max(0.0, float(field_tolerance))
+        self._entries: Dict[int, SteeringInputs] = {}
+        self._next_entries: Dict[int, SteeringInputs] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, agent_id: int) -> SteeringInputs | None:
+        return self._entries.get(agent_id)
+
+    def begin_tick(self) -> None:
+        self._entries, self._next_entries = self._next_entries, self._entries
+        self._next_entries.clear()
+
+    def keep(self, agent_id: int, entry: SteeringInputs) -> None:
+        self._next_entries[agent_id] = entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._next_entries.clear()
+
+    def matches(
+        self,
+        entry: SteeringInputs,
+        agent: Agent,
+        neighbor_ids: Tuple[int, ...],
+        neighbors: List[Agent],
+        offsets: List[Vector2],
+    ) -> bool:
+        """Whether the neighborhood still matches `entry` (ids, groups, offsets, velocities)."""
+
+        if entry.neighbor_ids != neighbor_ids:
+            return False
+        tolerance = self.tolerance
+        position = agent.position
+        if abs(position.x - entry.x) > tolerance or abs(position.y - entry.y) > tolerance:
+            return False
+        cached_offsets = entry.offsets
+        cached_velocities = entry.velocities
+        cached_groups = entry.neighbor_groups
+        index = 0
+        for slot, (other, offset) in enumerate(zip(neighbors, offsets)):
+            if other.group_id != cached_groups[slot]:
+                return False
+            if abs(offset.x - cached_offsets[index]) > tolerance or abs(offset.y - cached_offsets[index + 1]) > tolerance:
+                return False
+            velocity = other.velocity
+            if (
+                abs(velocity.x - cached_velocities[index]) > tolerance
+                or abs(velocity.y - cached_velocities[index + 1]) > tolerance
+            ):
+                return False
+            index += 2
+        return True
+
+    def fields_match(self, entry: SteeringInputs, food: float, danger: float) -> bool:
+        field_tolerance = self.field_tolerance
+        if abs(food - entry.food) > field_tolerance or abs(danger - entry.danger) > field_tolerance:
+            return False
+        # The flee branch switches on at danger 0.1; crossing it is never within tolerance.
+        return (danger > 0.1) == (entry.danger > 0.1)
+
+    @staticmethod
+    def capture(
+        desired: Vector2,
+        sensed_danger: bool,
+        agent: Agent,
+        behavior: AgentState,
+        speed_limit: float,
+        cell: Tuple[int, int],
+        neighbor_ids: Tuple[int, ...],
+        neighbors: List[Agent],
+        offsets: List[Vector2],
+        food: float,
+        danger: float,
+        environment_ticks: int,
+        base: Vector2 | None,
+    ) -> SteeringInputs:
+        flat_offsets: List[float] = []
+        flat_velocities: List[float] = []
+        for other, offset in zip(neighbors, offsets):
+            flat_offsets.append(offset.x)
+            flat_offsets.append(offset.y)
+            velocity = other.velocity
+            flat_velocities.append(velocity.x)
+            flat_velocities.append(velocity.y)
+        return SteeringInputs(
+            desired=desired,
+            sensed_danger=sensed_danger,
+            group_id=agent.group_id,
+            behavior=behavior,
+            speed_limit=speed_limit,
+            cell=cell,
+            x=agent.position.x,
+            y=agent.position.y,
+            neighbor_ids=neighbor_ids,
+            neighbor_groups=tuple(other.group_id for other in neighbors),
+            offsets=flat_offsets,
+            velocities=flat_velocities,
+            food=food,
+            danger=danger,
+            environment_ticks=environment_ticks,
+            base=base,
+        )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Mapping, Tuple
+
+from .config import FeedbackConfig
+
+# Level -1 updates every agent every tick; 0 keeps the configured strides and thresholds.
+MIN_LEVEL = -1
+
+
+def governed_strides(feedback: FeedbackConfig, level: int) -> Tuple[int, int, int, int]:
+    """
+    `(group_stride, group_threshold, steering_stride, steering_threshold)` at `level`.
+
+    Each level above 0 adds 1 to both strides and halves both population thresholds, so the
+    strides widen and reach smaller populations; level -1 turns both strides off.
+    """
+
+    group_stride = max(1, int(feedback.group_update_stride))
+    group_threshold = max(0, int(feedback.group_update_population_threshold))
+    steering_stride = max(1, int(feedback.steering_update_stride))
+    steering_threshold = max(0, int(feedback.steering_update_population_threshold))
+    if level < 0:
+        return 1, group_threshold, 1, steering_threshold
+    return group_stride + level, group_threshold >> level, steering_stride + level, steering_threshold >> level
+
+
+class TickGovernor:
+    """
+    Moves the stride level at tick boundaries to keep `tick_duration_ms` near a budget.
+
+    Once `window` ticks have been observed since the last change, the governor steps the level up
+    when their mean is over `budget_ms` and down when it is under `budget_ms * low_ratio`; the gap
+    between the two is the hysteresis, and refilling the window after each change holds the new
+    level for at least `window` ticks. Wall-clock time makes the schedule host-dependent, so a
+    recorded `{tick: level}` trace can be replayed instead, which ignores timings entirely.
+    """
+
+    def __init__(self, budget_ms: float, window: int, low_ratio: float, max_level: int) -> None:
+        self.budget_ms = max(1e-9, float(budget_ms))
+        self.low_ratio = min(1.0, max(0.0, float(low_ratio)))
+        self.max_level = max(0, int(max_level))
+        self.level = 0
+        self._durations: Deque[float] = deque(maxlen=max(1, int(window)))
+        self._trace: Dict[int, int] | None = None
+
+    @property
+    def replaying(self) -> bool:
+        return self._trace is not None
+
+    def replay(self, trace: Mapping[int, int]) -> None:
+        """Follow `trace` (tick -> level) from now on; ticks it does not list keep the last level."""
+
+        self._trace = {int(tick): int(level) for tick, level in trace.items()}
+
+    def begin_tick(self, tick: int) -> int:
+        if self._trace is not None:
+            self.level = self._trace.get(tick, self.level)
+        return self.level
+
+    def observe(self, duration_ms: float) -> None:
+        if self._trace is not None:
+            return
+        durations = self._durations
+        durations.append(duration_ms)
+        if len(durations) < durations.maxlen:
+            return
+        mean = sum(durations) / len(durations)
+        if mean > self.budget_ms and self.level < self.max_level:
+            self._change(self.level + 1)
+        elif mean < self.budget_ms * self.low_ratio and self.level > MIN_LEVEL:
+            self._change(self.level - 1)
+
+    def reset(self) -> None:
+        self.level = 0
+        self._durations.clear()
+
+    def _change(self, level: int) -> None:
+        self.level = level
+        self._durations.clear()
@@ -1,24 +1,37 @@
 from __future__ import annotations
 
+import copy
 import math
-from dataclasses import dataclass
-from typing import Any, Dict, List, Set
+from dataclasses import dataclass, fields as dataclass_fields
+from operator import attrgetter
+from typing import Any, Dict, List, Mapping, Set
 from time import perf_counter
 
 from pygame.math import Vector2
 
-from .agent import Agent, AgentState, AgentTraits
+from .agent import Agent, AgentState, AgentTraits, DerivedTraits
+from .agent_store import AgentStore
 from .config import SimulationConfig
-from .environment import EnvironmentGrid
-from .rng import DeterministicRng
-from .spatial_grid import SpatialGrid
-from ..systems import fields, groups, lifecycle, metrics as metrics_system, steering
+from .environment import DenseEnvironmentGrid, EnvironmentGrid
+from .field_events import FieldEventBuffer
+from .group_bases import GroupBaseIndex
+from .group_registry import GroupRegistry
+from .neighbor_list import VerletNeighborList
+from .rng import STREAM_SPAWN, CounterRng, DeterministicRng
+from .spatial_grid import DenseSpatialGrid, SpatialGrid
+from .steering_cache import SteeringCache
+from .tick_governor import TickGovernor, governed_strides
+from ..systems import fields, groups, intents, lifecycle, metrics as metrics_system, steering, steering_batch
 from ..types.metrics import TickMetrics
 from ..types.snapshot import Snapshot, SnapshotFields, SnapshotMetadata, SnapshotWorld
 from ..utils.math2d import _clamp_length_xy_f, _clamp_value, _heading_from_velocity
 _CLIMATE_RNG_SALT = 0xC0A1F00D5EED1234
 _APPEARANCE_RNG_SALT = 0xA51E0EA7E9CA2311
 _TRAIT_RNG_SALT = 0x7BADCA11C0FFEE01
+_AGENT_FIELDS = tuple(field.name for field in dataclass_fields(Agent))
+_AGENT_ID = attrgetter("id")
+# States whose steering advances the wander timer.
+_WANDERING = (AgentState.WANDER, AgentState.SEEKING_FOOD)
 
 
 @dataclass(slots=True)
@@ -33,6 +46,7 @@ class TickContext:
     current_population: int
     group_update_stride: int
     use_group_stride: bool
+    use_group_events: bool
     steering_stride: int
     use_steering_stride: bool
     detach_radius_sq: float
@@ -40,6 +54,13 @@ class TickContext:
     vision_cell_offsets: List[Vector2]
     vision_radius_sq: float
     danger_present: bool
+    batch_steering: steering_batch.BatchSteering | None = None
+    group_updates_evaluated: int = 0
+    group_updates_skipped: int = 0
+    steering_reused: int = 0
+    steering_recomputed: int = 0
+    steering_max_deviation: float = 0.0
+    governor_level: int = 0
 
 
 @dataclass(slots=True)
@@ -51,7 +72,6 @@ class TickAggregates:
     energy_sum: float
     age_sum: float
     ungrouped: int
-    group_ids: Set[int]
 
 
 def _derive_stream_seed(seed: int, salt: int) -> int:
@@ -63,40 +83,56 @@ class World:
 
     def __init__(self, config: SimulationConfig):
         self._config = config
-        self._rng = DeterministicRng(config.seed)
+        self._rng = self._create_agent_rng(config.seed)
         self._climate_rng = DeterministicRng(_derive_stream_seed(config.seed, _CLIMATE_RNG_SALT))
-        self._appearance_rng = DeterministicRng(_derive_stream_seed(config.seed, _APPEARANCE_RNG_SALT))
+        self._appearance_rng = self._create_agent_rng(_derive_stream_seed(config.seed, _APPEARANCE_RNG_SALT))
         self._trait_rng = DeterministicRng(_derive_stream_seed(config.seed, _TRAIT_RNG_SALT))
-        self._grid = SpatialGrid(config.cell_size)
-        self._environment = EnvironmentGrid(config.cell_size, config.environment, config.world_size)
+        self._grid = self._create_spatial_grid()
+        self._environment = self._create_environment()
+        self._store = self._create_agent_store()
+        self._steering_backend = self._resolve_steering_backend()
+        self._steering_cache = self._create_steering_cache()
+        self._tick_intents = self._create_tick_intents()
+        self._reuse_slots = self._resolve_agent_slots()
+        self._batch_food = self._resolve_food_consumption()
+        self._group_events = self._resolve_group_updates()
+        self._governor = self._create_tick_governor()
+        self._dead_slots: List[int] = []
         self._agents: List[Agent] = []
+        self._previous_agents: List[Agent] = []
         self._birth_queue: List[Agent] = []
         self._id_to_index: Dict[int, int] = {}
         self._neighbor_offsets: List[Vector2] = []
         self._neighbor_agents: List[Agent] = []
         self._neighbor_dist_sq: List[float] = []
-        self._group_scratch: Set[int] = set()
         self._paired_ids_scratch: Set[int] = set()
-        self._pending_food: Dict[tuple[int, int], float] = {}
-        self._pending_danger: Dict[tuple[int, int], float] = {}
-        self._pending_pheromone: Dict[tuple[tuple[int, int], int], float] = {}
+        event_size = self._environment._max_index
+        self._pending_food = FieldEventBuffer(event_size)
+        self._pending_danger = FieldEventBuffer(event_size)
+        self._pending_pheromone = FieldEventBuffer(event_size)
+        self._food_demand: Dict[tuple[int, int], List[Agent]] = {}
         self._ungrouped_neighbors: List[Agent] = []
         self._group_counts_scratch: Dict[int, int] = {}
         self._group_lineage_counts: Dict[int, int] = {}
-        self._group_sizes: Dict[int, int] = {}
-        self._group_bases: Dict[int, Vector2] = {}
+        self._group_registry = GroupRegistry()
+        # (group id, can form groups, sorted neighbor group ids) each agent's last group update saw.
+        self._group_signatures: Dict[int, tuple[int, bool, tuple[int, ...]]] = {}
+        self._next_group_signatures: Dict[int, tuple[int, bool, tuple[int, ...]]] = {}
+        self._group_bases = GroupBaseIndex(config.cell_size)
         self._next_lineage_id = 0
         self._next_id = 0
         self._next_group_id = 0
         self._max_population_seen = 0
         self._metrics: TickMetrics | None = None
         self._environment_accumulator = 0.0
+        self._environment_ticks = 0
         self._food_regen_noise_multiplier = 1.0
         self._food_regen_noise_target = 1.0
         self._food_regen_noise_time_to_next_sample = 0.0
         self._cached_population_stats: tuple[int, float, float, int, int] = (0, 0.0, 0.0, 0, 0)
         self._population_stats_dirty = True
         self._refresh_vision_cache()
+        self._neighbor_list = self._create_neighbor_list()
         self._bootstrap_population()
 
     @property
@@ -110,17 +146,27 @@ class World:
     def reset(self) -> None:
         self._agents.clear()
         self._birth_queue.clear()
+        self._dead_slots.clear()
+        if self._store is not None:
+            self._store.clear()
         self._environment.reset()
         self._grid.clear()
+        if self._neighbor_list is not None:
+            self._neighbor_list.clear()
+        if self._tick_intents is not None:
+            self._tick_intents.clear()
+        self._previous_agents.clear()
         self._neighbor_offsets.clear()
         self._neighbor_agents.clear()
         self._neighbor_dist_sq.clear()
-        self._group_scratch.clear()
         self._paired_ids_scratch.clear()
         self._pending_food.clear()
         self._pending_danger.clear()
         self._pending_pheromone.clear()
-        self._group_sizes.clear()
+        self._food_demand.clear()
+        self._group_registry.clear()
+        self._group_signatures.clear()
+        self._next_group_signatures.clear()
         self._group_lineage_counts.clear()
         self._group_bases.clear()
         self._rng.reset()
@@ -134,9 +180,14 @@ class World:
         self._next_group_id = 0
         self._max_population_seen = 0
         self._environment_accumulator = 0.0
+        self._environment_ticks = 0
         self._food_regen_noise_multiplier = 1.0
         self._food_regen_noise_target = 1.0
         self._food_regen_noise_time_to_next_sample = 0.0
+        if self._steering_cache is not None:
+            self._steering_cache.clear()
+        if self._governor is not None:
+            self._governor.reset()
         self._cached_population_stats = (0, 0.0, 0.0, 0, 0)
         self._population_stats_dirty = True
         self._refresh_vision_cache()
@@ -151,16 +202,26 @@ class World:
         paired_ids = self._paired_ids_scratch
         paired_ids.clear()
 
-        for agent in self._agents:
+        dead_slots = self._dead_slots if self._reuse_slots else None
+        if self._steering_backend == "batch":
+            ctx.batch_steering = steering_batch.compute_tick(self, ctx)
+        for index, agent in enumerate(self._agents):
             if not agent.alive:
+                if dead_slots is not None:
+                    dead_slots.append(index)
                 continue
 
-            traits, speed_limit = self._prepare_agent(agent)
+            if ctx.batch_steering is None:
+                traits, speed_limit = self._prepare_agent(agent)
+            else:
+                traits, speed_limit = ctx.batch_steering.prepared[index]
             neighbor_count = self._collect_neighbors(agent, ctx)
             aggregates.neighbor_checks += neighbor_count
             same_group_neighbors = self._update_group_membership(agent, ctx, traits)
-            desired, sensed_danger = self._compute_steering(agent, ctx, speed_limit, traits)
+            desired, sensed_danger = self._compute_steering(agent, ctx, speed_limit, traits, index)
             base_cell_key = self._integrate_motion(agent, desired, speed_limit, ctx.dt)
+            if self._neighbor_list is not None:
+                self._neighbor_list.note_moved(agent)
             births_added = self._apply_lifecycle(
                 agent,
                 ctx,
@@ -172,12 +233,16 @@ class World:
             )
             aggregates.births += births_added
             self._apply_danger_pulse_if_needed(agent, base_cell_key, sensed_danger)
-            if agent.alive:
+            if not agent.alive:
+                if dead_slots is not None:
+                    dead_slots.append(index)
+            elif self._tick_intents is None:
                 self._accumulate_agent_stats(aggregates, agent)
 
-        self._accumulate_birth_queue(aggregates)
         stats = self._finalize_tick(ctx, aggregates)
         elapsed_ms = (perf_counter() - start) * 1000.0
+        if self._governor is not None:
+            self._governor.observe(elapsed_ms)
         metrics = metrics_system.create_metrics(
             ctx.tick,
             aggregates.births,
@@ -185,6 +250,16 @@ class World:
             aggregates.neighbor_checks,
             elapsed_ms,
             stats,
+            neighbor_list_rebuilds=0 if self._neighbor_list is None else self._neighbor_list.tick_rebuilds,
+            neighbor_candidates=0 if self._neighbor_list is None else self._neighbor_list.candidates_checked,
+            danger_cells=self._environment.danger_cell_count(),
+            food_regen_cells=self._environment.food_regen_cell_count(),
+            group_updates_evaluated=ctx.group_updates_evaluated,
+            group_updates_skipped=ctx.group_updates_skipped,
+            steering_reused=ctx.steering_reused,
+            steering_recomputed=ctx.steering_recomputed,
+            steering_max_deviation=ctx.steering_max_deviation,
+            governor_level=ctx.governor_level,
         )
         self._metrics = metrics
         return self._metrics
@@ -197,21 +272,33 @@ class World:
         self._pending_food.clear()
         self._pending_danger.clear()
         self._pending_pheromone.clear()
+        self._food_demand.clear()
+        self._rng.begin_tick(tick)
+        self._appearance_rng.begin_tick(tick)
 
         sim_time = tick * config.time_step
         can_form_groups = sim_time >= feedback.group_formation_warmup_seconds
 
-        self._group_sizes.clear()
+        self._group_registry.begin_tick()
         current_population = len(self._agents)
         if current_population > self._max_population_seen:
             self._max_population_seen = current_population
 
-        group_update_stride = max(1, int(feedback.group_update_stride))
-        group_update_threshold = max(0, int(feedback.group_update_population_threshold))
-        use_group_stride = current_population >= group_update_threshold and group_update_stride > 1
-        steering_stride = max(1, int(feedback.steering_update_stride))
-        steering_threshold = max(0, int(feedback.steering_update_population_threshold))
-        use_steering_stride = current_population >= steering_threshold and steering_stride > 1
+        governor_level = 0 if self._governor is None else self._governor.begin_tick(tick)
+        group_update_stride, group_update_threshold, steering_stride, steering_threshold = governed_strides(
+            feedback, governor_level
+        )
+        above_group_threshold = current_population >= group_update_threshold
+        use_group_stride = not self._group_events and above_group_threshold and group_update_stride > 1
+        use_group_events = self._group_events and above_group_threshold
+        if self._group_events:
+            self._group_signatures, self._next_group_signatures = self._next_group_signatures, self._group_signatures
+            self._next_group_signatures.clear()
+        use_steering_stride = (
+            self._steering_cache is None and current_population >= steering_threshold and steering_stride > 1
+        )
+        if self._steering_cache is not None:
+            self._steering_cache.begin_tick()
         detach_radius_sq = feedback.group_detach_radius * feedback.group_detach_radius
         close_threshold = feedback.group_detach_close_neighbor_threshold
 
@@ -226,6 +313,7 @@ class World:
             current_population=current_population,
             group_update_stride=group_update_stride,
             use_group_stride=use_group_stride,
+            use_group_events=use_group_events,
             steering_stride=steering_stride,
             use_steering_stride=use_steering_stride,
             detach_radius_sq=detach_radius_sq,
@@ -233,18 +321,44 @@ class World:
             vision_cell_offsets=self._vision_cell_offsets,
             vision_radius_sq=self._vision_radius_sq,
             danger_present=self._environment.has_danger(),
+            governor_level=governor_level,
         )
 
     def _rebuild_spatial_index(self, ctx: TickContext) -> None:
+        indexed = self._agents
+        if self._tick_intents is not None:
+            indexed = self._freeze_previous_agents()
+        if self._neighbor_list is not None:
+            self._neighbor_list.begin_tick(indexed)
+            return
         self._grid.clear()
-        for agent in self._agents:
-            if agent.group_id >= 0:
-                self._group_sizes[agent.group_id] = self._group_sizes.get(agent.group_id, 0) + 1
+        for agent in indexed:
             self._grid.insert(agent)
 
+    def _freeze_previous_agents(self) -> List[Agent]:
+        """Copy the state neighbors read into the previous-tick buffer the spatial index serves."""
+
+        previous = self._previous_agents
+        previous.clear()
+        if self._store is None:
+            for agent in self._agents:
+                frozen = copy.copy(agent)
+                frozen.position = Vector2(agent.position)
+                frozen.velocity = Vector2(agent.velocity)
+                previous.append(frozen)
+        else:
+            for agent in self._agents:
+                previous.append(Agent(**{name: getattr(agent, name) for name in _AGENT_FIELDS}))
+        return previous
+
+    def _swap_tick_buffers(self, aggregates: TickAggregates) -> None:
+        intents.apply_intents(self, self._tick_intents)
+        self._previous_agents.clear()
+        for agent in self._agents:
+            if agent.alive:
+                self._accumulate_agent_stats(aggregates, agent)
+
     def _init_tick_aggregates(self) -> TickAggregates:
-        group_ids = self._group_scratch
-        group_ids.clear()
         return TickAggregates(
             neighbor_checks=0,
             births=0,
@@ -253,19 +367,49 @@ class World:
             energy_sum=0.0,
             age_sum=0.0,
             ungrouped=0,
-            group_ids=group_ids,
         )
 
     def _prepare_agent(self, agent: Agent) -> tuple[AgentTraits, float]:
-        if agent.traits_dirty:
-            traits = self._clamp_traits(agent.traits)
-            agent.traits_dirty = False
-        else:
-            traits = agent.traits
-        speed_limit = self._trait_speed_limit(traits)
-        return traits, speed_limit
+        derived = agent.derived
+        if derived is None or agent.traits_dirty:
+            derived = self.set_agent_traits(agent, agent.traits)
+        return agent.traits, derived.speed_limit
+
+    def set_agent_traits(self, agent: Agent, traits: AgentTraits) -> DerivedTraits:
+        """
+        Clamp and assign `traits` to `agent` and recompute its derived trait block.
+
+        Traits are fixed at birth, so this is the only place the block is rebuilt; code that
+        changes an agent's traits must go through it (or set `traits_dirty`).
+        """
+
+        clamped = self._clamp_traits(traits)
+        agent.traits = clamped
+        agent.traits_dirty = False
+        derived = self._derive_traits(clamped)
+        agent.derived = derived
+        return derived
+
+    def _derived_traits(self, agent: Agent) -> DerivedTraits:
+        derived = agent.derived
+        if derived is None or agent.traits_dirty:
+            derived = self.set_agent_traits(agent, agent.traits)
+        return derived
+
+    def _derive_traits(self, traits: AgentTraits) -> DerivedTraits:
+        return DerivedTraits(
+            speed_limit=self._trait_speed_limit(traits),
+            metabolism_multiplier=self._trait_metabolism_multiplier(traits),
+            disease_resistance=self._trait_disease_resistance(traits),
+            reproduction_factor=self._trait_reproduction_factor(traits),
+        )
 
     def _collect_neighbors(self, agent: Agent, ctx: TickContext) -> int:
+        if self._neighbor_list is not None:
+            self._neighbor_list.collect(
+                agent, self._neighbor_agents, self._neighbor_offsets, self._neighbor_dist_sq
+            )
+            return len(self._neighbor_agents)
         self._grid.collect_neighbors_precomputed(
             agent.position,
             ctx.vision_cell_offsets,
@@ -289,16 +433,26 @@ class World:
                     same_group_neighbors += 1
                     if dist_sq <= ctx.detach_radius_sq:
                         same_group_close_neighbors += 1
-                if same_group_close_neighbors >= ctx.close_threshold:
-                    agent.group_lonely_seconds = 0.0
-                else:
-                    agent.group_lonely_seconds += ctx.dt
-            else:
-                agent.group_lonely_seconds = 0.0
-            groups.decay_group_cooldown(self, agent)
+            self._coast_group_membership(agent, ctx, same_group_close_neighbors)
+            ctx.group_updates_skipped += 1
             return same_group_neighbors
 
-        return groups.update_group_membership(
+        histogram: tuple[int, ...] = ()
+        if ctx.use_group_events:
+            histogram, same_group_neighbors, same_group_close_neighbors = groups.neighborhood_signature(
+                self, agent, self._neighbor_agents, neighbor_dist_sq, ctx.detach_radius_sq
+            )
+            signature = (agent.group_id, ctx.can_form_groups, histogram)
+            if self._group_signatures.get(agent.id) == signature and not groups.group_update_due(
+                self, agent, traits, same_group_close_neighbors >= ctx.close_threshold
+            ):
+                self._next_group_signatures[agent.id] = signature
+                self._coast_group_membership(agent, ctx, same_group_close_neighbors)
+                ctx.group_updates_skipped += 1
+                return same_group_neighbors
+
+        ctx.group_updates_evaluated += 1
+        same_group_neighbors = groups.update_group_membership(
             self,
             agent,
             self._neighbor_agents,
@@ -309,29 +463,135 @@ class World:
             ctx.close_threshold,
             traits=traits,
         )
+        if ctx.use_group_events:
+            self._next_group_signatures[agent.id] = (agent.group_id, ctx.can_form_groups, histogram)
+        return same_group_neighbors
+
+    def _coast_group_membership(self, agent: Agent, ctx: TickContext, same_group_close_neighbors: int) -> None:
+        """Advance the lonely timer and merge cooldown of an agent whose group update is skipped."""
+
+        if agent.group_id != self._UNGROUPED:
+            if same_group_close_neighbors >= ctx.close_threshold:
+                agent.group_lonely_seconds = 0.0
+            else:
+                agent.group_lonely_seconds += ctx.dt
+        else:
+            agent.group_lonely_seconds = 0.0
+        groups.decay_group_cooldown(self, agent)
+
+    def _steering_due(self, agent: Agent, ctx: TickContext) -> bool:
+        return not ctx.use_steering_stride or (ctx.tick + agent.id) % ctx.steering_stride == 0
 
     def _compute_steering(
-        self, agent: Agent, ctx: TickContext, speed_limit: float, traits: AgentTraits
+        self, agent: Agent, ctx: TickContext, speed_limit: float, traits: AgentTraits, index: int
     ) -> tuple[Vector2, bool]:
-        steering_update = not ctx.use_steering_stride or (ctx.tick + agent.id) % ctx.steering_stride == 0
-        if steering_update:
-            desired, sensed_danger = steering.compute_desired_velocity(
-                self,
+        if not self._steering_due(agent, ctx):
+            ctx.steering_reused += 1
+            return agent.last_desired, agent.last_sensed_danger
+        if self._steering_cache is not None:
+            return self._compute_coherent_steering(agent, ctx, speed_limit, traits, index)
+        desired, sensed_danger = self._steer(agent, ctx, speed_limit, traits, index)
+        ctx.steering_recomputed += 1
+        if ctx.use_steering_stride:
+            # The previous desired velocity was reused for the stride's skipped ticks.
+            self._note_steering_deviation(ctx, agent.last_desired, desired)
+        agent.last_desired = desired
+        agent.last_sensed_danger = sensed_danger
+        return desired, sensed_danger
+
+    def _compute_coherent_steering(
+        self, agent: Agent, ctx: TickContext, speed_limit: float, traits: AgentTraits, index: int
+    ) -> tuple[Vector2, bool]:
+        """Reuse the cached desired velocity while the steering inputs stay within tolerance."""
+
+        cache = self._steering_cache
+        neighbors = self._neighbor_agents
+        offsets = self._neighbor_offsets
+        cell = self._cell_key(agent.position)
+        food = self._environment.sample_food(cell)
+        danger = self._environment.sample_danger(cell) if ctx.danger_present else 0.0
+        behavior = steering.behavior_state(self, agent, food)
+        neighbor_ids = tuple(map(_AGENT_ID, neighbors))
+        base = self._group_bases.get(agent.group_id)
+        entry = cache.get(agent.id)
+        if (
+            entry is not None
+            and entry.group_id == agent.group_id
+            and entry.behavior == behavior
+            and entry.speed_limit == speed_limit
+            and entry.cell == cell
+            and entry.environment_ticks == self._environment_ticks
+            and entry.base is base
+            and not (agent.state in _WANDERING and agent.wander_time <= 0.0)
+            and cache.fields_match(entry, food, danger)
+            and cache.matches(entry, agent, neighbor_ids, neighbors, offsets)
+        ):
+            entry.reused += 1
+            cache.keep(agent.id, entry)
+            ctx.steering_reused += 1
+            if agent.state in _WANDERING:
+                # Count the wander timer down as `wander_direction` would, so the refresh still lands.
+                agent.wander_time -= ctx.dt
+            return entry.desired, entry.sensed_danger
+
+        desired, sensed_danger = self._steer(agent, ctx, speed_limit, traits, index, cell)
+        ctx.steering_recomputed += 1
+        if entry is not None and entry.reused:
+            self._note_steering_deviation(ctx, entry.desired, desired)
+        agent.last_desired = desired
+        agent.last_sensed_danger = sensed_danger
+        cache.keep(
+            agent.id,
+            cache.capture(
+                desired,
+                sensed_danger,
                 agent,
-                self._neighbor_agents,
-                self._neighbor_offsets,
+                behavior,
                 speed_limit,
-                return_sensed=True,
-                neighbor_dist_sq=self._neighbor_dist_sq,
-                traits=traits,
-                danger_present=ctx.danger_present,
-                base_cell_key=self._cell_key(agent.position),
-            )
-            agent.last_desired = desired
-            agent.last_sensed_danger = sensed_danger
-            return desired, sensed_danger
+                cell,
+                neighbor_ids,
+                neighbors,
+                offsets,
+                food,
+                danger,
+                self._environment_ticks,
+                base,
+            ),
+        )
+        return desired, sensed_danger
 
-        return agent.last_desired, agent.last_sensed_danger
+    def _steer(
+        self,
+        agent: Agent,
+        ctx: TickContext,
+        speed_limit: float,
+        traits: AgentTraits,
+        index: int,
+        base_cell_key: tuple[int, int] | None = None,
+    ) -> tuple[Vector2, bool]:
+        batch = ctx.batch_steering
+        if batch is not None:
+            return Vector2(batch.desired_x[index], batch.desired_y[index]), batch.sensed[index]
+        if base_cell_key is None:
+            base_cell_key = self._cell_key(agent.position)
+        return steering.compute_desired_velocity(
+            self,
+            agent,
+            self._neighbor_agents,
+            self._neighbor_offsets,
+            speed_limit,
+            return_sensed=True,
+            neighbor_dist_sq=self._neighbor_dist_sq,
+            traits=traits,
+            danger_present=ctx.danger_present,
+            base_cell_key=base_cell_key,
+        )
+
+    @staticmethod
+    def _note_steering_deviation(ctx: TickContext, reused: Vector2, desired: Vector2) -> None:
+        deviation = math.hypot(desired.x - reused.x, desired.y - reused.y)
+        if deviation > ctx.steering_max_deviation:
+            ctx.steering_max_deviation = deviation
 
     def _integrate_motion(
         self, agent: Agent, desired: Vector2, speed_limit: float, dt: float
@@ -342,19 +602,24 @@ class World:
         vel_x = agent.velocity.x + accel_x * dt
         vel_y = agent.velocity.y + accel_y * dt
         vel_x, vel_y = _clamp_length_xy_f(vel_x, vel_y, speed_limit)
-        agent.position.update(
-            agent.position.x + vel_x * dt,
-            agent.position.y + vel_y * dt,
+        position = agent.position
+        position.update(
+            position.x + vel_x * dt,
+            position.y + vel_y * dt,
         )
-        steering.resolve_overlap(self, agent.position, self._neighbor_offsets, self._neighbor_dist_sq)
+        steering.resolve_overlap(self, position, self._neighbor_offsets, self._neighbor_dist_sq)
         pos_x, pos_y, vel_x, vel_y = self._reflect(
-            agent.position.x, agent.position.y, vel_x, vel_y, self._config.world_size
+            position.x, position.y, vel_x, vel_y, self._config.world_size
         )
-        agent.position.update(pos_x, pos_y)
-        agent.velocity.update(vel_x, vel_y)
+        position.update(pos_x, pos_y)
+        velocity = agent.velocity
+        velocity.update(vel_x, vel_y)
+        # Assign back so store-backed views persist the in-place updates.
+        agent.position = position
+        agent.velocity = velocity
         self._update_heading(agent)
         agent.age += dt
-        return self._cell_key(agent.position)
+        return self._cell_key(position)
 
     def _apply_lifecycle(
         self,
@@ -385,11 +650,7 @@ class World:
         self, agent: Agent, base_cell_key: tuple[int, int], sensed_danger: bool
     ) -> None:
         if agent.state == AgentState.FLEE or sensed_danger:
-            pending_danger = self._pending_danger
-            pending_danger[base_cell_key] = (
-                pending_danger.get(base_cell_key, 0.0)
-                + self._config.environment.danger_pulse_on_flee
-            )
+            self._pending_danger.add(base_cell_key, self._config.environment.danger_pulse_on_flee)
 
     def _accumulate_agent_stats(self, aggregates: TickAggregates, agent: Agent) -> None:
         aggregates.population += 1
@@ -397,8 +658,6 @@ class World:
         aggregates.age_sum += agent.age
         if agent.group_id == self._UNGROUPED:
             aggregates.ungrouped += 1
-        else:
-            aggregates.group_ids.add(agent.group_id)
 
     def _accumulate_birth_queue(self, aggregates: TickAggregates) -> None:
         if not self._birth_queue:
@@ -409,15 +668,23 @@ class World:
             aggregates.age_sum += born.age
             if born.group_id == self._UNGROUPED:
                 aggregates.ungrouped += 1
-            else:
-                aggregates.group_ids.add(born.group_id)
 
     def _finalize_tick(
         self, ctx: TickContext, aggregates: TickAggregates
     ) -> tuple[int, float, float, int, int]:
-        self._apply_births()
-        aggregates.deaths += self._remove_dead()
-        active_groups = aggregates.group_ids
+        if self._batch_food:
+            gained = fields.resolve_food_demand(self)
+            if self._tick_intents is None:
+                aggregates.energy_sum += gained
+        if self._tick_intents is not None:
+            self._swap_tick_buffers(aggregates)
+        self._accumulate_birth_queue(aggregates)
+        if self._reuse_slots:
+            aggregates.deaths += self._recycle_slots()
+        else:
+            self._apply_births()
+            aggregates.deaths += self._remove_dead()
+        active_groups = self._group_registry.active
         groups.prune_group_bases(self, active_groups)
         fields.apply_field_events(self)
         fields.tick_environment(self, active_groups)
@@ -426,7 +693,7 @@ class World:
             aggregates.population,
             aggregates.energy_sum,
             aggregates.age_sum,
-            aggregates.group_ids,
+            len(active_groups),
             aggregates.ungrouped,
         )
 
@@ -455,16 +722,18 @@ class World:
 
     def _bootstrap_population(self) -> None:
         for _ in range(self._config.initial_population):
+            self._bind_rng(self._next_id, STREAM_SPAWN)
             traits = self._sample_initial_traits()
             lineage = self._allocate_lineage_id()
-            speed_limit = self._trait_speed_limit(traits)
+            derived = self._derive_traits(traits)
+            speed_limit = derived.speed_limit
             appearance = self._config.appearance
             pos = Vector2(
                 self._rng.next_range(0.0, self._config.world_size),
                 self._rng.next_range(0.0, self._config.world_size),
             )
             velocity = self._rng.next_unit_circle() * (speed_limit * 0.3)
-            agent = Agent(
+            agent = self._create_agent(
                 id=self._next_id,
                 generation=0,
                 group_id=self._UNGROUPED,
@@ -477,6 +746,7 @@ class World:
                 lineage_id=lineage,
                 traits=traits,
                 traits_dirty=False,
+                derived=derived,
                 appearance_h=appearance.base_h,
                 appearance_s=appearance.base_s,
                 appearance_l=appearance.base_l,
@@ -484,9 +754,150 @@ class World:
                 wander_time=self._config.species.wander_refresh_seconds,
                 last_desired=velocity.copy(),
             )
+            self._id_to_index[agent.id] = len(self._agents)
             self._agents.append(agent)
+            self._group_registry.add(agent.id, agent.group_id)
             self._next_id += 1
 
+    def _create_agent_rng(self, seed: int) -> DeterministicRng | CounterRng:
+        version = self._config.rng_version
+        if version == 1:
+            return DeterministicRng(seed)
+        if version == 2:
+            return CounterRng(seed)
+        raise ValueError(f"Unknown rng_version: {version}")
+
+    def _bind_rng(self, agent_id: int, stream: int) -> None:
+        self._rng.bind(agent_id, stream)
+        self._appearance_rng.bind(agent_id, stream)
+
+    def replay_governor_trace(self, trace: Mapping[int, int]) -> None:
+        """Take the stride level for each listed tick from `trace` instead of from tick timings."""
+
+        if self._governor is None:
+            raise ValueError("replay_governor_trace requires tick_governor='budget'")
+        self._governor.replay(trace)
+
+    def _create_tick_intents(self) -> intents.TickIntents | None:
+        mode = self._config.performance.tick_update
+        if mode == "in_place":
+            return None
+        if mode == "double_buffer":
+            return intents.TickIntents()
+        raise ValueError(f"Unknown tick_update: {mode}")
+
+    def _create_spatial_grid(self) -> SpatialGrid | DenseSpatialGrid:
+        kind = self._config.performance.spatial_grid
+        if kind == "hash":
+            return SpatialGrid(self._config.cell_size)
+        if kind == "dense":
+            return DenseSpatialGrid(self._config.cell_size, self._config.world_size)
+        raise ValueError(f"Unknown spatial grid: {kind}")
+
+    def _create_environment(self) -> EnvironmentGrid:
+        config = self._config
+        performance = config.performance
+        if performance.field_gradients not in ("direct", "cached"):
+            raise ValueError(f"Unknown field gradients: {performance.field_gradients}")
+        cache_gradients = performance.field_gradients == "cached"
+        kind = performance.food_field
+        if kind == "sparse":
+            environment_type = EnvironmentGrid
+        elif kind == "dense":
+            environment_type = DenseEnvironmentGrid
+        else:
+            raise ValueError(f"Unknown food field: {kind}")
+        return environment_type(
+            config.cell_size,
+            config.environment,
+            config.world_size,
+            pheromone_field=performance.pheromone_field,
+            cache_gradients=cache_gradients,
+            danger_field=performance.danger_field,
+            diffusion_solver=performance.diffusion_solver,
+        )
+
+    def _create_neighbor_list(self) -> VerletNeighborList | None:
+        performance = self._config.performance
+        if performance.neighbor_search == "grid":
+            return None
+        if performance.neighbor_search == "verlet":
+            return VerletNeighborList(self._config.cell_size, self._vision_radius, performance.neighbor_skin)
+        raise ValueError(f"Unknown neighbor search: {performance.neighbor_search}")
+
+    def _create_agent_store(self) -> AgentStore | None:
+        storage = self._config.performance.agent_storage
+        if storage == "objects":
+            return None
+        if storage == "soa":
+            return AgentStore(max(256, self._config.max_population))
+        raise ValueError(f"Unknown agent storage: {storage}")
+
+    def _resolve_agent_slots(self) -> bool:
+        mode = self._config.performance.agent_slots
+        if mode == "compact":
+            return False
+        if mode == "free_list":
+            return True
+        raise ValueError(f"Unknown agent slots: {mode}")
+
+    def _resolve_food_consumption(self) -> bool:
+        mode = self._config.performance.food_consumption
+        if mode == "sequential":
+            return False
+        if mode == "batched":
+            return True
+        raise ValueError(f"Unknown food consumption: {mode}")
+
+    def _create_steering_cache(self) -> SteeringCache | None:
+        performance = self._config.performance
+        mode = performance.steering_reuse
+        if mode == "stride":
+            return None
+        if mode == "coherent":
+            if self._steering_backend != "scalar":
+                raise ValueError("steering_reuse='coherent' requires steering_backend='scalar'")
+            return SteeringCache(performance.steering_reuse_tolerance, performance.steering_field_tolerance)
+        raise ValueError(f"Unknown steering reuse: {mode}")
+
+    def _create_tick_governor(self) -> TickGovernor | None:
+        performance = self._config.performance
+        mode = performance.tick_governor
+        if mode == "off":
+            return None
+        if mode == "budget":
+            return TickGovernor(
+                performance.tick_budget_ms,
+                performance.tick_governor_window,
+                performance.tick_governor_low_ratio,
+                performance.tick_governor_max_level,
+            )
+        raise ValueError(f"Unknown tick governor: {mode}")
+
+    def _resolve_group_updates(self) -> bool:
+        mode = self._config.performance.group_updates
+        if mode == "stride":
+            return False
+        if mode == "on_change":
+            return True
+        raise ValueError(f"Unknown group updates: {mode}")
+
+    def _resolve_steering_backend(self) -> str:
+        backend = self._config.performance.steering_backend
+        if backend not in ("scalar", "batch"):
+            raise ValueError(f"Unknown steering backend: {backend}")
+        pair_enumeration = self._config.performance.pair_enumeration
+        if pair_enumeration not in ("directed", "half_shell"):
+            raise ValueError(f"Unknown pair enumeration: {pair_enumeration}")
+        return backend
+
+    def _create_agent(self, derived: DerivedTraits | None = None, **fields: Any) -> Agent:
+        if self._store is None:
+            return Agent(derived=derived, **fields)
+        view = self._store.allocate(**fields)
+        view.derived = derived
+        return view
+
     def _refresh_vision_cache(self) -> None:
         self._vision_radius = self._config.species.vision_radius
         self._vision_radius_sq = self._vision_radius * self._vision_radius
@@ -789,12 +1200,17 @@ class World:
         return self._environment._cell_key(position)
 
     def _apply_births(self) -> None:
+        id_to_index = self._id_to_index
+        registry = self._group_registry
         for agent in self._birth_queue:
+            id_to_index[agent.id] = len(self._agents)
             self._agents.append(agent)
+            registry.add(agent.id, agent.group_id)
         self._birth_queue.clear()
 
     def _refresh_index_map(self) -> None:
         self._id_to_index = {agent.id: i for i, agent in enumerate(self._agents)}
+        self._group_registry.rebuild(self._agents)
         if self._agents:
             max_lineage = max(agent.lineage_id for agent in self._agents)
             self._next_lineage_id = max(self._next_lineage_id, max_lineage + 1)
@@ -802,12 +1218,64 @@ class World:
     def _remove_dead(self) -> int:
         deaths = 0
         survivors = []
+        registry = self._group_registry
         for agent in self._agents:
             if agent.alive:
                 survivors.append(agent)
             else:
+                registry.remove(agent.id, agent.group_id)
                 deaths += 1
-        self._agents = survivors
+        if deaths:
+            self._agents = survivors
+            self._id_to_index = {agent.id: i for i, agent in enumerate(survivors)}
+        if self._store is not None:
+            self._store.retain(self._agents)
+        return deaths
+
+    def _recycle_slots(self) -> int:
+        """
+        Free-list variant of `_apply_births` + `_remove_dead`, touching only the changed slots.
+
+        Slots of agents that died this tick (recorded in ascending order by `step`) are refilled
+        with newborns first; leftover newborns are appended and leftover holes are filled from the
+        tail, so the list stays dense and `_id_to_index` stays valid at O(births + deaths) cost.
+        """
+
+        agents = self._agents
+        id_to_index = self._id_to_index
+        store = self._store
+        holes = self._dead_slots
+        births = self._birth_queue
+        registry = self._group_registry
+        for slot in holes:
+            registry.remove(agents[slot].id, agents[slot].group_id)
+        for born in births:
+            registry.add(born.id, born.group_id)
+        reused = min(len(holes), len(births))
+        for slot, born in zip(holes, births):
+            del id_to_index[agents[slot].id]
+            agents[slot] = born
+            id_to_index[born.id] = slot
+            if store is not None:
+                store.move(born, slot)
+        for born in births[reused:]:
+            id_to_index[born.id] = len(agents)
+            if store is not None:
+                store.move(born, len(agents))
+            agents.append(born)
+        for slot in reversed(holes[reused:]):
+            del id_to_index[agents[slot].id]
+            last = agents.pop()
+            if slot < len(agents):
+                agents[slot] = last
+                id_to_index[last.id] = slot
+                if store is not None:
+                    store.move(last, slot)
+        if store is not None:
+            store.truncate(len(agents))
+        deaths = len(holes)
+        holes.clear()
+        births.clear()
         return deaths
 
     @staticmethod
@@ -838,10 +1306,7 @@ class World:
         return x, y, vx, vy
 
     def _active_group_ids(self) -> Set[int]:
-        groups: Set[int] = set()
-        for agent in self._agents:
-            if agent.group_id != self._UNGROUPED:
-                groups.add(agent.group_id)
+        groups = set(self._group_registry.active)
         for agent in self._birth_queue:
             if agent.group_id != self._UNGROUPED:
                 groups.add(agent.group_id)
@@ -872,8 +1337,6 @@ class World:
         energy_sum = 0.0
         age_sum = 0.0
         ungrouped = 0
-        group_ids = self._group_scratch
-        group_ids.clear()
         for agent in self._agents:
             if not agent.alive:
                 continue
@@ -882,17 +1345,15 @@ class World:
             age_sum += agent.age
             if agent.group_id == self._UNGROUPED:
                 ungrouped += 1
-            else:
-                group_ids.add(agent.group_id)
-        return self._update_cached_population_stats(population, energy_sum, age_sum, group_ids, ungrouped)
+        return self._update_cached_population_stats(
+            population, energy_sum, age_sum, len(self._group_registry.active), ungrouped
+        )
 
     def _update_cached_population_stats(
-        self, population: int, energy_sum: float, age_sum: float, group_ids: Set[int], ungrouped: int
+        self, population: int, energy_sum: float, age_sum: float, groups: int, ungrouped: int
     ) -> tuple[int, float, float, int, int]:
         avg_energy = 0.0 if population == 0 else energy_sum / population
         avg_age = 0.0 if population == 0 else age_sum / population
-        groups = len(group_ids)
-        group_ids.clear()
         self._cached_population_stats = (population, avg_energy, avg_age, groups, ungrouped)
         self._population_stats_dirty = False
         return self._cached_population_stats
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from typing import Set, TYPE_CHECKING
+from typing import AbstractSet, TYPE_CHECKING
 
 from pygame.math import Vector2
 
@@ -27,35 +27,26 @@ def orthogonal_neighbor_keys(
 
 
 def food_gradient(world: World, position: Vector2, base_key: tuple[int, int] | None = None) -> Vector2:
-    right_key, left_key, up_key, down_key = orthogonal_neighbor_keys(world, position, base_key)
-    right = world._environment.peek_food(right_key)
-    left = world._environment.peek_food(left_key)
-    up = world._environment.peek_food(up_key)
-    down = world._environment.peek_food(down_key)
-    return Vector2(right - left, up - down)
+    if base_key is None:
+        base_key = world._environment._cell_key(position)
+    return Vector2(world._environment.food_gradient(base_key))
 
 
 def pheromone_gradient(
     world: World, group_id: int, position: Vector2, base_key: tuple[int, int] | None = None
 ) -> Vector2:
-    right_key, left_key, up_key, down_key = orthogonal_neighbor_keys(world, position, base_key)
-    right = world._environment.sample_pheromone(right_key, group_id)
-    left = world._environment.sample_pheromone(left_key, group_id)
-    up = world._environment.sample_pheromone(up_key, group_id)
-    down = world._environment.sample_pheromone(down_key, group_id)
-    return Vector2(right - left, up - down)
+    if base_key is None:
+        base_key = world._environment._cell_key(position)
+    return Vector2(world._environment.pheromone_gradient(base_key, group_id))
 
 
 def danger_gradient(world: World, position: Vector2, base_key: tuple[int, int] | None = None) -> Vector2:
-    right_key, left_key, up_key, down_key = orthogonal_neighbor_keys(world, position, base_key)
-    right = world._environment.sample_danger(right_key)
-    left = world._environment.sample_danger(left_key)
-    up = world._environment.sample_danger(up_key)
-    down = world._environment.sample_danger(down_key)
-    return Vector2(right - left, up - down)
+    if base_key is None:
+        base_key = world._environment._cell_key(position)
+    return Vector2(world._environment.danger_gradient(base_key))
 
 
-def tick_environment(world: World, active_groups: Set[int]) -> None:
+def tick_environment(world: World, active_groups: AbstractSet[int]) -> None:
     env_dt = (
         world._config.environment_tick_interval
         if world._config.environment_tick_interval > 1e-6
@@ -66,6 +57,7 @@ def tick_environment(world: World, active_groups: Set[int]) -> None:
         world._environment.prune_pheromones(active_groups)
         world._environment.set_food_regen_multiplier(update_food_regen_noise(world, env_dt))
         world._environment.tick(env_dt)
+        world._environment_ticks += 1
         world._environment_accumulator -= env_dt
 
 
@@ -104,13 +96,46 @@ def update_food_regen_noise(world: World, env_dt: float) -> float:
     return world._food_regen_noise_multiplier
 
 
+def resolve_food_demand(world: World) -> float:
+    """
+    Feed the agents that asked for food this tick, one pass per occupied cell.
+
+    Every eater asks for the same amount, so a cell that cannot cover all of them is split evenly;
+    the result does not depend on the order agents registered in. Returns the energy given to
+    agents that are still alive.
+    """
+
+    demand = world._food_demand
+    if not demand:
+        return 0.0
+    request = world._config.environment.food_consumption_rate * world._config.time_step
+    environment = world._environment
+    gained = 0.0
+    for cell_key, eaters in demand.items():
+        available = environment.sample_food(cell_key)
+        if available <= 0:
+            continue
+        share = min(request, available / len(eaters))
+        environment.consume_food(cell_key, share * len(eaters))
+        for agent in eaters:
+            agent.energy += share
+            if agent.alive:
+                gained += share
+    demand.clear()
+    return gained
+
+
 def apply_field_events(world: World) -> None:
-    for cell_key, amt in world._pending_food.items():
-        world._environment.add_food(cell_key, amt)
-    for cell_key, amt in world._pending_danger.items():
-        world._environment.add_danger(cell_key, amt)
-    for (cell_key, gid), amt in world._pending_pheromone.items():
-        world._environment.add_pheromone(cell_key, gid, amt)
+    environment = world._environment
+    if world._pending_food:
+        xs, ys, _, totals = world._pending_food.reduce()
+        environment.add_food_events(xs, ys, totals)
+    if world._pending_danger:
+        xs, ys, _, totals = world._pending_danger.reduce()
+        environment.add_danger_events(xs, ys, totals)
+    if world._pending_pheromone:
+        xs, ys, group_ids, totals = world._pending_pheromone.reduce()
+        environment.add_pheromone_events(xs, ys, group_ids, totals)
     world._pending_food.clear()
     world._pending_danger.clear()
     world._pending_pheromone.clear()
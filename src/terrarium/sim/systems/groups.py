@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import math
-from typing import List, Set, TYPE_CHECKING
+from operator import attrgetter
+from typing import AbstractSet, List, TYPE_CHECKING
 
 from pygame.math import Vector2
 
 from ..core.agent import Agent, AgentTraits
+from ..core.rng import STREAM_GROUPS
 
 if TYPE_CHECKING:
     from ..core.world import World
 
+_GROUP_ID = attrgetter("group_id")
+
 
 def decay_group_cooldown(world: World, agent: Agent) -> None:
     if agent.group_cooldown > 0.0:
@@ -17,6 +21,7 @@ def decay_group_cooldown(world: World, agent: Agent) -> None:
 
 
 def set_group(world: World, agent: Agent, group_id: int) -> None:
+    world._group_registry.move(agent.id, agent.group_id, group_id)
     agent.group_id = group_id
     agent.group_lonely_seconds = 0.0
     if group_id == world._UNGROUPED:
@@ -28,6 +33,53 @@ def set_group(world: World, agent: Agent, group_id: int) -> None:
         )
 
 
+def neighborhood_signature(
+    world: World,
+    agent: Agent,
+    neighbors: List[Agent],
+    neighbor_dist_sq: List[float],
+    detach_radius_sq: float,
+) -> tuple[tuple[int, ...], int, int]:
+    """
+    The neighbor group histogram as sorted neighbor group ids (ungrouped ones as `_UNGROUPED`), plus
+    the agent's same-group and close same-group neighbor counts.
+    """
+
+    histogram = tuple(sorted(map(_GROUP_ID, neighbors)))
+    group_id = agent.group_id
+    same_group_neighbors = 0
+    same_group_close_neighbors = 0
+    if group_id != world._UNGROUPED:
+        same_group_neighbors = histogram.count(group_id)
+        if same_group_neighbors:
+            for other, dist_sq in zip(neighbors, neighbor_dist_sq):
+                if dist_sq <= detach_radius_sq and other.group_id == group_id:
+                    same_group_close_neighbors += 1
+    return histogram, same_group_neighbors, same_group_close_neighbors
+
+
+def group_update_due(world: World, agent: Agent, traits: AgentTraits, has_close_allies: bool) -> bool:
+    """Whether skipping this tick's update would miss the merge cooldown ending or the detach timer expiring."""
+
+    dt = world._config.time_step
+    if 0.0 < agent.group_cooldown <= dt:
+        return True
+    if agent.group_id == world._UNGROUPED or has_close_allies:
+        return False
+    detach_seconds = world._config.feedback.group_detach_after_seconds * max(0.1, traits.loyalty)
+    return agent.group_lonely_seconds + dt >= detach_seconds
+
+
+def assign_group(world: World, source: Agent, target: Agent, group_id: int) -> None:
+    """Move a neighbor into `group_id`, deferred to the buffer swap in double-buffered ticks."""
+
+    intents = world._tick_intents
+    if intents is None:
+        set_group(world, target, group_id)
+    else:
+        intents.request_group(target.id, source.id, group_id)
+
+
 def register_group_base(world: World, group_id: int, position: Vector2) -> None:
     if group_id == world._UNGROUPED:
         return
@@ -36,7 +88,7 @@ def register_group_base(world: World, group_id: int, position: Vector2) -> None:
     world._group_bases[group_id] = Vector2(position)
 
 
-def prune_group_bases(world: World, active_groups: Set[int]) -> None:
+def prune_group_bases(world: World, active_groups: AbstractSet[int]) -> None:
     if not world._group_bases:
         return
     if not active_groups:
@@ -53,6 +105,7 @@ def recruit_split_neighbors(
     new_group: int,
     neighbors: List[Agent],
     neighbor_offsets: List[Vector2],
+    source: Agent,
 ) -> None:
     max_recruits = world._config.feedback.group_split_recruitment_count
     if max_recruits <= 0 or new_group == world._UNGROUPED:
@@ -70,7 +123,7 @@ def recruit_split_neighbors(
         return
     candidates.sort(key=lambda item: item[0])
     for _, recruit in candidates[:max_recruits]:
-        set_group(world, recruit, new_group)
+        assign_group(world, source, recruit, new_group)
 
 
 def update_group_membership(
@@ -91,6 +144,7 @@ def update_group_membership(
     kin_bias = traits.kin_bias
     use_kin_bias = abs(kin_bias - 1.0) > 1e-6
     prev_lonely = agent.group_lonely_seconds
+    world._bind_rng(agent.id, STREAM_GROUPS)
     decay_group_cooldown(world, agent)
     world._group_counts_scratch.clear()
     world._ungrouped_neighbors.clear()
@@ -172,19 +226,9 @@ def update_group_membership(
             )
     if agent.group_id == world._UNGROUPED and world._group_bases:
         seek_radius = world._config.feedback.group_seek_radius * 1.5
-        seek_radius_sq = seek_radius * seek_radius
-        nearest_group = world._UNGROUPED
-        nearest_dist_sq = seek_radius_sq
-        for gid, base in world._group_bases.items():
-            offset = base - agent.position
-            dist_sq = offset.length_squared()
-            if dist_sq <= 1e-12 or dist_sq > seek_radius_sq:
-                continue
-            if dist_sq < nearest_dist_sq:
-                nearest_group = gid
-                nearest_dist_sq = dist_sq
-        if nearest_group != world._UNGROUPED and world._rng.next_float() < feedback.group_adoption_chance:
-            set_group(world, agent, nearest_group)
+        nearest = world._group_bases.nearest(agent.position.x, agent.position.y, seek_radius * seek_radius)
+        if nearest is not None and world._rng.next_float() < feedback.group_adoption_chance:
+            set_group(world, agent, nearest[0])
     if agent.group_id == original_group:
         try_split_group(
             world, agent, same_group_neighbors, neighbors, neighbor_offsets, can_form_groups, traits=traits
@@ -206,7 +250,7 @@ def try_form_group(world: World, agent: Agent) -> None:
     set_group(world, agent, new_group)
     recruits = min(len(world._ungrouped_neighbors), world._config.feedback.group_formation_neighbor_threshold + 2)
     for neighbor in world._ungrouped_neighbors[:recruits]:
-        set_group(world, neighbor, new_group)
+        assign_group(world, agent, neighbor, new_group)
 
 
 def try_adopt_group(
@@ -223,7 +267,7 @@ def try_adopt_group(
         return
     if agent.group_id != world._UNGROUPED and same_group_neighbors >= world._config.feedback.group_adoption_guard_min_allies:
         return
-    target_size = world._group_sizes.get(majority_group, majority_count)
+    target_size = world._group_registry.tick_size(majority_group, majority_count)
     size_for_threshold = target_size if target_size > 0 else majority_count
     effective_threshold = max(
         1,
@@ -282,4 +326,4 @@ def try_split_group(
             register_group_base(world, target_group, agent.position)
         set_group(world, agent, target_group)
         if target_group != world._UNGROUPED and can_form_groups:
-            recruit_split_neighbors(world, previous_group, target_group, neighbors, neighbor_offsets)
+            recruit_split_neighbors(world, previous_group, target_group, neighbors, neighbor_offsets, source=agent)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, TYPE_CHECKING
+
+from ..core.agent import Agent
+from .groups import set_group
+
+if TYPE_CHECKING:
+    from ..core.world import World
+
+
+@dataclass(slots=True)
+class TickIntents:
+    """
+    Writes one agent makes to another during a double-buffered tick.
+
+    They are applied when the buffers swap. Resolution depends only on agent ids, not on the
+    order agents were updated in: the lowest source id wins a group reassignment, and energy
+    charges are summed in source id order.
+    """
+
+    groups: Dict[int, tuple[int, int]] = field(default_factory=dict)
+    energy: Dict[int, List[tuple[int, float]]] = field(default_factory=dict)
+
+    def clear(self) -> None:
+        self.groups.clear()
+        self.energy.clear()
+
+    def request_group(self, target_id: int, source_id: int, group_id: int) -> None:
+        current = self.groups.get(target_id)
+        if current is None or source_id < current[0]:
+            self.groups[target_id] = (source_id, group_id)
+
+    def request_energy(self, target_id: int, source_id: int, amount: float) -> None:
+        self.energy.setdefault(target_id, []).append((source_id, amount))
+
+
+def charge_energy(world: World, source: Agent, target: Agent, amount: float) -> None:
+    intents = world._tick_intents
+    if intents is None:
+        target.energy -= amount
+    else:
+        intents.request_energy(target.id, source.id, amount)
+
+
+def apply_intents(world: World, intents: TickIntents) -> None:
+    if not intents.groups and not intents.energy:
+        return
+    for agent in world._agents:
+        if not agent.alive:
+            continue
+        charges = intents.energy.get(agent.id)
+        if charges is not None:
+            for _, amount in sorted(charges, key=lambda item: item[0]):
+                agent.energy -= amount
+        request = intents.groups.get(agent.id)
+        if request is not None:
+            set_group(world, agent, request[1])
+    intents.clear()
@@ -6,8 +6,10 @@ from typing import TYPE_CHECKING
 from pygame.math import Vector2
 
 from ..core.agent import Agent, AgentTraits, AgentState
+from ..core.rng import STREAM_LIFECYCLE
 from ..utils.math2d import _clamp_length
-from .groups import register_group_base, set_group
+from .groups import assign_group, register_group_base, set_group
+from .intents import charge_energy
 
 if TYPE_CHECKING:
     from ..core.world import World
@@ -50,14 +52,16 @@ def apply_life_cycle(
 ) -> int:
     dt = world._config.time_step
     births_added = 0
+    world._bind_rng(agent.id, STREAM_LIFECYCLE)
     if population is None:
         population = len(world._agents)
-    traits = world._clamp_traits(agent.traits) if traits is None else traits
+    derived = world._derived_traits(agent)
+    traits = agent.traits if traits is None else traits
     if base_cell_key is None:
         base_cell_key = world._cell_key(agent.position)
     pending_food = world._pending_food
     pending_pheromone = world._pending_pheromone
-    metabolism_multiplier = world._trait_metabolism_multiplier(traits)
+    metabolism_multiplier = derived.metabolism_multiplier
     speed_cost = agent.velocity.length() * 0.05 * metabolism_multiplier
     metabolism = (world._config.species.metabolism_per_second * metabolism_multiplier + speed_cost) * dt
     excess_energy = max(0.0, agent.energy - world._config.species.energy_soft_cap)
@@ -69,14 +73,12 @@ def apply_life_cycle(
 
     if neighbor_count > world._config.feedback.local_density_soft_cap:
         agent.stress += 0.1 * dt
-        disease_resistance = world._trait_disease_resistance(traits)
+        disease_resistance = derived.disease_resistance
         disease_risk = neighbor_count * world._config.feedback.disease_probability_per_neighbor * dt
         disease_risk = disease_risk / max(0.1, disease_resistance)
         if world._rng.next_float() < disease_risk:
             agent.alive = False
-            pending_food[base_cell_key] = (
-                pending_food.get(base_cell_key, 0.0) + world._config.environment.food_from_death
-            )
+            pending_food.add(base_cell_key, world._config.environment.food_from_death)
             return births_added
     else:
         agent.stress = max(0.0, agent.stress - 0.05 * dt)
@@ -85,11 +87,14 @@ def apply_life_cycle(
     gained_energy = 0.0
     remaining = max_consumption
     if remaining > 0.0:
-        available = world._environment.sample_food(base_cell_key)
-        if available > 0:
-            consumed = min(available, remaining)
-            world._environment.consume_food(base_cell_key, consumed)
-            gained_energy += consumed
+        if world._batch_food:
+            world._food_demand.setdefault(base_cell_key, []).append(agent)
+        else:
+            available = world._environment.sample_food(base_cell_key)
+            if available > 0:
+                consumed = min(available, remaining)
+                world._environment.consume_food(base_cell_key, consumed)
+                gained_energy += consumed
     agent.energy += gained_energy
 
     allow_reproduction = world._config.initial_population >= 10
@@ -137,13 +142,8 @@ def apply_life_cycle(
                         world._config.feedback.group_reproduction_min_factor,
                         1.0 - penalty,
                     )
-                mate_traits = (
-                    world._clamp_traits(mate.traits) if mate.traits_dirty else mate.traits
-                )
-                trait_factor = math.sqrt(
-                    world._trait_reproduction_factor(traits)
-                    * world._trait_reproduction_factor(mate_traits)
-                )
+                mate_derived = world._derived_traits(mate)
+                trait_factor = math.sqrt(derived.reproduction_factor * mate_derived.reproduction_factor)
                 base_reproduction = max(0.0, float(world._config.feedback.reproduction_base_chance))
                 reproduction_chance = max(
                     0.0, min(1.0, base_reproduction * density_factor * group_factor * trait_factor)
@@ -153,9 +153,12 @@ def apply_life_cycle(
                     paired_ids.add(mate.id)
                     child_energy = agent.energy * 0.25 + mate.energy * 0.25
                     agent.energy -= agent.energy * 0.25 + world._config.species.birth_energy_cost * 0.5
-                    mate.energy -= mate.energy * 0.25 + world._config.species.birth_energy_cost * 0.5
+                    charge_energy(
+                        world, agent, mate, mate.energy * 0.25 + world._config.species.birth_energy_cost * 0.5
+                    )
                     base_group = world._inherit_group_pair(agent, mate)
-                    child_traits = world._inherit_traits_pair(traits, mate_traits)
+                    child_traits = world._inherit_traits_pair(traits, mate.traits)
+                    child_derived = world._derive_traits(child_traits)
                     child_group = mutate_group(
                         world,
                         base_group,
@@ -167,7 +170,7 @@ def apply_life_cycle(
                         if agent.group_id == world._UNGROUPED:
                             set_group(world, agent, child_group)
                         if mate.group_id == world._UNGROUPED:
-                            set_group(world, mate, child_group)
+                            assign_group(world, agent, mate, child_group)
                     child_cooldown = (
                         world._config.feedback.group_merge_cooldown_seconds
                         if child_group != world._UNGROUPED
@@ -181,10 +184,10 @@ def apply_life_cycle(
                     )
                     child_velocity = _clamp_length(
                         (agent.velocity + mate.velocity) * 0.5,
-                        world._trait_speed_limit(child_traits),
+                        child_derived.speed_limit,
                     )
                     spawn_center = (agent.position + mate.position) * 0.5
-                    child = Agent(
+                    child = world._create_agent(
                         id=world._next_id,
                         generation=max(agent.generation, mate.generation) + 1,
                         group_id=child_group,
@@ -197,6 +200,7 @@ def apply_life_cycle(
                         lineage_id=child_lineage,
                         traits=child_traits,
                         traits_dirty=False,
+                        derived=child_derived,
                         appearance_h=child_appearance_h,
                         appearance_s=child_appearance_s,
                         appearance_l=child_appearance_l,
@@ -207,10 +211,8 @@ def apply_life_cycle(
                     world._birth_queue.append(child)
                     births_added += 1
                     if child_group != world._UNGROUPED:
-                        pheromone_key = (base_cell_key, child_group)
-                        pending_pheromone[pheromone_key] = (
-                            pending_pheromone.get(pheromone_key, 0.0)
-                            + world._config.environment.pheromone_deposit_on_birth
+                        pending_pheromone.add(
+                            base_cell_key, world._config.environment.pheromone_deposit_on_birth, child_group
                         )
 
     hazard_per_second = (
@@ -221,14 +223,10 @@ def apply_life_cycle(
     hazard_chance = min(1.0, hazard_per_second * dt)
     if hazard_chance > 0.0 and world._rng.next_float() < hazard_chance:
         agent.alive = False
-        pending_food[base_cell_key] = (
-            pending_food.get(base_cell_key, 0.0) + world._config.environment.food_from_death
-        )
+        pending_food.add(base_cell_key, world._config.environment.food_from_death)
         return births_added
 
     if agent.energy <= 0 or agent.age >= world._config.species.max_age:
         agent.alive = False
-        pending_food[base_cell_key] = (
-            pending_food.get(base_cell_key, 0.0) + world._config.environment.food_from_death
-        )
+        pending_food.add(base_cell_key, world._config.environment.food_from_death)
     return births_added
@@ -12,6 +12,16 @@ def create_metrics(
     neighbor_checks: int,
     duration_ms: float,
     stats: Tuple[int, float, float, int, int],
+    neighbor_list_rebuilds: int = 0,
+    neighbor_candidates: int = 0,
+    danger_cells: int = 0,
+    food_regen_cells: int = 0,
+    group_updates_evaluated: int = 0,
+    group_updates_skipped: int = 0,
+    steering_reused: int = 0,
+    steering_recomputed: int = 0,
+    steering_max_deviation: float = 0.0,
+    governor_level: int = 0,
 ) -> TickMetrics:
     population, avg_energy, avg_age, groups, ungrouped = stats
     return TickMetrics(
@@ -25,4 +35,14 @@ def create_metrics(
         neighbor_checks=neighbor_checks,
         ungrouped=ungrouped,
         tick_duration_ms=duration_ms,
+        neighbor_list_rebuilds=neighbor_list_rebuilds,
+        neighbor_candidates=neighbor_candidates,
+        danger_cells=danger_cells,
+        food_regen_cells=food_regen_cells,
+        group_updates_evaluated=group_updates_evaluated,
+        group_updates_skipped=group_updates_skipped,
+        steering_reused=steering_reused,
+        steering_recomputed=steering_recomputed,
+        steering_max_deviation=steering_max_deviation,
+        governor_level=governor_level,
     )
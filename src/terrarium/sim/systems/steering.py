@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass
 from typing import List, TYPE_CHECKING
 
 from pygame.math import Vector2
 
 from ..core.agent import Agent, AgentState, AgentTraits
+from ..core.rng import STREAM_STEERING
 from ..utils.math2d import ZERO, _clamp_length_xy, _clamp_length_xy_f, _safe_normalize_xy
 from . import fields
 
@@ -13,6 +15,185 @@ if TYPE_CHECKING:
     from ..core.world import World
 
 
+@dataclass(slots=True)
+class NeighborSums:
+    """
+    Raw per-agent neighbor reductions for one steering evaluation, filled by `accumulate_neighbors`.
+
+    Each sum is accumulated in neighbor order with the same expressions as the matching
+    standalone helper (`separation`, `personal_space`, ...), so finishing it gives the same bits.
+    """
+
+    flee_x: float
+    flee_y: float
+    flee_sensed: bool
+    separation_x: float
+    separation_y: float
+    closest_dist_sq: float
+    personal_x: float
+    personal_y: float
+    personal_count: int
+    avoid_x: float
+    avoid_y: float
+    avoid_count: int
+    group_cohesion_x: float
+    group_cohesion_y: float
+    group_cohesion_count: int
+    alignment_x: float
+    alignment_y: float
+    alignment_count: int
+    seek_x: float
+    seek_y: float
+    seek_weight: float
+    offset_x: float
+    offset_y: float
+
+
+def accumulate_neighbors(
+    world: World,
+    agent: Agent,
+    neighbors: List[Agent],
+    neighbor_offsets: List[Vector2],
+    neighbor_dist_sq: List[float],
+    base_speed: float,
+    flee_x: float,
+    flee_y: float,
+    personal: bool,
+    avoid: bool,
+    seek: bool,
+) -> NeighborSums:
+    """
+    One pass over the neighbors computing every accumulator `compute_desired_velocity` needs.
+
+    The flee sums start from the danger flee term. Separation, group cohesion, alignment and the
+    all-neighbor offset sum are always gathered (the flee branch uses them ungated); personal
+    space, intergroup avoidance and group seek only when their flag is set.
+    """
+
+    feedback = world._config.feedback
+    ungrouped = world._UNGROUPED
+    group_id = agent.group_id
+    grouped = group_id != ungrouped
+    sqrt = math.sqrt
+    flee_sensed = False
+    min_sep = max(0.0, float(feedback.min_separation_distance))
+    min_sep_sq = min_sep * min_sep
+    min_sep_weight = max(0.0, float(feedback.min_separation_weight))
+    # A disabled term gets a negative squared radius so its range check always fails.
+    min_sep_reach_sq = min_sep_sq if min_sep_weight > 0.0 and min_sep_sq > 1e-12 else -1.0
+    ally_weight = float(feedback.ally_separation_weight)
+    other_weight = float(feedback.other_group_separation_weight)
+    personal_radius = feedback.personal_space_radius
+    personal_radius_sq = personal_radius * personal_radius if personal else -1.0
+    avoid_radius = feedback.other_group_avoid_radius
+    avoid_radius_sq = avoid_radius * avoid_radius if avoid else -1.0
+    cohesion_radius_sq = feedback.group_cohesion_radius * feedback.group_cohesion_radius
+    seek_radius = max(0.0, float(feedback.group_seek_radius))
+    seek_radius_sq = seek_radius * seek_radius if seek else -1.0
+    separation_x = separation_y = 0.0
+    closest_dist_sq = float("inf")
+    personal_x = personal_y = 0.0
+    personal_count = 0
+    avoid_x = avoid_y = 0.0
+    avoid_count = 0
+    group_cohesion_x = group_cohesion_y = 0.0
+    group_cohesion_count = 0
+    alignment_x = alignment_y = 0.0
+    alignment_count = 0
+    seek_x = seek_y = 0.0
+    seek_weight = 0.0
+    offset_sum_x = offset_sum_y = 0.0
+    for other, offset, dist_sq in zip(neighbors, neighbor_offsets, neighbor_dist_sq):
+        other_group = other.group_id
+        offset_x = offset.x
+        offset_y = offset.y
+        offset_sum_x += offset_x
+        offset_sum_y += offset_y
+        dist = sqrt(dist_sq)
+        if dist_sq < closest_dist_sq:
+            closest_dist_sq = dist_sq
+
+        if grouped and other_group == group_id:
+            weight = ally_weight
+            velocity = other.velocity
+            alignment_x += velocity.x
+            alignment_y += velocity.y
+            alignment_count += 1
+            if dist_sq <= cohesion_radius_sq:
+                group_cohesion_x += offset_x
+                group_cohesion_y += offset_y
+                group_cohesion_count += 1
+        else:
+            weight = other_weight
+            if other_group != ungrouped and dist_sq > 1e-12:
+                if grouped:
+                    if dist_sq < 4.0:
+                        inv_len = 1.0 / dist
+                        flee_x -= offset_x * inv_len * base_speed
+                        flee_y -= offset_y * inv_len * base_speed
+                        flee_sensed = True
+                    if dist_sq > 1e-9 and dist_sq <= avoid_radius_sq:
+                        ratio = dist / avoid_radius
+                        falloff = 1.0 - (ratio if ratio < 1.0 else 1.0)
+                        if falloff > 1e-5:
+                            inv_len = 1.0 / dist
+                            avoid_x -= offset_x * inv_len * falloff
+                            avoid_y -= offset_y * inv_len * falloff
+                            avoid_count += 1
+                elif dist_sq <= seek_radius_sq:
+                    ratio = dist / seek_radius
+                    falloff = 1.0 - (ratio if ratio < 1.0 else 1.0)
+                    if falloff > 1e-5:
+                        seek_x += offset_x * falloff
+                        seek_y += offset_y * falloff
+                        seek_weight += falloff
+
+        inv_dist_sq = 1.0 / (dist_sq if dist_sq > 0.1 else 0.1)
+        separation_x -= offset_x * inv_dist_sq * weight
+        separation_y -= offset_y * inv_dist_sq * weight
+        if dist_sq < min_sep_reach_sq and dist_sq > 1e-12:
+            strength = (min_sep_sq - dist_sq) / min_sep_sq
+            strength = max(0.0, min(1.0, strength))
+            inv_len = 1.0 / dist
+            scale = (strength * strength) * min_sep_weight
+            separation_x -= offset_x * inv_len * scale
+            separation_y -= offset_y * inv_len * scale
+
+        if dist_sq > 1e-9 and dist_sq <= personal_radius_sq:
+            ratio = dist / personal_radius
+            strength = 1.0 - (ratio if ratio < 1.0 else 1.0)
+            inv_len = 1.0 / dist
+            personal_x -= offset_x * inv_len * strength
+            personal_y -= offset_y * inv_len * strength
+            personal_count += 1
+
+    return NeighborSums(
+        flee_x=flee_x,
+        flee_y=flee_y,
+        flee_sensed=flee_sensed,
+        separation_x=separation_x,
+        separation_y=separation_y,
+        closest_dist_sq=closest_dist_sq,
+        personal_x=personal_x,
+        personal_y=personal_y,
+        personal_count=personal_count,
+        avoid_x=avoid_x,
+        avoid_y=avoid_y,
+        avoid_count=avoid_count,
+        group_cohesion_x=group_cohesion_x,
+        group_cohesion_y=group_cohesion_y,
+        group_cohesion_count=group_cohesion_count,
+        alignment_x=alignment_x,
+        alignment_y=alignment_y,
+        alignment_count=alignment_count,
+        seek_x=seek_x,
+        seek_y=seek_y,
+        seek_weight=seek_weight,
+        offset_x=offset_sum_x,
+        offset_y=offset_sum_y,
+    )
+
+
 def compute_desired_velocity(
     world: World,
     agent: Agent,
@@ -29,10 +210,10 @@ def compute_desired_velocity(
     desired_y = 0.0
     flee_vector = Vector2()
     sensed_danger = False
+    world._bind_rng(agent.id, STREAM_STEERING)
     traits = world._clamp_traits(agent.traits) if traits is None else traits
     species = world._config.species
     feedback = world._config.feedback
-    environment = world._config.environment
     sociality = max(0.0, traits.sociality)
     territoriality = max(0.0, traits.territoriality)
     dist_sq_list = neighbor_dist_sq
@@ -61,18 +242,25 @@ def compute_desired_velocity(
             flee_vector.x -= danger_gradient.x * flee_scale
             flee_vector.y -= danger_gradient.y * flee_scale
 
-    for other, dist_sq, offset in zip(neighbors, dist_sq_list, neighbor_offsets):
-        groups_differ = (
-            agent.group_id != world._UNGROUPED
-            and other.group_id != world._UNGROUPED
-            and other.group_id != agent.group_id
-        )
-        if groups_differ and dist_sq < 4.0:
-            if dist_sq > 1e-12:
-                inv_len = 1.0 / math.sqrt(dist_sq)
-                flee_vector.x -= offset.x * inv_len * base_speed
-                flee_vector.y -= offset.y * inv_len * base_speed
-                sensed_danger = True
+    grouped = agent.group_id != world._UNGROUPED
+    sums = accumulate_neighbors(
+        world,
+        agent,
+        neighbors,
+        neighbor_offsets,
+        dist_sq_list,
+        base_speed,
+        flee_vector.x,
+        flee_vector.y,
+        personal=feedback.personal_space_weight > 0.0 and feedback.personal_space_radius > 1e-6,
+        avoid=grouped
+        and territoriality > 1e-6
+        and feedback.other_group_avoid_weight > 0.0
+        and feedback.other_group_avoid_radius > 1e-6,
+        seek=not grouped and feedback.group_seek_weight > 0.0 and feedback.group_seek_radius > 1e-6,
+    )
+    flee_vector.update(sums.flee_x, sums.flee_y)
+    sensed_danger = sensed_danger or sums.flee_sensed
 
     if flee_vector.length_squared() > 1e-3:
         agent.state = AgentState.FLEE
@@ -81,10 +269,10 @@ def compute_desired_velocity(
             flee_strength = max(flee_strength, min(1.0, danger_level))
         desired_x = flee_vector.x
         desired_y = flee_vector.y
-        if agent.group_id != world._UNGROUPED and neighbors:
-            cohesion_bias = group_cohesion(world, agent, neighbors, neighbor_offsets, dist_sq_list)
-            alignment_bias = alignment(world, agent, neighbors)
-            separation_bias = separation(world, agent, neighbors, neighbor_offsets, dist_sq_list)
+        if grouped and neighbors:
+            cohesion_bias = _mean_direction(sums.group_cohesion_x, sums.group_cohesion_y, sums.group_cohesion_count)
+            alignment_bias = _mean_direction(sums.alignment_x, sums.alignment_y, sums.alignment_count)
+            separation_bias = _finish_separation(world, sums.separation_x, sums.separation_y, sums.closest_dist_sq)
             keep = max(0.0, 1.0 - 0.7 * flee_strength)
             desired_x += cohesion_bias.x * base_speed * 0.8 * keep
             desired_y += cohesion_bias.y * base_speed * 0.8 * keep
@@ -106,30 +294,18 @@ def compute_desired_velocity(
         if agent.group_id == world._UNGROUPED
         else fields.pheromone_gradient(world, agent.group_id, agent.position, base_cell_key)
     )
-    grouped = agent.group_id != world._UNGROUPED
     if neighbors:
-        personal_space_bias = (
-            personal_space(world, neighbor_offsets, dist_sq_list)
-            if feedback.personal_space_weight > 0.0 and feedback.personal_space_radius > 1e-6
-            else ZERO
-        )
+        personal_space_bias = _mean_direction(sums.personal_x, sums.personal_y, sums.personal_count)
         separation_bias = (
-            separation(world, agent, neighbors, neighbor_offsets, dist_sq_list)
+            _finish_separation(world, sums.separation_x, sums.separation_y, sums.closest_dist_sq)
             if feedback.ally_separation_weight > 0.0
             or feedback.other_group_separation_weight > 0.0
             or feedback.min_separation_weight > 0.0
             else ZERO
         )
-        intergroup_bias = (
-            intergroup_avoidance(world, agent, neighbors, neighbor_offsets, dist_sq_list)
-            if grouped
-            and territoriality > 1e-6
-            and feedback.other_group_avoid_weight > 0.0
-            and feedback.other_group_avoid_radius > 1e-6
-            else ZERO
-        )
+        intergroup_bias = _mean_direction(sums.avoid_x, sums.avoid_y, sums.avoid_count)
         group_cohesion_bias = (
-            group_cohesion(world, agent, neighbors, neighbor_offsets, dist_sq_list)
+            _mean_direction(sums.group_cohesion_x, sums.group_cohesion_y, sums.group_cohesion_count)
             if grouped
             and sociality > 1e-6
             and feedback.group_cohesion_weight > 0.0
@@ -137,7 +313,11 @@ def compute_desired_velocity(
             and feedback.group_cohesion_radius > 1e-6
             else ZERO
         )
-        alignment_bias = alignment(world, agent, neighbors) if grouped and sociality > 1e-6 else ZERO
+        alignment_bias = (
+            _mean_direction(sums.alignment_x, sums.alignment_y, sums.alignment_count)
+            if grouped and sociality > 1e-6
+            else ZERO
+        )
     else:
         personal_space_bias = ZERO
         separation_bias = ZERO
@@ -145,7 +325,7 @@ def compute_desired_velocity(
         group_cohesion_bias = ZERO
         alignment_bias = ZERO
     group_seek_bias_vec = (
-        group_seek_bias(world, agent, neighbors, neighbor_offsets, dist_sq_list)
+        _finish_group_seek(world, agent, sums.seek_x, sums.seek_y, sums.seek_weight)
         if not grouped and feedback.group_seek_weight > 0.0 and feedback.group_seek_radius > 1e-6
         else ZERO
     )
@@ -170,8 +350,8 @@ def compute_desired_velocity(
         danger_bias_x = danger_gradient.x * inv_len
         danger_bias_y = danger_gradient.y * inv_len
 
-    needs_food = agent.energy < species.reproduction_energy_threshold * 0.6 or food_here > environment.food_per_cell * 0.5
-    if needs_food:
+    behavior = behavior_state(world, agent, food_here)
+    if behavior == AgentState.SEEKING_FOOD:
         food_gradient = fields.food_gradient(world, agent.position, base_cell_key)
         if food_gradient.length_squared() > 1e-4:
             food_gradient.normalize_ip()
@@ -183,9 +363,11 @@ def compute_desired_velocity(
         wander_scale = base_speed * 0.25
         desired_x += wander.x * wander_scale
         desired_y += wander.y * wander_scale
-    elif agent.energy > species.reproduction_energy_threshold and agent.age > species.adult_age:
+    elif behavior == AgentState.SEEKING_MATE:
         agent.state = AgentState.SEEKING_MATE
-        cohesion_all = cohesion(neighbor_offsets)
+        cohesion_all = (
+            _mean_direction(sums.offset_x, sums.offset_y, len(neighbor_offsets)) if neighbor_offsets else ZERO
+        )
         cohesion_scale = base_speed * 0.8
         desired_x += cohesion_all.x * cohesion_scale
         desired_y += cohesion_all.y * cohesion_scale
@@ -244,6 +426,18 @@ def compute_desired_velocity(
     return desired
 
 
+def behavior_state(world: World, agent: Agent, food_here: float) -> AgentState:
+    """The state `compute_desired_velocity` steers by when not fleeing, from energy, age and the cell's food."""
+
+    species = world._config.species
+    threshold = species.reproduction_energy_threshold
+    if agent.energy < threshold * 0.6 or food_here > world._config.environment.food_per_cell * 0.5:
+        return AgentState.SEEKING_FOOD
+    if agent.energy > threshold and agent.age > species.adult_age:
+        return AgentState.SEEKING_MATE
+    return AgentState.WANDER
+
+
 def separation(
     world: World,
     agent: Agent,
@@ -282,8 +476,13 @@ def separation(
             scale = (strength * strength) * min_sep_weight
             accum_x -= offset.x * inv_len * scale
             accum_y -= offset.y * inv_len * scale
+    return _finish_separation(world, accum_x, accum_y, closest_dist_sq)
+
+
+def _finish_separation(world: World, accum_x: float, accum_y: float, closest_dist_sq: float) -> Vector2:
     if accum_x * accum_x + accum_y * accum_y < 1e-12:
         return ZERO
+    min_sep = max(0.0, float(world._config.feedback.min_separation_distance))
     if closest_dist_sq < float("inf") and closest_dist_sq > 1e-12 and min_sep > 1e-6:
         closest = math.sqrt(closest_dist_sq)
         if closest < min_sep:
@@ -293,6 +492,13 @@ def separation(
     return _clamp_length_xy(accum_x, accum_y, 3.5)
 
 
+def _mean_direction(sum_x: float, sum_y: float, count: int) -> Vector2:
+    if count == 0:
+        return ZERO
+    inv = 1.0 / count
+    return _safe_normalize_xy(sum_x * inv, sum_y * inv)
+
+
 def resolve_overlap(
     world: World,
     position: Vector2,
@@ -343,10 +549,7 @@ def alignment(world: World, agent: Agent, neighbors: List[Agent]) -> Vector2:
         sum_x += velocity.x
         sum_y += velocity.y
         count += 1
-    if count == 0:
-        return ZERO
-    inv = 1.0 / count
-    return _safe_normalize_xy(sum_x * inv, sum_y * inv)
+    return _mean_direction(sum_x, sum_y, count)
 
 
 def group_seek_bias(
@@ -366,32 +569,9 @@ def group_seek_bias(
     accum_x = 0.0
     accum_y = 0.0
     weight_sum = 0.0
-    base_bias_x = 0.0
-    base_bias_y = 0.0
     dist_sq_list = neighbor_dist_sq
     if dist_sq_list is None or len(dist_sq_list) != len(neighbor_offsets):
         dist_sq_list = [offset.length_squared() for offset in neighbor_offsets]
-    if world._group_bases:
-        nearest_dx = 0.0
-        nearest_dy = 0.0
-        nearest_dist_sq = radius_sq
-        for base in world._group_bases.values():
-            dx = base.x - agent.position.x
-            dy = base.y - agent.position.y
-            dist_sq = dx * dx + dy * dy
-            if dist_sq <= 1e-12 or dist_sq > radius_sq:
-                continue
-            if dist_sq < nearest_dist_sq:
-                nearest_dx = dx
-                nearest_dy = dy
-                nearest_dist_sq = dist_sq
-        if nearest_dist_sq < radius_sq:
-            dist = math.sqrt(nearest_dist_sq)
-            falloff = 1.0 - min(1.0, dist / radius)
-            if falloff > 1e-6 and dist > 1e-12:
-                inv_len = 1.0 / dist
-                base_bias_x = nearest_dx * inv_len * falloff
-                base_bias_y = nearest_dy * inv_len * falloff
     for other, offset, dist_sq in zip(neighbors, neighbor_offsets, dist_sq_list):
         if other.group_id == world._UNGROUPED:
             continue
@@ -404,6 +584,22 @@ def group_seek_bias(
         accum_x += offset.x * falloff
         accum_y += offset.y * falloff
         weight_sum += falloff
+    return _finish_group_seek(world, agent, accum_x, accum_y, weight_sum)
+
+
+def _finish_group_seek(world: World, agent: Agent, accum_x: float, accum_y: float, weight_sum: float) -> Vector2:
+    radius = max(0.0, float(world._config.feedback.group_seek_radius))
+    base_bias_x = 0.0
+    base_bias_y = 0.0
+    nearest = world._group_bases.nearest(agent.position.x, agent.position.y, radius * radius)
+    if nearest is not None:
+        _, nearest_dx, nearest_dy, nearest_dist_sq = nearest
+        dist = math.sqrt(nearest_dist_sq)
+        falloff = 1.0 - min(1.0, dist / radius)
+        if falloff > 1e-6 and dist > 1e-12:
+            inv_len = 1.0 / dist
+            base_bias_x = nearest_dx * inv_len * falloff
+            base_bias_y = nearest_dy * inv_len * falloff
     if weight_sum <= 1e-6:
         return _safe_normalize_xy(base_bias_x, base_bias_y)
     inv = 1.0 / weight_sum
@@ -440,10 +636,7 @@ def group_cohesion(
         sum_x += offset.x
         sum_y += offset.y
         count += 1
-    if count == 0:
-        return ZERO
-    inv = 1.0 / count
-    return _safe_normalize_xy(sum_x * inv, sum_y * inv)
+    return _mean_direction(sum_x, sum_y, count)
 
 
 def group_base_attraction(world: World, agent: Agent) -> Vector2:
@@ -501,10 +694,7 @@ def personal_space(
         accum_x -= offset.x * inv_len * strength
         accum_y -= offset.y * inv_len * strength
         count += 1
-    if count == 0:
-        return ZERO
-    inv = 1.0 / count
-    return _safe_normalize_xy(accum_x * inv, accum_y * inv)
+    return _mean_direction(accum_x, accum_y, count)
 
 
 def intergroup_avoidance(
@@ -542,10 +732,7 @@ def intergroup_avoidance(
         accum_x -= offset.x * inv_len * falloff
         accum_y -= offset.y * inv_len * falloff
         count += 1
-    if count == 0:
-        return ZERO
-    inv = 1.0 / count
-    return _safe_normalize_xy(accum_x * inv, accum_y * inv)
+    return _mean_direction(accum_x, accum_y, count)
 
 
 def wander_direction(world: World, agent: Agent) -> Vector2:
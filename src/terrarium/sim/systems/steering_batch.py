@@ -0,0 +1,662 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Sequence, TYPE_CHECKING
+
+import numpy as np
+from pygame.math import Vector2
+
+from ..core.agent import Agent, AgentState, AgentTraits
+from ..core.rng import STREAM_STEERING, CounterRng
+from ..core.spatial_grid import NeighborPairs, build_half_shell_pairs, build_neighbor_pairs, mirror_pairs
+from . import fields
+from .steering import wander_direction
+
+if TYPE_CHECKING:
+    from ..core.world import TickContext, World
+
+_BRANCH_FLEE = 0
+_BRANCH_FOOD = 1
+_BRANCH_MATE = 2
+_BRANCH_WANDER = 3
+
+
+@dataclass(slots=True)
+class AgentColumns:
+    pos_x: np.ndarray
+    pos_y: np.ndarray
+    vel_x: np.ndarray
+    vel_y: np.ndarray
+    group_id: np.ndarray
+
+
+@dataclass(slots=True)
+class BatchSteering:
+    prepared: List[tuple[AgentTraits, float]]
+    desired_x: List[float]
+    desired_y: List[float]
+    sensed: List[bool]
+
+
+def compute_tick(world: World, ctx: TickContext) -> BatchSteering:
+    """
+    Prepare every agent and compute all steering updates due this tick from tick-start state.
+
+    Unlike the scalar backend, agents do not see moves made earlier in the same tick.
+    """
+
+    agents = world._agents
+    prepared = [world._prepare_agent(agent) for agent in agents]
+    update_mask = np.fromiter(
+        (agent.alive and world._steering_due(agent, ctx) for agent in agents),
+        dtype=np.bool_,
+        count=len(agents),
+    )
+    columns = gather_agent_columns(world, agents)
+    build = build_neighbor_pairs
+    if world._config.performance.pair_enumeration == "half_shell":
+        build = build_half_shell_pairs
+    pairs = build(
+        columns.pos_x,
+        columns.pos_y,
+        world._config.cell_size,
+        ctx.vision_cell_offsets,
+        ctx.vision_radius_sq,
+    )
+    if build is build_half_shell_pairs:
+        pairs = mirror_pairs(pairs)
+    desired_x, desired_y, sensed = compute_desired_velocities(
+        world,
+        agents,
+        columns,
+        pairs,
+        [speed for _, speed in prepared],
+        [traits for traits, _ in prepared],
+        update_mask,
+        ctx.danger_present,
+    )
+    return BatchSteering(prepared, desired_x.tolist(), desired_y.tolist(), sensed.tolist())
+
+
+def gather_agent_columns(world: World, agents: Sequence[Agent]) -> AgentColumns:
+    count = len(agents)
+    store = world._store
+    if store is not None and len(store) == count:
+        return AgentColumns(
+            store.pos_x[:count],
+            store.pos_y[:count],
+            store.vel_x[:count],
+            store.vel_y[:count],
+            store.group_id[:count],
+        )
+    pos_x = np.empty(count, dtype=np.float64)
+    pos_y = np.empty(count, dtype=np.float64)
+    vel_x = np.empty(count, dtype=np.float64)
+    vel_y = np.empty(count, dtype=np.float64)
+    group_id = np.empty(count, dtype=np.int64)
+    for index, agent in enumerate(agents):
+        position = agent.position
+        velocity = agent.velocity
+        pos_x[index] = position.x
+        pos_y[index] = position.y
+        vel_x[index] = velocity.x
+        vel_y[index] = velocity.y
+        group_id[index] = agent.group_id
+    return AgentColumns(pos_x, pos_y, vel_x, vel_y, group_id)
+
+
+def _segment_sum(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    # bincount adds weights in input order, matching the scalar accumulation order per agent.
+    return np.bincount(index, weights=values, minlength=size)
+
+
+def _safe_normalize(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    magnitude_sq = x * x + y * y
+    valid = magnitude_sq >= 1e-10
+    inv = np.zeros_like(x)
+    inv[valid] = 1.0 / np.sqrt(magnitude_sq[valid])
+    return x * inv, y * inv
+
+
+def _mean_normalized(
+    sum_x: np.ndarray, sum_y: np.ndarray, count: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    inv = np.zeros_like(sum_x)
+    valid = count > 0
+    inv[valid] = 1.0 / count[valid]
+    return _safe_normalize(sum_x * inv, sum_y * inv)
+
+
+def _clamp_length(x: np.ndarray, y: np.ndarray, max_length: float) -> tuple[np.ndarray, np.ndarray]:
+    if max_length <= 0:
+        return np.zeros_like(x), np.zeros_like(y)
+    magnitude_sq = x * x + y * y
+    over = magnitude_sq > max_length * max_length
+    scale = np.ones_like(x)
+    scale[over] = max_length / np.sqrt(magnitude_sq[over])
+    return np.where(over, x * scale, x), np.where(over, y * scale, y)
+
+
+def boundary_avoidance(
+    world: World, pos_x: np.ndarray, pos_y: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    margin = world._config.boundary_margin
+    size = world._config.world_size
+    zeros = np.zeros_like(pos_x)
+    if margin <= 1e-6 or size <= 0.0:
+        return zeros, zeros.copy(), zeros.copy()
+    push_x = np.where(
+        pos_x < margin,
+        0.0 + (1.0 - (pos_x / margin)),
+        np.where(pos_x > size - margin, 0.0 - (1.0 - ((size - pos_x) / margin)), 0.0),
+    )
+    push_y = np.where(
+        pos_y < margin,
+        0.0 + (1.0 - (pos_y / margin)),
+        np.where(pos_y > size - margin, 0.0 - (1.0 - ((size - pos_y) / margin)), 0.0),
+    )
+    proximity_x = np.maximum(1.0 - np.minimum(pos_x, size - pos_x) / margin, 0.0)
+    proximity_y = np.maximum(1.0 - np.minimum(pos_y, size - pos_y) / margin, 0.0)
+    proximity = np.minimum(1.0, np.maximum(proximity_x, proximity_y))
+    push_len_sq = push_x * push_x + push_y * push_y
+    active = (push_len_sq >= 1e-8) & (proximity > 0.0)
+    strength = proximity * (0.4 + 0.6 * proximity)
+    inv_len = np.zeros_like(pos_x)
+    inv_len[active] = 1.0 / np.sqrt(push_len_sq[active])
+    bias_x = np.where(active, push_x * inv_len * strength, 0.0)
+    bias_y = np.where(active, push_y * inv_len * strength, 0.0)
+    return bias_x, bias_y, np.where(active, proximity, 0.0)
+
+
+def _nearest_base_bias(
+    world: World, pos_x: np.ndarray, pos_y: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    bias_x = np.zeros_like(pos_x)
+    bias_y = np.zeros_like(pos_y)
+    if not world._group_bases or pos_x.shape[0] == 0:
+        return bias_x, bias_y
+    radius_sq = radius * radius
+    bases = list(world._group_bases.values())
+    base_x = np.fromiter((base.x for base in bases), dtype=np.float64, count=len(bases))
+    base_y = np.fromiter((base.y for base in bases), dtype=np.float64, count=len(bases))
+    dx = base_x[None, :] - pos_x[:, None]
+    dy = base_y[None, :] - pos_y[:, None]
+    dist_sq = dx * dx + dy * dy
+    candidate = np.where((dist_sq > 1e-12) & (dist_sq <= radius_sq), dist_sq, np.inf)
+    # argmin keeps the first minimum, matching the strict `<` scan over the base dict.
+    nearest = np.argmin(candidate, axis=1)
+    rows = np.arange(pos_x.shape[0])
+    nearest_dist_sq = candidate[rows, nearest]
+    found = nearest_dist_sq < radius_sq
+    dist = np.sqrt(np.where(found, nearest_dist_sq, 1.0))
+    falloff = 1.0 - np.minimum(1.0, dist / radius)
+    active = found & (falloff > 1e-6) & (dist > 1e-12)
+    inv_len = 1.0 / dist
+    bias_x[active] = (dx[rows, nearest] * inv_len * falloff)[active]
+    bias_y[active] = (dy[rows, nearest] * inv_len * falloff)[active]
+    return bias_x, bias_y
+
+
+def _group_base_attraction(
+    world: World, agents: Sequence[Agent], indices: np.ndarray, pos_x: np.ndarray, pos_y: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    feedback = world._config.feedback
+    base_x = np.zeros_like(pos_x)
+    base_y = np.zeros_like(pos_y)
+    has_base = np.zeros(pos_x.shape[0], dtype=np.bool_)
+    bases = world._group_bases
+    for row, index in enumerate(indices.tolist()):
+        base = bases.get(agents[index].group_id)
+        if base is not None:
+            base_x[row] = base.x
+            base_y[row] = base.y
+            has_base[row] = True
+    to_x = base_x - pos_x
+    to_y = base_y - pos_y
+    dist_sq = to_x * to_x + to_y * to_y
+    dead_zone = max(0.0, float(feedback.group_base_dead_zone))
+    dead_sq = dead_zone * dead_zone
+    soft_radius = max(dead_zone, float(feedback.group_base_soft_radius))
+    soft_sq = soft_radius * soft_radius
+    active = has_base & (dist_sq > 1e-12) & (dist_sq > dead_sq)
+    strength = np.ones_like(pos_x)
+    if soft_radius > dead_zone:
+        denom = max(1e-12, soft_sq - dead_sq)
+        inner = dist_sq < soft_sq
+        t = np.clip((dist_sq - dead_sq) / denom, 0.0, 1.0)
+        strength = np.where(inner, t * t, 1.0)
+    length = np.sqrt(np.where(active, dist_sq, 1.0))
+    return (
+        np.where(active, (to_x / length) * strength, 0.0),
+        np.where(active, (to_y / length) * strength, 0.0),
+    )
+
+
+def _unit_vector(angle: float) -> Vector2:
+    # `math` rather than `np.cos` / `np.sin`, so the bits match `CounterRng.next_unit_circle`.
+    return Vector2(math.cos(angle), math.sin(angle))
+
+
+def _wander(world: World, agent: Agent, angle: float | None) -> Vector2:
+    """`steering.wander_direction`, taking a refresh from the pre-drawn `angle` when one is given."""
+
+    if angle is None:
+        return wander_direction(world, agent)
+    if agent.wander_time <= 0.0 or agent.wander_dir.length_squared() < 1e-10:
+        agent.wander_dir = _unit_vector(angle)
+        agent.wander_time = max(1e-4, world._config.species.wander_refresh_seconds)
+    else:
+        agent.wander_time -= world._config.time_step
+    return agent.wander_dir
+
+
+def compute_desired_velocities(
+    world: World,
+    agents: Sequence[Agent],
+    columns: AgentColumns,
+    pairs: NeighborPairs,
+    speed_limits: Sequence[float],
+    traits: Sequence[AgentTraits],
+    update_mask: np.ndarray,
+    danger_present: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched `steering.compute_desired_velocity` for every agent selected by `update_mask`.
+
+    All neighbor reductions run as one NumPy pass over `pairs`; a short per-agent loop keeps
+    the environment lookups, `agent.state` writes and RNG draws (danger jitter, wander) in
+    agent order so the random stream matches the scalar path. With a `CounterRng` the first two
+    steering draws of every updated agent are taken up front with `CounterRng.angles` (an agent
+    draws at most twice: jitter, then wander) instead of re-binding the generator per agent.
+    Per-agent sums are accumulated in the scalar neighbor order, so for the same world state the
+    result is bit-identical.
+    """
+
+    count = len(agents)
+    desired_x = np.zeros(count, dtype=np.float64)
+    desired_y = np.zeros(count, dtype=np.float64)
+    sensed = np.zeros(count, dtype=np.bool_)
+    indices = np.flatnonzero(update_mask)
+    if indices.shape[0] == 0:
+        return desired_x, desired_y, sensed
+
+    config = world._config
+    species = config.species
+    feedback = config.feedback
+    environment = world._environment
+    ungrouped = world._UNGROUPED
+    group = columns.group_id
+    base_speed = np.asarray(speed_limits, dtype=np.float64)
+    sociality = np.fromiter((max(0.0, t.sociality) for t in traits), dtype=np.float64, count=count)
+    territoriality = np.fromiter(
+        (max(0.0, t.territoriality) for t in traits), dtype=np.float64, count=count
+    )
+
+    selected = update_mask[pairs.agent_index]
+    a = pairs.agent_index[selected]
+    b = pairs.neighbor_index[selected]
+    offset_x = pairs.dx[selected]
+    offset_y = pairs.dy[selected]
+    dist_sq = pairs.dist_sq[selected]
+    dist = np.sqrt(dist_sq) if pairs.dist is None else pairs.dist[selected]
+    inv_dist = np.divide(1.0, dist, out=np.zeros_like(dist), where=dist > 0.0)
+    group_a = group[a]
+    group_b = group[b]
+    same_group = (group_a != ungrouped) & (group_b == group_a)
+    other_group = (group_a != ungrouped) & (group_b != ungrouped) & (group_b != group_a)
+    neighbor_count = np.bincount(a, minlength=count)
+    has_neighbors = neighbor_count > 0
+
+    # Cross-group contacts closer than 2 units trigger the flee branch.
+    flee_pairs = other_group & (dist_sq < 4.0) & (dist_sq > 1e-12)
+    flee_a = a[flee_pairs]
+    flee_term_x = offset_x[flee_pairs] * inv_dist[flee_pairs] * base_speed[flee_a]
+    flee_term_y = offset_y[flee_pairs] * inv_dist[flee_pairs] * base_speed[flee_a]
+    neighbor_flee_x = _segment_sum(flee_a, -flee_term_x, count)
+    neighbor_flee_y = _segment_sum(flee_a, -flee_term_y, count)
+    neighbor_sensed = np.bincount(flee_a, minlength=count) > 0
+    flee_start = np.searchsorted(flee_a, np.arange(count + 1))
+
+    # separation(): weighted inverse-square push plus the min-separation term, interleaved per
+    # pair so the summation order matches the scalar loop exactly.
+    min_sep = max(0.0, float(feedback.min_separation_distance))
+    min_sep_sq = min_sep * min_sep
+    min_sep_weight = max(0.0, float(feedback.min_separation_weight))
+    weight = np.where(same_group, float(feedback.ally_separation_weight), float(feedback.other_group_separation_weight))
+    inv_clamped_sq = 1.0 / np.maximum(dist_sq, 0.1)
+    min_sep_active = (dist_sq > 1e-12) & (dist_sq < min_sep_sq)
+    if not (min_sep_weight > 0.0 and min_sep_sq > 1e-12):
+        min_sep_active[:] = False
+    strength = np.clip((min_sep_sq - dist_sq) / min_sep_sq, 0.0, 1.0) if min_sep_sq > 0.0 else np.zeros_like(dist_sq)
+    min_sep_scale = np.where(min_sep_active, (strength * strength) * min_sep_weight, 0.0)
+    interleaved_a = np.repeat(a, 2)
+    sep_terms_x = np.empty(a.shape[0] * 2, dtype=np.float64)
+    sep_terms_y = np.empty(a.shape[0] * 2, dtype=np.float64)
+    sep_terms_x[0::2] = -(offset_x * inv_clamped_sq * weight)
+    sep_terms_x[1::2] = -np.where(min_sep_active, offset_x * inv_dist * min_sep_scale, 0.0)
+    sep_terms_y[0::2] = -(offset_y * inv_clamped_sq * weight)
+    sep_terms_y[1::2] = -np.where(min_sep_active, offset_y * inv_dist * min_sep_scale, 0.0)
+    sep_x = _segment_sum(interleaved_a, sep_terms_x, count)
+    sep_y = _segment_sum(interleaved_a, sep_terms_y, count)
+    closest_sq = np.full(count, np.inf)
+    np.minimum.at(closest_sq, a, dist_sq)
+    sep_zero = sep_x * sep_x + sep_y * sep_y < 1e-12
+    closest = np.sqrt(closest_sq)
+    boost = np.isfinite(closest_sq) & (closest_sq > 1e-12) & (min_sep > 1e-6) & (closest < min_sep)
+    boost_scale = np.where(
+        boost, np.minimum(4.0, np.maximum(1.0, min_sep / np.maximum(closest, 1e-4))), 1.0
+    )
+    sep_x = np.where(boost, sep_x * boost_scale, sep_x)
+    sep_y = np.where(boost, sep_y * boost_scale, sep_y)
+    sep_x, sep_y = _clamp_length(sep_x, sep_y, 3.5)
+    sep_x[sep_zero] = 0.0
+    sep_y[sep_zero] = 0.0
+
+    # personal_space()
+    ps_radius = feedback.personal_space_radius
+    ps_x = np.zeros(count)
+    ps_y = np.zeros(count)
+    if ps_radius > 1e-6:
+        ps_pairs = (dist_sq > 1e-9) & (dist_sq <= ps_radius * ps_radius)
+        ps_strength = 1.0 - np.minimum(1.0, dist / ps_radius)
+        ps_a = a[ps_pairs]
+        ps_x, ps_y = _mean_normalized(
+            _segment_sum(ps_a, -(offset_x * inv_dist * ps_strength)[ps_pairs], count),
+            _segment_sum(ps_a, -(offset_y * inv_dist * ps_strength)[ps_pairs], count),
+            np.bincount(ps_a, minlength=count),
+        )
+
+    # intergroup_avoidance()
+    avoid_radius = feedback.other_group_avoid_radius
+    avoid_x = np.zeros(count)
+    avoid_y = np.zeros(count)
+    if avoid_radius > 1e-6:
+        falloff = 1.0 - np.minimum(1.0, dist / avoid_radius)
+        avoid_pairs = other_group & (dist_sq > 1e-9) & (dist_sq <= avoid_radius * avoid_radius) & (falloff > 1e-5)
+        avoid_a = a[avoid_pairs]
+        avoid_x, avoid_y = _mean_normalized(
+            _segment_sum(avoid_a, -(offset_x * inv_dist * falloff)[avoid_pairs], count),
+            _segment_sum(avoid_a, -(offset_y * inv_dist * falloff)[avoid_pairs], count),
+            np.bincount(avoid_a, minlength=count),
+        )
+
+    # group_cohesion() and alignment()
+    cohesion_radius_sq = feedback.group_cohesion_radius * feedback.group_cohesion_radius
+    cohesion_pairs = same_group & (dist_sq <= cohesion_radius_sq)
+    cohesion_a = a[cohesion_pairs]
+    group_cohesion_x, group_cohesion_y = _mean_normalized(
+        _segment_sum(cohesion_a, offset_x[cohesion_pairs], count),
+        _segment_sum(cohesion_a, offset_y[cohesion_pairs], count),
+        np.bincount(cohesion_a, minlength=count),
+    )
+    ally_a = a[same_group]
+    ally_b = b[same_group]
+    alignment_x, alignment_y = _mean_normalized(
+        _segment_sum(ally_a, columns.vel_x[ally_b], count),
+        _segment_sum(ally_a, columns.vel_y[ally_b], count),
+        np.bincount(ally_a, minlength=count),
+    )
+
+    # cohesion() over every neighbor (mate seeking)
+    cohesion_all_x, cohesion_all_y = _mean_normalized(
+        _segment_sum(a, offset_x, count), _segment_sum(a, offset_y, count), neighbor_count
+    )
+
+    # group_seek_bias() for ungrouped agents
+    seek_radius = max(0.0, float(feedback.group_seek_radius))
+    seek_x = np.zeros(count)
+    seek_y = np.zeros(count)
+    seek_enabled = feedback.group_seek_weight > 0.0 and feedback.group_seek_radius > 1e-6 and seek_radius > 1e-6
+    if seek_enabled:
+        seek_falloff = 1.0 - np.minimum(1.0, dist / seek_radius)
+        seek_pairs = (group_b != ungrouped) & (dist_sq > 1e-12) & (dist_sq <= seek_radius * seek_radius)
+        seek_pairs &= seek_falloff > 1e-5
+        seek_a = a[seek_pairs]
+        accum_x = _segment_sum(seek_a, (offset_x * seek_falloff)[seek_pairs], count)
+        accum_y = _segment_sum(seek_a, (offset_y * seek_falloff)[seek_pairs], count)
+        weight_sum = _segment_sum(seek_a, seek_falloff[seek_pairs], count)
+        seekers = indices[group[indices] == ungrouped]
+        base_bias_x = np.zeros(count)
+        base_bias_y = np.zeros(count)
+        base_bias_x[seekers], base_bias_y[seekers] = _nearest_base_bias(
+            world, columns.pos_x[seekers], columns.pos_y[seekers], seek_radius
+        )
+        weighted = weight_sum > 1e-6
+        inv_weight = np.zeros(count)
+        inv_weight[weighted] = 1.0 / weight_sum[weighted]
+        blend_x = accum_x * inv_weight
+        blend_y = accum_y * inv_weight
+        add_base = base_bias_x * base_bias_x + base_bias_y * base_bias_y > 1e-12
+        blend_x = np.where(add_base, blend_x + base_bias_x, blend_x)
+        blend_y = np.where(add_base, blend_y + base_bias_y, blend_y)
+        seek_x, seek_y = _safe_normalize(
+            np.where(weighted, blend_x, base_bias_x), np.where(weighted, blend_y, base_bias_y)
+        )
+
+    # Per-agent pass: environment samples, danger jitter, state branch and wander, in agent order.
+    index_list = indices.tolist()
+    rows = len(index_list)
+    branch = np.empty(rows, dtype=np.int8)
+    flee_x = np.zeros(rows)
+    flee_y = np.zeros(rows)
+    food_x = np.zeros(rows)
+    food_y = np.zeros(rows)
+    wander_x = np.zeros(rows)
+    wander_y = np.zeros(rows)
+    pheromone_x = np.zeros(rows)
+    pheromone_y = np.zeros(rows)
+    danger_x = np.zeros(rows)
+    danger_y = np.zeros(rows)
+    threshold = species.reproduction_energy_threshold
+    food_half = config.environment.food_per_cell * 0.5
+    flee_terms_x = flee_term_x.tolist()
+    flee_terms_y = flee_term_y.tolist()
+    flee_bounds = flee_start.tolist()
+    neighbor_flee_x_list = neighbor_flee_x.tolist()
+    neighbor_flee_y_list = neighbor_flee_y.tolist()
+    neighbor_sensed_list = neighbor_sensed.tolist()
+    speed_list = base_speed.tolist()
+    rng = world._rng
+    angle_draws: List[List[float]] | None = None
+    if isinstance(rng, CounterRng):
+        agent_ids = np.fromiter((agents[index].id for index in index_list), dtype=np.int64, count=rows)
+        angle_draws = [
+            rng.angles(agent_ids, STREAM_STEERING, 0).tolist(),
+            rng.angles(agent_ids, STREAM_STEERING, 1).tolist(),
+        ]
+    for row, index in enumerate(index_list):
+        agent = agents[index]
+        drawn = 0
+        if angle_draws is None:
+            world._bind_rng(agent.id, STREAM_STEERING)
+        position = agent.position
+        cell = environment._cell_key(position)
+        speed = speed_list[index]
+        agent_sensed = False
+        danger_level = 0.0
+        danger_gradient = Vector2()
+        if danger_present:
+            danger_level = environment.sample_danger(cell)
+            danger_gradient = fields.danger_gradient(world, position, cell)
+        fx = 0.0
+        fy = 0.0
+        if danger_level > 0.1:
+            agent_sensed = True
+            if danger_gradient.length_squared() < 1e-4:
+                if angle_draws is None:
+                    danger_gradient = rng.next_unit_circle()
+                else:
+                    danger_gradient = _unit_vector(angle_draws[drawn][row])
+                    drawn += 1
+            if danger_gradient.length_squared() > 1e-12:
+                danger_gradient.normalize_ip()
+                flee_scale = speed * min(1.0, danger_level)
+                fx -= danger_gradient.x * flee_scale
+                fy -= danger_gradient.y * flee_scale
+        if fx != 0.0 or fy != 0.0:
+            for term in range(flee_bounds[index], flee_bounds[index + 1]):
+                fx -= flee_terms_x[term]
+                fy -= flee_terms_y[term]
+        else:
+            fx = neighbor_flee_x_list[index]
+            fy = neighbor_flee_y_list[index]
+        if neighbor_sensed_list[index]:
+            agent_sensed = True
+        sensed[index] = agent_sensed
+        if fx * fx + fy * fy > 1e-3:
+            agent.state = AgentState.FLEE
+            branch[row] = _BRANCH_FLEE
+            flee_x[row] = fx
+            flee_y[row] = fy
+            continue
+
+        food_here = environment.sample_food(cell)
+        group_id = agent.group_id
+        if group_id != ungrouped:
+            gradient_x, gradient_y = environment.pheromone_gradient(cell, group_id)
+            length_sq = gradient_x * gradient_x + gradient_y * gradient_y
+            if length_sq > 1e-4:
+                inv_len = 1.0 / math.sqrt(length_sq)
+                pheromone_x[row] = gradient_x * inv_len
+                pheromone_y[row] = gradient_y * inv_len
+        length_sq = danger_gradient.length_squared()
+        if length_sq > 1e-4:
+            inv_len = 1.0 / math.sqrt(length_sq)
+            danger_x[row] = danger_gradient.x * inv_len
+            danger_y[row] = danger_gradient.y * inv_len
+        energy = agent.energy
+        if energy < threshold * 0.6 or food_here > food_half:
+            gradient = fields.food_gradient(world, position, cell)
+            if gradient.length_squared() > 1e-4:
+                gradient.normalize_ip()
+            agent.state = AgentState.SEEKING_FOOD
+            branch[row] = _BRANCH_FOOD
+            food_x[row] = gradient.x
+            food_y[row] = gradient.y
+            wander = _wander(world, agent, None if angle_draws is None else angle_draws[drawn][row])
+            wander_x[row] = wander.x
+            wander_y[row] = wander.y
+        elif energy > threshold and agent.age > species.adult_age:
+            agent.state = AgentState.SEEKING_MATE
+            branch[row] = _BRANCH_MATE
+        else:
+            agent.state = AgentState.WANDER
+            branch[row] = _BRANCH_WANDER
+            wander = _wander(world, agent, None if angle_draws is None else angle_draws[drawn][row])
+            wander_x[row] = wander.x
+            wander_y[row] = wander.y
+
+    # Combine per-agent terms in the same order as the scalar path.
+    speed = base_speed[indices]
+    soc = sociality[indices]
+    terr = territoriality[indices]
+    grouped = group[indices] != ungrouped
+    neighbors_present = has_neighbors[indices]
+    pos_x = columns.pos_x[indices]
+    pos_y = columns.pos_y[indices]
+    boundary_x, boundary_y, proximity = boundary_avoidance(world, pos_x, pos_y)
+    boundary_scale = speed * config.boundary_avoidance_weight
+    is_flee = branch == _BRANCH_FLEE
+
+    out_x = np.zeros(rows)
+    out_y = np.zeros(rows)
+    food = branch == _BRANCH_FOOD
+    mate = branch == _BRANCH_MATE
+    wandering = branch == _BRANCH_WANDER
+    food_scale = speed * 0.4
+    wander_scale = speed * 0.25
+    out_x = np.where(food, out_x + food_x * food_scale, out_x)
+    out_y = np.where(food, out_y + food_y * food_scale, out_y)
+    out_x = np.where(food, out_x + wander_x * wander_scale, out_x)
+    out_y = np.where(food, out_y + wander_y * wander_scale, out_y)
+    out_x = np.where(mate, out_x + cohesion_all_x[indices] * (speed * 0.8), out_x)
+    out_y = np.where(mate, out_y + cohesion_all_y[indices] * (speed * 0.8), out_y)
+    out_x = np.where(mate, out_x + pheromone_x * (speed * 0.25), out_x)
+    out_y = np.where(mate, out_y + pheromone_y * (speed * 0.25), out_y)
+    jitter_scale = speed * species.wander_jitter
+    out_x = np.where(wandering, out_x + wander_x * jitter_scale, out_x)
+    out_y = np.where(wandering, out_y + wander_y * jitter_scale, out_y)
+    out_x = np.where(wandering, out_x + pheromone_x * (speed * 0.15), out_x)
+    out_y = np.where(wandering, out_y + pheromone_y * (speed * 0.15), out_y)
+
+    def gated(mask: np.ndarray | bool, values: np.ndarray) -> np.ndarray:
+        return np.where(mask, values, 0.0)
+
+    ps_on = neighbors_present & (feedback.personal_space_weight > 0.0 and feedback.personal_space_radius > 1e-6)
+    sep_on = neighbors_present & (
+        feedback.ally_separation_weight > 0.0
+        or feedback.other_group_separation_weight > 0.0
+        or feedback.min_separation_weight > 0.0
+    )
+    avoid_on = (
+        neighbors_present
+        & grouped
+        & (terr > 1e-6)
+        & (feedback.other_group_avoid_weight > 0.0 and feedback.other_group_avoid_radius > 1e-6)
+    )
+    cohesion_on = (
+        neighbors_present
+        & grouped
+        & (soc > 1e-6)
+        & (
+            feedback.group_cohesion_weight > 0.0
+            and feedback.ally_cohesion_weight > 0.0
+            and feedback.group_cohesion_radius > 1e-6
+        )
+    )
+    alignment_on = neighbors_present & grouped & (soc > 1e-6)
+    seek_on = ~grouped & seek_enabled
+    base_on = grouped & (feedback.group_base_attraction_weight > 0.0)
+    base_attract_x, base_attract_y = _group_base_attraction(world, agents, indices, pos_x, pos_y)
+
+    personal_scale = speed * feedback.personal_space_weight
+    out_x = out_x + gated(ps_on, ps_x[indices]) * personal_scale
+    out_y = out_y + gated(ps_on, ps_y[indices]) * personal_scale
+    intergroup_scale = speed * feedback.other_group_avoid_weight * terr
+    out_x = out_x + gated(avoid_on, avoid_x[indices]) * intergroup_scale
+    out_y = out_y + gated(avoid_on, avoid_y[indices]) * intergroup_scale
+    seek_scale = speed * feedback.group_seek_weight
+    out_x = out_x + gated(seek_on, seek_x[indices]) * seek_scale
+    out_y = out_y + gated(seek_on, seek_y[indices]) * seek_scale
+    separation_scale = speed * 1.4
+    out_x = out_x + gated(sep_on, sep_x[indices]) * separation_scale
+    out_y = out_y + gated(sep_on, sep_y[indices]) * separation_scale
+    alignment_scale = speed * 0.3 * soc
+    out_x = out_x + gated(alignment_on, alignment_x[indices]) * alignment_scale
+    out_y = out_y + gated(alignment_on, alignment_y[indices]) * alignment_scale
+    cohesion_scale = speed * feedback.group_cohesion_weight * feedback.ally_cohesion_weight * soc
+    out_x = out_x + gated(cohesion_on, group_cohesion_x[indices]) * cohesion_scale
+    out_y = out_y + gated(cohesion_on, group_cohesion_y[indices]) * cohesion_scale
+    base_scale = speed * feedback.group_base_attraction_weight
+    out_x = out_x + gated(base_on, base_attract_x) * base_scale
+    out_y = out_y + gated(base_on, base_attract_y) * base_scale
+    out_x = out_x + boundary_x * boundary_scale
+    out_y = out_y + boundary_y * boundary_scale
+    boundary_len_sq = boundary_x * boundary_x + boundary_y * boundary_y
+    out_len_sq = out_x * out_x + out_y * out_y
+    turning = (proximity > 0.0) & (boundary_len_sq > 1e-8) & (out_len_sq > 1e-8)
+    turn = np.minimum(1.0, proximity * config.boundary_turn_weight)
+    out_x = np.where(turning, out_x + (boundary_x * speed - out_x) * turn, out_x)
+    out_y = np.where(turning, out_y + (boundary_y * speed - out_y) * turn, out_y)
+    danger_scale = speed * 0.2
+    out_x = out_x - danger_x * danger_scale
+    out_y = out_y - danger_y * danger_scale
+
+    # Flee branch replaces everything above.
+    keep = max(0.0, 1.0 - 0.7 * 1.0)
+    flock = is_flee & grouped & neighbors_present
+    flee_out_x = flee_x.copy()
+    flee_out_y = flee_y.copy()
+    flee_out_x = np.where(flock, flee_out_x + group_cohesion_x[indices] * speed * 0.8 * keep, flee_out_x)
+    flee_out_y = np.where(flock, flee_out_y + group_cohesion_y[indices] * speed * 0.8 * keep, flee_out_y)
+    flee_out_x = np.where(flock, flee_out_x + alignment_x[indices] * speed * 0.5 * keep, flee_out_x)
+    flee_out_y = np.where(flock, flee_out_y + alignment_y[indices] * speed * 0.5 * keep, flee_out_y)
+    flee_out_x = np.where(flock, flee_out_x + sep_x[indices] * speed * 0.7, flee_out_x)
+    flee_out_y = np.where(flock, flee_out_y + sep_y[indices] * speed * 0.7, flee_out_y)
+    flee_out_x = flee_out_x + boundary_x * boundary_scale
+    flee_out_y = flee_out_y + boundary_y * boundary_scale
+
+    desired_x[indices] = np.where(is_flee, flee_out_x, out_x)
+    desired_y[indices] = np.where(is_flee, flee_out_y, out_y)
+    return desired_x, desired_y, sensed
@@ -15,3 +15,13 @@ class TickMetrics:
     neighbor_checks: int
     ungrouped: int
     tick_duration_ms: float = 0.0
+    neighbor_list_rebuilds: int = 0
+    neighbor_candidates: int = 0
+    danger_cells: int = 0
+    food_regen_cells: int = 0
+    group_updates_evaluated: int = 0
+    group_updates_skipped: int = 0
+    steering_reused: int = 0
+    steering_recomputed: int = 0
+    steering_max_deviation: float = 0.0
+    governor_level: int = 0
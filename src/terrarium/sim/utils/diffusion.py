@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class SpectralDiffusion:
+    """
+    Exact solution of the environment's diffusion/decay model over one whole step.
+
+    The explicit update moves `rate * dt` of each cell's value to its 4 neighbors (edge shares stay
+    on the edge cell), i.e. it is one Euler step of `dv/dt = rate / 4 * L v - decay * v` with `L`
+    the grid Laplacian under reflecting edges. `L` splits into a 1-D Laplacian per axis, so the
+    step is `exp(-decay * dt) * P @ v @ P.T` with `P = exp(rate * dt / 4 * L1)`. `P` comes from one
+    eigendecomposition of `L1` and is cached per `(rate, dt)`; it conserves mass and stays
+    accurate for any `dt`, unlike the explicit step whose spread clamps at `rate * dt = 1`.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = max(1, int(size))
+        laplacian = np.zeros((self._size, self._size), dtype=np.float64)
+        if self._size > 1:
+            index = np.arange(self._size - 1)
+            laplacian[index, index + 1] = 1.0
+            laplacian[index + 1, index] = 1.0
+            laplacian[np.arange(self._size), np.arange(self._size)] = -laplacian.sum(axis=1)
+        self._eigenvalues, self._basis = np.linalg.eigh(laplacian)
+        self._propagators: Dict[Tuple[float, float], np.ndarray] = {}
+
+    def propagator(self, diffusion_rate: float, delta_time: float) -> np.ndarray:
+        key = (diffusion_rate, delta_time)
+        propagator = self._propagators.get(key)
+        if propagator is None:
+            scale = np.exp(self._eigenvalues * (0.25 * diffusion_rate * delta_time))
+            propagator = (self._basis * scale) @ self._basis.T
+            self._propagators[key] = propagator
+        return propagator
+
+    def step(self, field: np.ndarray, diffusion_rate: float, decay_rate: float, delta_time: float) -> np.ndarray:
+        """Return `field` (negative cells read as empty) advanced by `delta_time`."""
+
+        source = np.maximum(field, 0.0)
+        if diffusion_rate > 0:
+            propagator = self.propagator(diffusion_rate, delta_time)
+            source = propagator @ source @ propagator.T
+        if decay_rate > 0:
+            source *= math.exp(-decay_rate * delta_time)
+        return source
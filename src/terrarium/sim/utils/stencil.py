@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def _scatter_orthogonal(target: np.ndarray, share: np.ndarray) -> None:
+    """Add (or OR, for masks) `share` into each 4-neighbor of `target`; shares past an edge stay on the edge cell."""
+
+    combine = np.logical_or if target.dtype == np.bool_ else np.add
+    # Shares toward +x, -x, +y, then -y.
+    combine(target[1:, :], share[:-1, :], out=target[1:, :])
+    combine(target[-1:, :], share[-1:, :], out=target[-1:, :])
+    combine(target[:-1, :], share[1:, :], out=target[:-1, :])
+    combine(target[:1, :], share[:1, :], out=target[:1, :])
+    combine(target[:, 1:], share[:, :-1], out=target[:, 1:])
+    combine(target[:, -1:], share[:, -1:], out=target[:, -1:])
+    combine(target[:, :-1], share[:, 1:], out=target[:, :-1])
+    combine(target[:, :1], share[:, :1], out=target[:, :1])
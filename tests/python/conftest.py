@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from typing import Callable, List, Mapping
 
 import pytest
 
@@ -8,6 +9,10 @@ src_root = ROOT / "src"
 if str(src_root) not in sys.path:
     sys.path.insert(0, str(src_root))
 
+from terrarium.sim.core.config import SimulationConfig  # noqa: E402
+from terrarium.sim.core.world import World  # noqa: E402
+from terrarium.sim.types.metrics import TickMetrics  # noqa: E402
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addoption(
@@ -36,3 +41,65 @@ def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item
     for item in items:
         if "config_change" in item.keywords:
             item.add_marker(skip_marker)
+
+
+def _make_world(
+    seed: int,
+    population: int,
+    world_size: float,
+    *,
+    rng_version: int = 1,
+    feedback: Mapping[str, float] | None = None,
+    **performance: object,
+) -> World:
+    config = SimulationConfig(
+        seed=seed, initial_population=population, max_population=2 * population, world_size=world_size
+    )
+    config.rng_version = rng_version
+    for name, value in (feedback or {}).items():
+        setattr(config.feedback, name, value)
+    for name, value in performance.items():
+        setattr(config.performance, name, value)
+    return World(config)
+
+
+def _world_trace(world: World, steps: int, metrics_log: List[TickMetrics] | None = None) -> list[tuple]:
+    trace = []
+    for tick in range(steps):
+        metrics = world.step(tick)
+        if metrics_log is not None:
+            metrics_log.append(metrics)
+        trace.append(
+            (
+                metrics.population,
+                metrics.births,
+                metrics.deaths,
+                metrics.average_energy,
+                metrics.neighbor_checks,
+                metrics.groups,
+            )
+        )
+    trace.append(
+        tuple(
+            (a.id, a.position.x, a.position.y, a.velocity.x, a.velocity.y, a.energy, a.group_id, a.state)
+            for a in world.agents
+        )
+    )
+    return trace
+
+
+@pytest.fixture
+def make_world() -> Callable[..., World]:
+    """`make_world(seed, population, world_size, rng_version=, feedback=, **performance)`."""
+
+    return _make_world
+
+
+@pytest.fixture
+def world_trace() -> Callable[..., list[tuple]]:
+    """
+    `world_trace(world, steps)` steps `world` from tick 0 and returns per-tick metrics plus the
+    final agents, so two performance modes can be compared with `==`.
+    """
+
+    return _world_trace
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.world import World
+
+
+@pytest.fixture
+def slots_world(make_world):
+    def make(**performance: str) -> World:
+        performance.setdefault("agent_slots", "free_list")
+        return make_world(21, 100, 40.0, feedback={"base_death_probability_per_second": 0.05}, **performance)
+
+    return make
+
+
+def test_free_list_is_deterministic_across_runs_reset_and_storage(slots_world, world_trace):
+    first = world_trace(slots_world(), 100)
+    assert sum(row[1] for row in first[:-1]) > 0
+    assert sum(row[2] for row in first[:-1]) > 0
+    world = slots_world()
+    assert world_trace(world, 100) == first
+    world.reset()
+    assert world_trace(world, 100) == first
+    assert world_trace(slots_world(agent_storage="soa"), 100) == first
+
+
+@pytest.mark.parametrize("slots", ["compact", "free_list"])
+def test_id_index_stays_valid_without_refresh(slots_world, slots: str):
+    world = slots_world(agent_slots=slots, agent_storage="soa")
+    for tick in range(100):
+        world.step(tick)
+        assert all(agent.alive for agent in world.agents)
+        assert world._id_to_index == {agent.id: index for index, agent in enumerate(world.agents)}
+        assert [view._slot for view in world.agents] == list(range(len(world.agents)))
+        assert len(world._store) == len(world.agents)
+
+
+def test_free_list_refills_dead_slots_with_newborns(slots_world):
+    world = slots_world()
+    for tick in range(100):
+        before = [agent.id for agent in world.agents]
+        metrics = world.step(tick)
+        if metrics.births and metrics.deaths:
+            break
+    else:
+        pytest.fail("no tick with both births and deaths")
+    after = [agent.id for agent in world.agents]
+    survivors = set(after) & set(before)
+    reused = [index for index, agent_id in enumerate(after[: len(before)]) if agent_id not in survivors]
+    assert reused
+    assert all(after[index] >= world._next_id - metrics.births for index in reused)
+
+
+def test_unknown_agent_slots_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.agent_slots = "pool"
+    with pytest.raises(ValueError):
+        World(config)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+from pygame.math import Vector2
+
+from terrarium.sim.core.agent import AgentState, AgentTraits
+from terrarium.sim.core.agent_store import AgentStore
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.world import World
+
+
+def _allocate(store: AgentStore, agent_id: int) -> object:
+    return store.allocate(
+        id=agent_id,
+        generation=1,
+        group_id=-1,
+        position=Vector2(agent_id, agent_id + 0.5),
+        velocity=Vector2(0.25, -0.25),
+        energy=5.0 + agent_id,
+        age=1.0,
+        state=AgentState.WANDER,
+        traits=AgentTraits(speed=1.5, kin_bias=0.75),
+        wander_dir=Vector2(1.0, 0.0),
+    )
+
+
+def test_view_reads_and_writes_store_columns():
+    store = AgentStore(capacity=2)
+    views = [_allocate(store, agent_id) for agent_id in range(5)]
+
+    assert store.capacity >= 5
+    view = views[3]
+    assert view.id == 3
+    assert view.position == Vector2(3.0, 3.5)
+    assert view.traits.speed == 1.5
+    assert view.traits.kin_bias == 0.75
+    assert view.state is AgentState.WANDER
+    assert view.wander_dir == Vector2(1.0, 0.0)
+    assert isinstance(view.group_id, int)
+    assert isinstance(view.energy, float)
+
+    position = view.position
+    position.update(9.0, 8.0)
+    assert store.pos_x[view.slot] == 3.0
+    view.position = position
+    view.energy -= 2.0
+    view.group_id = 4
+    view.state = AgentState.FLEE
+    view.alive = False
+    assert store.pos_x[view.slot] == 9.0
+    assert store.energy[view.slot] == 6.0
+    assert view.group_id == 4
+    assert view.state is AgentState.FLEE
+    assert view.alive is False
+
+
+def test_retain_compacts_rows_and_updates_slots():
+    store = AgentStore(capacity=4)
+    views = [_allocate(store, agent_id) for agent_id in range(4)]
+    dropped = views[1]
+
+    store.retain([views[3], views[0], views[2]])
+
+    assert len(store) == 3
+    assert [view.slot for view in store.views] == [0, 1, 2]
+    assert [view.id for view in store.views] == [3, 0, 2]
+    assert views[3].position == Vector2(3.0, 3.5)
+    assert dropped.slot == -1
+
+
+def test_unknown_agent_storage_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.agent_storage = "columns"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def test_soa_storage_matches_object_layout_bit_for_bit(make_world, world_trace):
+    objects = make_world(11, 80, 40.0, agent_storage="objects")
+    soa = make_world(11, 80, 40.0, agent_storage="soa")
+    assert world_trace(soa, 60) == world_trace(objects, 60)
+    assert [a.traits for a in soa.agents] == [a.traits for a in objects.agents]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.world import World
+from terrarium.sim.systems.intents import TickIntents
+
+
+@pytest.fixture
+def buffered_world(make_world):
+    def make(**performance: str) -> World:
+        return make_world(13, 140, 45.0, tick_update="double_buffer", **performance)
+
+    return make
+
+
+def test_double_buffer_is_deterministic_across_runs_reset_and_storage(buffered_world, world_trace):
+    first = world_trace(buffered_world(), 90)
+    world = buffered_world()
+    assert world_trace(world, 90) == first
+    world.reset()
+    assert world_trace(world, 90) == first
+    assert world_trace(buffered_world(agent_storage="soa"), 90) == first
+    assert world_trace(buffered_world(neighbor_search="verlet"), 90) == first
+
+
+def test_double_buffer_neighbors_see_previous_positions(buffered_world):
+    world = buffered_world()
+    for tick in range(5):
+        world.step(tick)
+    before = {agent.id: (agent.position.x, agent.position.y) for agent in world.agents}
+    ctx = world._begin_tick(5)
+    world._rebuild_spatial_index(ctx)
+    probe = max(world.agents, key=lambda agent: world._collect_neighbors(agent, ctx))
+    for agent in world.agents:
+        if agent is not probe:
+            agent.position.update(agent.position.x + 0.5, agent.position.y)
+    world._collect_neighbors(probe, ctx)
+    assert world._neighbor_agents
+    for other in world._neighbor_agents:
+        assert (other.position.x, other.position.y) == before[other.id]
+
+
+def test_tick_intents_resolve_independent_of_request_order():
+    forward = TickIntents()
+    backward = TickIntents()
+    requests = [(7, 4, 2), (7, 1, 5), (7, 9, 3), (8, 2, 1)]
+    for target, source, group in requests:
+        forward.request_group(target, source, group)
+    for target, source, group in reversed(requests):
+        backward.request_group(target, source, group)
+    assert forward.groups == backward.groups == {7: (1, 5), 8: (2, 1)}
+
+
+def test_unknown_tick_update_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.tick_update = "jacobi"
+    with pytest.raises(ValueError):
+        World(config)
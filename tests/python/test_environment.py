@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import math
+import random
+
+import pytest
 from pygame.math import Vector2
 
-from terrarium.sim.core.config import EnvironmentConfig, ResourcePatchConfig
-from terrarium.sim.core.environment import EnvironmentGrid
+from terrarium.sim.core.config import EnvironmentConfig, ResourcePatchConfig, SimulationConfig
+from terrarium.sim.core.danger import DANGER_FLOOR
+from terrarium.sim.core.environment import DenseEnvironmentGrid, EnvironmentGrid
+from terrarium.sim.core.field_events import _SMALL_BUFFER, FieldEventBuffer
+from terrarium.sim.core.world import World
 
 
 def test_pheromone_diffusion_is_bounded_and_fades():
@@ -53,6 +60,49 @@ def test_prune_pheromones_limits_groups_and_decay():
     assert len(env._pheromone_field) == 0
 
 
+
+def _pheromone_map(env: EnvironmentGrid) -> dict[tuple[int, int], tuple[float, int]]:
+    return {(cell["x"], cell["y"]): (cell["value"], cell["group"]) for cell in env.export_pheromone_field()["cells"]}
+
+
+def test_pheromone_layers_match_flat_field():
+    config = EnvironmentConfig(pheromone_diffusion_rate=0.3, pheromone_decay_rate=0.2)
+    flat = EnvironmentGrid(cell_size=1.0, config=config, world_size=12.0)
+    layered = EnvironmentGrid(cell_size=1.0, config=config, world_size=12.0, pheromone_field="layers")
+    rng = random.Random(11)
+    for step in range(40):
+        for _ in range(10):
+            key = (rng.randrange(12), rng.randrange(12))
+            group_id = rng.randrange(6)
+            amount = rng.uniform(0.5, 4.0)
+            flat.add_pheromone(key, group_id, amount)
+            layered.add_pheromone(key, group_id, amount)
+        if step % 7 == 6:
+            active = {group_id for group_id in range(6) if rng.random() < 0.6}
+            flat.prune_pheromones(active)
+            layered.prune_pheromones(active)
+            assert set(layered._pheromone_layers.groups) <= active
+        flat.tick(0.5)
+        layered.tick(0.5)
+        for _ in range(20):
+            key = (rng.randrange(12), rng.randrange(12))
+            group_id = rng.randrange(6)
+            expected = flat.sample_pheromone(key, group_id)
+            assert layered.sample_pheromone(key, group_id) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+        expected_export = _pheromone_map(flat)
+        actual_export = _pheromone_map(layered)
+        assert actual_export.keys() == expected_export.keys()
+        for cell, (value, group_id) in expected_export.items():
+            assert actual_export[cell][0] == pytest.approx(value, rel=1e-9)
+            assert actual_export[cell][1] == group_id
+
+    layers = layered._pheromone_layers
+    assert len(layers._pool) + len(layers.groups) <= 6
+    layered.reset()
+    assert not layers
+    assert len(layers._pool) <= 6
+    assert _pheromone_map(layered) == {}
+
 def test_food_diffusion_stays_within_bounds():
     config = EnvironmentConfig(
         food_diffusion_rate=0.5,
@@ -77,3 +127,511 @@ def test_food_diffusion_stays_within_bounds():
         env.tick(1.0)
         assert all(0 <= x < env._max_index and 0 <= y < env._max_index for x, y in env._food_cells)
         assert len(env._food_cells) <= env._max_index**2
+
+
+def _food_map(env: EnvironmentGrid) -> dict[tuple[int, int], float]:
+    return {(cell["x"], cell["y"]): cell["value"] for cell in env.export_food_cells()["cells"]}
+
+
+@pytest.mark.parametrize("decay", [0.0, 0.05])
+def test_dense_food_field_matches_sparse(decay: float):
+    config = EnvironmentConfig(
+        food_per_cell=10.0,
+        food_regen_per_second=0.4,
+        food_diffusion_rate=0.3,
+        food_decay_rate=decay,
+        resource_patches=[ResourcePatchConfig(position=(6.0, 7.0), radius=3.5, resource_per_cell=20.0)],
+    )
+    sparse = EnvironmentGrid(cell_size=1.0, config=config, world_size=16.0)
+    dense = DenseEnvironmentGrid(cell_size=1.0, config=config, world_size=16.0)
+    rng = random.Random(5)
+    for step in range(60):
+        for _ in range(12):
+            key = (rng.randrange(16), rng.randrange(16))
+            action = rng.random()
+            if action < 0.4:
+                assert dense.sample_food(key) == pytest.approx(sparse.sample_food(key), rel=1e-9, abs=1e-12)
+            elif action < 0.7:
+                sparse.consume_food(key, 0.7)
+                dense.consume_food(key, 0.7)
+            else:
+                sparse.add_food(key, 1.5)
+                dense.add_food(key, 1.5)
+            assert dense.peek_food(key) == pytest.approx(sparse.peek_food(key), rel=1e-9, abs=1e-12)
+        sparse.set_food_regen_multiplier(1.0 + 0.1 * (step % 3))
+        dense.set_food_regen_multiplier(1.0 + 0.1 * (step % 3))
+        sparse.tick(0.5)
+        dense.tick(0.5)
+        expected = _food_map(sparse)
+        actual = _food_map(dense)
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+
+    sparse.reset()
+    dense.reset()
+    assert _food_map(dense) == _food_map(sparse)
+
+
+def _world_field_trace(steps: int, environment_tick_interval: float = 0.5, **performance: str) -> list[tuple]:
+    config = SimulationConfig(seed=3, initial_population=150, max_population=300, world_size=40.0)
+    config.environment_tick_interval = environment_tick_interval
+    for name, value in performance.items():
+        setattr(config.performance, name, value)
+    world = World(config)
+    env = world._environment
+    cells = [(x, y) for x in range(env._max_index) for y in range(env._max_index)]
+    trace = []
+    for tick in range(steps):
+        metrics = world.step(tick)
+        food = sum(_food_map(env).values())
+        pheromone = sum(cell["value"] for cell in env.export_pheromone_field()["cells"])
+        danger = sum(env.sample_danger(key) for key in cells)
+        trace.append((metrics.population, metrics.births, metrics.deaths, food, pheromone, danger))
+    return trace
+
+
+def _assert_field_traces_close(actual: list[tuple], expected: list[tuple], rel: float) -> None:
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got[:3] == want[:3]
+        assert got[3:] == pytest.approx(want[3:], rel=rel, abs=1e-9)
+
+
+def test_world_dense_food_field_matches_sparse():
+    expected = _world_field_trace(150)
+    assert expected[-1][3] > 0.0
+    _assert_field_traces_close(_world_field_trace(150, food_field="dense"), expected, rel=1e-9)
+
+
+def test_unknown_food_field_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.food_field = "grid"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def test_world_pheromone_layers_match_flat_field():
+    expected = _world_field_trace(150)
+    assert expected[-1][4] > 0.0
+    actual = _world_field_trace(150, food_field="dense", pheromone_field="layers")
+    _assert_field_traces_close(actual, expected, rel=1e-9)
+
+
+def test_unknown_pheromone_field_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.pheromone_field = "sparse"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+@pytest.mark.parametrize("environment_type", [EnvironmentGrid, DenseEnvironmentGrid])
+def test_cached_gradients_track_every_field_change(environment_type: type[EnvironmentGrid]):
+    config = EnvironmentConfig(food_diffusion_rate=0.2, resource_patches=[ResourcePatchConfig(position=(3.0, 3.0))])
+    direct = environment_type(cell_size=1.0, config=config, world_size=8.0)
+    cached = environment_type(cell_size=1.0, config=config, world_size=8.0, cache_gradients=True)
+    rng = random.Random(3)
+    cells = [(x, y) for x in range(8) for y in range(8)]
+    for step in range(30):
+        for _ in range(8):
+            key = rng.choice(cells)
+            action = rng.randrange(5)
+            for env in (direct, cached):
+                if action == 0:
+                    env.sample_food(key)
+                elif action == 1:
+                    env.consume_food(key, 0.6)
+                elif action == 2:
+                    env.add_food(key, 0.9)
+                elif action == 3:
+                    env.add_danger(key, 0.5)
+                else:
+                    env.add_pheromone(key, step % 3, 0.8)
+            for probe in cells:
+                assert cached.food_gradient(probe) == direct.food_gradient(probe)
+                assert cached.danger_gradient(probe) == direct.danger_gradient(probe)
+                assert cached.pheromone_gradient(probe, step % 3) == direct.pheromone_gradient(probe, step % 3)
+        if step % 10 == 9:
+            for env in (direct, cached):
+                env.prune_pheromones({0, 1})
+                env.tick(0.5)
+    cached.food_gradient((1, 1))
+    assert (1, 1) in cached._food_gradients
+    assert not direct._food_gradients
+
+
+def test_world_cached_gradients_match_direct():
+    def run(field_gradients: str) -> list[tuple]:
+        config = SimulationConfig(seed=12, initial_population=90, max_population=180, world_size=35.0)
+        config.environment_tick_interval = 0.5
+        config.performance.field_gradients = field_gradients
+        world = World(config)
+        trace = [(m.population, m.births, m.average_energy) for m in (world.step(tick) for tick in range(120))]
+        trace.append(tuple((a.id, a.position.x, a.position.y) for a in world.agents))
+        return trace
+
+    assert run("cached") == run("direct")
+
+
+def test_patch_raster_matches_scalar_membership():
+    rng = random.Random(17)
+    patches = [
+        ResourcePatchConfig(
+            position=(rng.uniform(-5.0, 45.0), rng.uniform(-5.0, 45.0)),
+            radius=rng.choice([2.0, 5.5, 7.0, 11.0]),
+            resource_per_cell=float(index + 2),
+            regen_per_second=0.1 * index,
+            initial_resource=float(index),
+        )
+        for index in range(24)
+    ]
+    config = EnvironmentConfig(food_per_cell=9.0, resource_patches=patches)
+    env = EnvironmentGrid(cell_size=5.5, config=config, world_size=40.0)
+    for x in range(-2, env._max_index + 2):
+        for y in range(-2, env._max_index + 2):
+            expected = 0
+            for number, patch in enumerate(patches, start=1):
+                if math.hypot(x * 5.5 - patch.position[0], y * 5.5 - patch.position[1]) <= patch.radius:
+                    expected = number
+                    break
+            assert env._patch_at((x, y)) == expected
+
+    raster = env._patch_index
+    env.reset()
+    assert env._patch_index is raster
+
+    dense = DenseEnvironmentGrid(cell_size=5.5, config=config, world_size=40.0)
+    for key in [(x, y) for x in range(env._max_index) for y in range(env._max_index)]:
+        env.reset()
+        dense.reset()
+        env.add_food(key, 0.5)
+        dense.add_food(key, 0.5)
+        assert dense.peek_food(key) == env.peek_food(key)
+
+
+def test_danger_region_matches_dict_above_floor_and_collapses_sooner():
+    config = EnvironmentConfig(danger_diffusion_rate=0.3, danger_decay_rate=0.4)
+    flat = EnvironmentGrid(cell_size=1.0, config=config, world_size=12.0)
+    region = EnvironmentGrid(cell_size=1.0, config=config, world_size=12.0, danger_field="region")
+    for env in (flat, region):
+        env.add_danger((0, 0), 2.0)
+        env.add_danger((5, 6), 1.5)
+    assert region.danger_cell_count() == flat.danger_cell_count() == 2
+    assert region._danger_region.box == (0, 6, 0, 7)
+
+    for _ in range(4):
+        flat.tick(0.5)
+        region.tick(0.5)
+        for x in range(12):
+            for y in range(12):
+                expected = flat.sample_danger((x, y))
+                if expected > DANGER_FLOOR * 2:
+                    assert region.sample_danger((x, y)) == pytest.approx(expected, rel=0.05)
+                elif expected == 0.0:
+                    assert region.sample_danger((x, y)) == 0.0
+    assert region.danger_cell_count() < flat.danger_cell_count()
+
+    while region.has_danger():
+        region.tick(0.5)
+        flat.tick(0.5)
+    assert region.danger_cell_count() == 0
+    assert region._danger_region.box is None
+    assert flat.has_danger()
+
+    region.add_danger((3, 3), 1.0)
+    region.reset()
+    assert not region.has_danger()
+    assert region.sample_danger((3, 3)) == 0.0
+
+
+def test_world_danger_region_matches_dict():
+    expected = _world_field_trace(150)
+    assert expected[-1][5] > 0.0
+    # Agents keep refreshing the danger they pulse, so no cell decays below DANGER_FLOOR here and
+    # the backends agree to rounding; the floor cut is covered by the decay test below.
+    _assert_field_traces_close(_world_field_trace(150, danger_field="region"), expected, rel=1e-9)
+
+
+def test_world_danger_region_clears_below_floor():
+    worlds = {}
+    for danger_field in ("dict", "region"):
+        config = SimulationConfig(seed=1, initial_population=0, world_size=44.0)
+        config.time_step = 0.5
+        config.environment_tick_interval = 0.5
+        config.performance.danger_field = danger_field
+        world = World(config)
+        for key in ((1, 1), (4, 5), (6, 2)):
+            world._environment.add_danger(key, 3.0)
+        worlds[danger_field] = world
+    flat = worlds["dict"]._environment
+    region = worlds["region"]._environment
+    cells = [(x, y) for x in range(flat._max_index) for y in range(flat._max_index)]
+
+    cleared_early = False
+    for tick in range(20):
+        worlds["dict"].step(tick)
+        metrics = worlds["region"].step(tick)
+        flat_values = [flat.sample_danger(key) for key in cells]
+        region_values = [region.sample_danger(key) for key in cells]
+        # Cells under the floor are dropped (and stop diffusing), so the region only ever holds
+        # less, by at most the floor per live dict cell in total.
+        assert 0.0 <= sum(flat_values) - sum(region_values) <= DANGER_FLOOR * flat.danger_cell_count()
+        for expected, actual in zip(flat_values, region_values):
+            assert abs(expected - actual) <= 2 * DANGER_FLOOR
+        if not region.has_danger():
+            assert metrics.danger_cells == 0
+            assert max(flat_values) < DANGER_FLOOR
+            cleared_early = cleared_early or flat.has_danger()
+        if max(flat_values) < DANGER_FLOOR:
+            assert not region.has_danger()
+    assert cleared_early
+    assert not flat.has_danger()
+
+
+def test_unknown_danger_field_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.danger_field = "grid"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def test_spectral_diffusion_matches_fine_explicit_steps():
+    config = EnvironmentConfig(
+        food_per_cell=50.0,
+        food_regen_per_second=0.0,
+        food_diffusion_rate=0.3,
+        food_decay_rate=0.02,
+        pheromone_diffusion_rate=0.3,
+        pheromone_decay_rate=0.05,
+        danger_diffusion_rate=2.0,
+        danger_decay_rate=0.1,
+    )
+    envs = {}
+    for solver in ("explicit", "spectral"):
+        for environment_type, pheromone_field, danger_field in (
+            (EnvironmentGrid, "flat", "dict"),
+            (DenseEnvironmentGrid, "layers", "dict"),
+        ):
+            env = environment_type(
+                cell_size=1.0,
+                config=config,
+                world_size=10.0,
+                pheromone_field=pheromone_field,
+                danger_field=danger_field,
+                diffusion_solver=solver,
+            )
+            for key in ((2, 3), (0, 9), (7, 7)):
+                env.add_food(key, 30.0)
+                env.add_danger(key, 4.0)
+                env.add_pheromone(key, key[0] % 2, 3.0)
+            steps = 600 if solver == "explicit" else 1
+            for _ in range(steps):
+                env.tick(6.0 / steps)
+            envs[(solver, environment_type)] = env
+
+    cells = [(x, y) for x in range(10) for y in range(10)]
+    for environment_type in (EnvironmentGrid, DenseEnvironmentGrid):
+        fine = envs[("explicit", environment_type)]
+        exact = envs[("spectral", environment_type)]
+        for key in cells:
+            assert exact.peek_food(key) == pytest.approx(fine.peek_food(key), rel=0.01, abs=0.05)
+            assert exact.sample_danger(key) == pytest.approx(fine.sample_danger(key), rel=0.01, abs=0.02)
+            for group in (0, 1):
+                assert exact.sample_pheromone(key, group) == pytest.approx(
+                    fine.sample_pheromone(key, group), rel=0.01, abs=5e-3
+                )
+    sparse = envs[("spectral", EnvironmentGrid)]
+    dense = envs[("spectral", DenseEnvironmentGrid)]
+    region = EnvironmentGrid(
+        cell_size=1.0, config=config, world_size=10.0, danger_field="region", diffusion_solver="spectral"
+    )
+    for key in ((2, 3), (0, 9), (7, 7)):
+        region.add_danger(key, 4.0)
+    region.tick(6.0)
+    for key in cells:
+        assert dense.peek_food(key) == pytest.approx(sparse.peek_food(key))
+        assert dense.sample_pheromone(key, 1) == pytest.approx(sparse.sample_pheromone(key, 1))
+        expected = sparse.sample_danger(key)
+        assert region.sample_danger(key) == (pytest.approx(expected) if expected > DANGER_FLOOR else 0.0)
+
+
+def test_spectral_tick_matches_converging_explicit_steps_at_default_interval():
+    # Every cell stays well above the explicit solver's 1e-4 / 1e-5 cutoffs, so the explicit steps
+    # converge (first order in dt) to the exact solution the spectral solver takes in one tick.
+    config = EnvironmentConfig(food_per_cell=50.0, food_regen_per_second=0.0)
+    interval = SimulationConfig().environment_tick_interval
+    size = 6
+    cells = [(x, y) for x in range(size) for y in range(size)]
+
+    def seeded(environment_type: type[EnvironmentGrid], solver: str) -> EnvironmentGrid:
+        env = environment_type(cell_size=1.0, config=config, world_size=float(size), diffusion_solver=solver)
+        for x, y in cells:
+            value = 1.0 + (3 * x + 5 * y) % 7
+            env.consume_food((x, y), config.food_per_cell)
+            env.add_food((x, y), 3.0 * value)
+            env.add_danger((x, y), value)
+            env.add_pheromone((x, y), 0, value)
+            env.add_pheromone((x, y), 1, 8.0 - value)
+        return env
+
+    def max_rel_errors(env: EnvironmentGrid, exact: EnvironmentGrid) -> tuple[float, float, float]:
+        def rel(actual: float, expected: float) -> float:
+            return abs(actual - expected) / expected
+
+        return (
+            max(rel(env.peek_food(key), exact.peek_food(key)) for key in cells),
+            max(rel(env.sample_danger(key), exact.sample_danger(key)) for key in cells),
+            max(
+                rel(env.sample_pheromone(key, group), exact.sample_pheromone(key, group))
+                for key in cells
+                for group in (0, 1)
+            ),
+        )
+
+    for environment_type, pheromone_field in ((EnvironmentGrid, "flat"), (DenseEnvironmentGrid, "layers")):
+        exact = seeded(environment_type, "spectral")
+        exact.tick(interval)
+        errors = []
+        for steps in (300, 1200):
+            env = seeded(environment_type, "explicit")
+            for _ in range(steps):
+                env.tick(interval / steps)
+            errors.append(max_rel_errors(env, exact))
+        coarse, fine = errors
+        # Danger decays at 1/s, so (1 - dt)^n trails exp(-t) the most.
+        assert fine[0] < 2e-4 and fine[1] < 2e-2 and fine[2] < 2e-4
+        for coarse_error, fine_error in zip(coarse, fine):
+            assert fine_error < 0.3 * coarse_error
+
+
+def test_world_spectral_diffusion_matches_explicit():
+    # One environment tick per world tick (dt = time_step), so 100 ticks are 100 diffusion steps.
+    # The explicit steps are then accurate and the agents still make the same choices.
+    interval = SimulationConfig().time_step
+    expected = _world_field_trace(100, interval)
+    assert expected[-1][4] > 0.0 and expected[-1][5] > 0.0
+    actual = _world_field_trace(100, interval, diffusion_solver="spectral")
+    _assert_field_traces_close(actual, expected, rel=5e-3)
+
+
+def test_unknown_diffusion_solver_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.diffusion_solver = "implicit"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def _fold(events: list[tuple]) -> dict[tuple[int, int, int], float]:
+    folded: dict[tuple[int, int, int], float] = {}
+    for cell, group_id, amount in events:
+        key = (*cell, group_id)
+        folded[key] = folded.get(key, 0.0) + amount
+    return folded
+
+
+def test_field_event_buffer_reduces_like_keyed_dict():
+    rng = random.Random(5)
+    events = [((rng.randrange(9), rng.randrange(9)), rng.randrange(3), rng.uniform(0.1, 2.0)) for _ in range(200)]
+    first = FieldEventBuffer(9)
+    second = FieldEventBuffer(9)
+    for index, (cell, group_id, amount) in enumerate(events):
+        (first if index < 120 else second).add(cell, amount, group_id)
+    expected = _fold(events)
+    first.extend(second)
+    assert len(first) == 200
+
+    xs, ys, groups, totals = first.reduce()
+    assert list(zip(xs, ys, groups)) == list(expected)
+    assert totals == list(expected.values())
+    small = FieldEventBuffer(9)
+    for cell, group_id, amount in events[:40]:
+        small.add(cell, amount, group_id)
+    xs, ys, groups, totals = small.reduce()
+    assert len(small) <= _SMALL_BUFFER < len(first)
+    assert list(zip(xs, ys, groups, totals)) == [
+        (*key, value) for key, value in _fold(events[:40]).items()
+    ]
+    first.clear()
+    assert not first and first.reduce() == ([], [], [], [])
+
+
+@pytest.mark.parametrize("environment_type", [EnvironmentGrid, DenseEnvironmentGrid])
+def test_field_event_batches_match_single_adds(environment_type: type[EnvironmentGrid]):
+    config = EnvironmentConfig(food_per_cell=3.0, resource_patches=[ResourcePatchConfig(position=(2.0, 2.0))])
+    rng = random.Random(9)
+    buffers = {kind: FieldEventBuffer(8) for kind in ("food", "danger", "pheromone")}
+    for _ in range(60):
+        cell = (rng.randrange(8), rng.randrange(8))
+        buffers["food"].add(cell, rng.uniform(0.0, 2.0))
+        buffers["danger"].add(cell, rng.uniform(0.1, 1.0))
+        buffers["pheromone"].add(cell, rng.uniform(0.1, 1.0), rng.randrange(4))
+    for pheromone_field, danger_field in (("flat", "dict"), ("layers", "region")):
+        single = environment_type(
+            1.0, config, 8.0, pheromone_field=pheromone_field, danger_field=danger_field, cache_gradients=True
+        )
+        batched = environment_type(
+            1.0, config, 8.0, pheromone_field=pheromone_field, danger_field=danger_field, cache_gradients=True
+        )
+        for env in (single, batched):
+            for x in range(8):
+                env.danger_gradient((x, x))
+                env.pheromone_gradient((x, 7 - x), 1)
+        xs, ys, _, totals = buffers["food"].reduce()
+        for x, y, amount in zip(xs, ys, totals):
+            single.add_food((x, y), amount)
+        batched.add_food_events(xs, ys, totals)
+        xs, ys, _, totals = buffers["danger"].reduce()
+        for x, y, amount in zip(xs, ys, totals):
+            single.add_danger((x, y), amount)
+        batched.add_danger_events(xs, ys, totals)
+        xs, ys, groups, totals = buffers["pheromone"].reduce()
+        for x, y, group_id, amount in zip(xs, ys, groups, totals):
+            single.add_pheromone((x, y), group_id, amount)
+        batched.add_pheromone_events(xs, ys, groups, totals)
+
+        assert batched.export_food_cells() == single.export_food_cells()
+        assert batched.export_pheromone_field() == single.export_pheromone_field()
+        assert batched.danger_cell_count() == single.danger_cell_count()
+        assert batched._danger_gradients == single._danger_gradients
+        assert batched._pheromone_gradients == single._pheromone_gradients
+        for x in range(8):
+            for y in range(8):
+                assert batched.sample_danger((x, y)) == single.sample_danger((x, y))
+                assert batched.danger_gradient((x, y)) == single.danger_gradient((x, y))
+
+
+def test_food_regen_visits_only_cells_below_capacity():
+    config = EnvironmentConfig(
+        food_per_cell=4.0,
+        food_regen_per_second=0.5,
+        food_diffusion_rate=0.2,
+        resource_patches=[ResourcePatchConfig(position=(3.0, 3.0), radius=2.0, regen_per_second=0.0)],
+    )
+    env = EnvironmentGrid(cell_size=1.0, config=config, world_size=8.0)
+    dense = DenseEnvironmentGrid(cell_size=1.0, config=config, world_size=8.0)
+    rng = random.Random(2)
+    for step in range(40):
+        for _ in range(4):
+            key = (rng.randrange(8), rng.randrange(8))
+            for grid in (env, dense):
+                if step < 20:
+                    grid.consume_food(key, 1.5)
+                grid.sample_food(key)
+        for grid in (env, dense):
+            grid.tick(1.0)
+        pending = {
+            key
+            for key, cell in env._food_cells.items()
+            if min(cell.max, cell.value + cell.regen_per_second) != cell.value
+        }
+        assert env._food_regen_active == pending
+        assert env.food_regen_cell_count() == dense.food_regen_cell_count()
+        assert _food_map(dense) == pytest.approx(_food_map(env))
+    assert env.food_regen_cell_count() < len(env._food_cells)
+
+    env.sample_food((-3, 9))
+    env.tick(1.0)
+    assert all(0 <= x < 8 and 0 <= y < 8 for x, y in env._food_cells)
+    assert env._food_regen_active <= set(env._food_cells)
+    env.reset()
+    assert env.food_regen_cell_count() == 0
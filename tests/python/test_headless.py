@@ -66,6 +66,17 @@ def test_headless_detailed_log_header_and_ratios(tmp_path):
         "group_stride_active",
         "group_stride_active_agents",
         "group_stride_skipped_agents",
+        "neighbor_list_rebuilds",
+        "neighbor_candidates",
+        "danger_cells",
+        "food_regen_cells",
+        "group_updates_evaluated",
+        "group_updates_skipped",
+        "steering_reused",
+        "steering_recomputed",
+        "steering_reuse_ratio",
+        "steering_max_deviation",
+        "governor_level",
     ]
 
     first_row = rows[1]
@@ -117,3 +128,26 @@ def test_headless_summary_output(tmp_path):
     assert "population" in payload
     assert "neighbor_checks" in payload
     assert payload["tail_window"]["window"] == 2
+
+
+def test_headless_governor_trace_replays_schedule(tmp_path):
+    recorded_path = tmp_path / "recorded.csv"
+    replayed_path = tmp_path / "replayed.csv"
+    # A budget no tick can meet drives the level up once per governor window.
+    run_headless(steps=70, seed=4, log_path=recorded_path, deterministic_log=True, tick_budget_ms=1e-6)
+    run_headless(
+        steps=70,
+        seed=4,
+        log_path=replayed_path,
+        deterministic_log=True,
+        governor_trace=recorded_path,
+    )
+    recorded = _read_csv(recorded_path)
+    levels = [int(row[recorded[0].index("governor_level")]) for row in recorded[1:]]
+    assert levels[0] == 0 and levels[-1] == 2
+    assert _read_csv(replayed_path) == recorded
+
+    basic_path = tmp_path / "basic.csv"
+    run_headless(steps=1, seed=4, log_path=basic_path, deterministic_log=True, log_format="basic")
+    with pytest.raises(ValueError, match="governor_level"):
+        run_headless(steps=1, seed=4, log_path=None, governor_trace=basic_path)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.world import World
+
+
+@pytest.mark.parametrize(("seed", "world_size", "skin"), [(21, 100.0, 1.0), (3, 40.0, 0.5)])
+def test_verlet_lists_match_grid_queries(make_world, world_trace, seed: int, world_size: float, skin: float):
+    steps = 120
+    grid_metrics: list = []
+    verlet_metrics: list = []
+    grid_trace = world_trace(make_world(seed, 150, world_size, neighbor_search="grid"), steps, grid_metrics)
+    verlet_world = make_world(seed, 150, world_size, neighbor_search="verlet", neighbor_skin=skin)
+    verlet_trace = world_trace(verlet_world, steps, verlet_metrics)
+
+    assert verlet_trace == grid_trace
+    assert sum(m.neighbor_list_rebuilds + m.neighbor_candidates for m in grid_metrics) == 0
+    rebuilds = sum(m.neighbor_list_rebuilds for m in verlet_metrics)
+    candidates = sum(m.neighbor_candidates for m in verlet_metrics)
+    accepted = sum(m.neighbor_checks for m in verlet_metrics)
+    assert 0 < rebuilds < steps
+    assert candidates >= accepted > 0
+
+
+def test_unknown_neighbor_search_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.neighbor_search = "kdtree"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def test_reset_clears_verlet_state():
+    config = SimulationConfig(seed=4, initial_population=60, max_population=120, world_size=30.0)
+    config.performance.neighbor_search = "verlet"
+    world = World(config)
+    first = [world.step(tick).neighbor_checks for tick in range(10)]
+    world.reset()
+    assert [world.step(tick).neighbor_checks for tick in range(10)] == first
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import random
+
+import pytest
 from pygame.math import Vector2
 
 from terrarium.sim.core.agent import Agent, AgentState
-from terrarium.sim.core.spatial_grid import SpatialGrid
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.spatial_grid import DenseSpatialGrid, SpatialGrid
+from terrarium.sim.core.world import World
 
 
 def test_neighbor_query_matches_bruteforce():
@@ -124,3 +129,105 @@ def test_collect_neighbors_precomputed_clears_distance_buffer():
     assert out_agents == []
     assert out_offsets == []
     assert out_dist_sq == []
+
+
+def _random_agents(count: int, world_size: float, seed: int) -> list[Agent]:
+    rng = random.Random(seed)
+    return [
+        Agent(
+            id=idx,
+            generation=0,
+            group_id=-1,
+            position=Vector2(rng.uniform(0.0, world_size), rng.uniform(0.0, world_size)),
+            velocity=Vector2(),
+            energy=10.0,
+            age=0.0,
+            state=AgentState.IDLE,
+        )
+        for idx in range(count)
+    ]
+
+
+def test_dense_grid_matches_hash_grid_order():
+    world_size = 40.0
+    hash_grid = SpatialGrid(cell_size=2.5)
+    dense_grid = DenseSpatialGrid(cell_size=2.5, world_size=world_size)
+    radius = 3.0
+    hash_offsets = hash_grid.build_neighbor_cell_offsets(radius)
+    dense_offsets = dense_grid.build_neighbor_cell_offsets(radius)
+    assert hash_offsets == dense_offsets
+
+    for tick, count in enumerate((300, 120, 450)):
+        agents = _random_agents(count, world_size, seed=tick)
+        agents[0].position = Vector2(world_size, world_size)
+        agents[1].position = Vector2(0.0, world_size)
+        hash_grid.clear()
+        dense_grid.clear()
+        for agent in agents:
+            hash_grid.insert(agent)
+            dense_grid.insert(agent)
+        assert sum(dense_grid.cell_count) == count
+        for agent in agents:
+            expected: list[Agent] = []
+            expected_offsets: list[Vector2] = []
+            expected_dist: list[float] = []
+            actual: list[Agent] = []
+            actual_offsets: list[Vector2] = []
+            actual_dist: list[float] = []
+            hash_grid.collect_neighbors_precomputed(
+                agent.position, hash_offsets, radius * radius, expected, expected_offsets, agent.id, expected_dist
+            )
+            dense_grid.collect_neighbors_precomputed(
+                agent.position, dense_offsets, radius * radius, actual, actual_offsets, agent.id, actual_dist
+            )
+            assert [a.id for a in actual] == [a.id for a in expected]
+            assert actual_offsets == expected_offsets
+            assert actual_dist == expected_dist
+
+
+def test_dense_grid_rebuild_reuses_buffers_until_population_grows():
+    grid = DenseSpatialGrid(cell_size=2.5, world_size=40.0)
+    grid.build_neighbor_cell_offsets(3.0)
+
+    def rebuild(count: int, seed: int) -> tuple:
+        grid.clear()
+        agents = _random_agents(count, 40.0, seed)
+        for agent in agents:
+            grid.insert(agent)
+        cells = [grid.cell_index(a.position.x, a.position.y) for a in agents]
+        expected = sorted(range(count), key=lambda index: cells[index])
+        assert [a.id for a in grid.sorted_agents] == expected
+        return grid._cell_count, grid._sort_keys, grid._order
+
+    buffers = rebuild(300, 1)
+    for count, seed in ((120, 2), (300, 3), (0, 4)):
+        assert all(new is old for new, old in zip(rebuild(count, seed), buffers))
+    assert grid._cell_start[-1] == 0
+    grown = rebuild(len(buffers[2]) + 1, 5)
+    assert grown[0] is buffers[0] and grown[2] is not buffers[2]
+
+
+def test_dense_grid_finds_agents_outside_world_bounds():
+    grid = DenseSpatialGrid(cell_size=2.0, world_size=10.0)
+    agents = _random_agents(3, 1.0, seed=1)
+    agents[0].position = Vector2(-30.0, 5.0)
+    agents[1].position = Vector2(-31.0, 5.5)
+    agents[2].position = Vector2(50.0, 50.0)
+    for agent in agents:
+        grid.insert(agent)
+
+    neighbors = grid.get_neighbors(Vector2(-30.5, 5.0), 2.0)
+    assert sorted(a.id for a in neighbors) == [0, 1]
+    assert [a.id for a in grid.get_neighbors(Vector2(49.0, 50.0), 1.5)] == [2]
+
+
+def test_world_with_dense_grid_matches_hash_grid(make_world, world_trace):
+    dense = world_trace(make_world(21, 120, 45.0, spatial_grid="dense"), 60)
+    assert dense == world_trace(make_world(21, 120, 45.0, spatial_grid="hash"), 60)
+
+
+def test_unknown_spatial_grid_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.spatial_grid = "octree"
+    with pytest.raises(ValueError):
+        World(config)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+from pygame.math import Vector2
+
+from terrarium.sim.core.config import SimulationConfig
+from terrarium.sim.core.spatial_grid import build_half_shell_pairs, build_neighbor_pairs, mirror_pairs
+from terrarium.sim.core.world import World
+from terrarium.sim.systems import steering, steering_batch
+
+
+def _warm_world(seed: int, world_size: float, population: int, steps: int, rng_version: int = 1) -> World:
+    config = SimulationConfig(seed=seed, initial_population=population, max_population=700, world_size=world_size)
+    config.rng_version = rng_version
+    config.feedback.steering_update_population_threshold = 10**9
+    world = World(config)
+    for tick in range(steps):
+        world.step(tick)
+    return world
+
+
+def test_neighbor_pairs_match_grid_query_order():
+    world = _warm_world(3, 60.0, 200, 40)
+    ctx = world._begin_tick(40)
+    world._rebuild_spatial_index(ctx)
+    agents = world.agents
+    columns = steering_batch.gather_agent_columns(world, agents)
+    pairs = build_neighbor_pairs(
+        columns.pos_x, columns.pos_y, world._config.cell_size, ctx.vision_cell_offsets, ctx.vision_radius_sq
+    )
+    index_of = {agent.id: index for index, agent in enumerate(agents)}
+
+    expected_agent = []
+    expected_neighbor = []
+    expected_dist_sq = []
+    for index, agent in enumerate(agents):
+        world._collect_neighbors(agent, ctx)
+        expected_agent.extend([index] * len(world._neighbor_agents))
+        expected_neighbor.extend(index_of[other.id] for other in world._neighbor_agents)
+        expected_dist_sq.extend(world._neighbor_dist_sq)
+
+    assert pairs.agent_index.tolist() == expected_agent
+    assert pairs.neighbor_index.tolist() == expected_neighbor
+    assert pairs.dist_sq.tolist() == expected_dist_sq
+
+
+@pytest.mark.parametrize("rng_version", [1, 2])
+@pytest.mark.parametrize(("seed", "world_size", "population"), [(1, 100.0, 200), (5, 60.0, 250), (7, 40.0, 150)])
+def test_batch_matches_scalar_for_same_state(seed: int, world_size: float, population: int, rng_version: int):
+    world = _warm_world(seed, world_size, population, 150, rng_version)
+    scalar_world = copy.deepcopy(world)
+    batch_world = copy.deepcopy(world)
+
+    ctx = scalar_world._begin_tick(150)
+    scalar_world._rebuild_spatial_index(ctx)
+    expected = []
+    for agent in scalar_world.agents:
+        traits, speed_limit = scalar_world._prepare_agent(agent)
+        scalar_world._collect_neighbors(agent, ctx)
+        desired, sensed = steering.compute_desired_velocity(
+            scalar_world,
+            agent,
+            scalar_world._neighbor_agents,
+            scalar_world._neighbor_offsets,
+            speed_limit,
+            return_sensed=True,
+            neighbor_dist_sq=scalar_world._neighbor_dist_sq,
+            traits=traits,
+            danger_present=ctx.danger_present,
+            base_cell_key=scalar_world._cell_key(agent.position),
+        )
+        expected.append((desired.x, desired.y, sensed, agent.state, agent.wander_dir.x))
+
+    result = steering_batch.compute_tick(batch_world, batch_world._begin_tick(150))
+    actual = [
+        (x, y, sensed, agent.state, agent.wander_dir.x)
+        for x, y, sensed, agent in zip(result.desired_x, result.desired_y, result.sensed, batch_world.agents)
+    ]
+    assert actual == expected
+    if rng_version == 1:
+        # The sequential stream must be left where the scalar path leaves it; counter draws are
+        # keyed per agent, so the batch path takes them up front without binding.
+        assert batch_world._rng.next_float() == scalar_world._rng.next_float()
+
+
+def test_batch_backend_is_deterministic_across_storage(make_world, world_trace):
+    first = world_trace(make_world(9, 120, 50.0, steering_backend="batch", agent_storage="objects"), 80)
+    assert first == world_trace(make_world(9, 120, 50.0, steering_backend="batch", agent_storage="objects"), 80)
+    assert first == world_trace(make_world(9, 120, 50.0, steering_backend="batch", agent_storage="soa"), 80)
+
+
+def test_unknown_steering_backend_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.steering_backend = "simd"
+    with pytest.raises(ValueError):
+        World(config)
+
+
+def test_batch_boundary_avoidance_matches_scalar():
+    world = World(SimulationConfig(initial_population=0))
+    xs = np.array([0.5, 5.0, 50.0, 95.0, 99.9, 10.0])
+    ys = np.array([50.0, 99.0, 50.0, 2.0, 99.9, 10.0])
+    bias_x, bias_y, proximity = steering_batch.boundary_avoidance(world, xs, ys)
+    for index, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+        bias, expected_proximity = steering.boundary_avoidance(world, Vector2(x, y))
+        assert (bias_x[index], bias_y[index], proximity[index]) == (bias.x, bias.y, expected_proximity)
+
+
+def test_half_shell_pairs_cover_each_unordered_pair_once():
+    world = _warm_world(3, 60.0, 200, 40)
+    ctx = world._begin_tick(40)
+    columns = steering_batch.gather_agent_columns(world, world.agents)
+    args = (columns.pos_x, columns.pos_y, world._config.cell_size, ctx.vision_cell_offsets, ctx.vision_radius_sq)
+    directed = build_neighbor_pairs(*args)
+    half = build_half_shell_pairs(*args)
+
+    unordered = [tuple(sorted(pair)) for pair in zip(half.agent_index.tolist(), half.neighbor_index.tolist())]
+    assert len(unordered) == len(set(unordered))
+    assert 2 * len(half) == len(directed)
+    assert set(unordered) == {
+        tuple(sorted(pair)) for pair in zip(directed.agent_index.tolist(), directed.neighbor_index.tolist())
+    }
+
+    mirrored = mirror_pairs(half)
+    assert mirrored.agent_index.tolist() == directed.agent_index.tolist()
+    assert sorted(zip(mirrored.agent_index.tolist(), mirrored.neighbor_index.tolist(), mirrored.dx.tolist())) == sorted(
+        zip(directed.agent_index.tolist(), directed.neighbor_index.tolist(), directed.dx.tolist())
+    )
+
+
+@pytest.mark.parametrize(("seed", "world_size", "population"), [(5, 60.0, 250), (7, 40.0, 150)])
+def test_half_shell_forces_match_one_sided_path(seed: int, world_size: float, population: int):
+    world = _warm_world(seed, world_size, population, 150)
+    results = {}
+    for mode in ("directed", "half_shell"):
+        clone = copy.deepcopy(world)
+        clone._config.performance.pair_enumeration = mode
+        result = steering_batch.compute_tick(clone, clone._begin_tick(150))
+        results[mode] = (result, [agent.state for agent in clone.agents])
+
+    directed, directed_states = results["directed"]
+    half, half_states = results["half_shell"]
+    assert half_states == directed_states
+    assert half.sensed == directed.sensed
+    np.testing.assert_allclose(half.desired_x, directed.desired_x, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(half.desired_y, directed.desired_y, rtol=1e-12, atol=1e-12)
+
+
+def test_unknown_pair_enumeration_is_rejected():
+    config = SimulationConfig(initial_population=0)
+    config.performance.pair_enumeration = "full_shell"
+    with pytest.raises(ValueError):
+        World(config)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import fields as dataclass_fields
 
 from pygame.math import Vector2
-from pytest import approx
+from pytest import approx, raises
 
 from terrarium.sim.core.agent import Agent, AgentState, AgentTraits
 from terrarium.sim.core.config import (
@@ -13,13 +13,16 @@ from terrarium.sim.core.config import (
     EvolutionConfig,
     FeedbackConfig,
     load_config,
+    PerformanceConfig,
     SimulationConfig,
     SpeciesConfig,
 )
 from terrarium.sim.core.environment import FoodCell
+from terrarium.sim.core.group_bases import GroupBaseIndex
 from terrarium.sim.core.rng import DeterministicRng
+from terrarium.sim.core.tick_governor import TickGovernor, governed_strides
 from terrarium.sim.core.world import World, _APPEARANCE_RNG_SALT, _TRAIT_RNG_SALT, _derive_stream_seed
-from terrarium.sim.systems import fields as fields_system, lifecycle, steering
+from terrarium.sim.systems import fields as fields_system, groups as groups_system, lifecycle, steering
 from terrarium.sim.utils.math2d import _clamp_value
 
 
@@ -259,6 +262,25 @@ def test_traits_respect_clamp_after_births():
         assert clamp.kin_bias[0] <= agent.traits.kin_bias <= clamp.kin_bias[1]
 
 
+def test_derived_traits_are_cached_at_birth_and_rebuilt_by_set_agent_traits():
+    config = SimulationConfig(seed=77, initial_population=60, max_population=120, world_size=30.0)
+    world = World(config)
+    for tick in range(80):
+        world.step(tick)
+    assert world._next_id > 60
+    for agent in world.agents:
+        assert agent.derived == world._derive_traits(agent.traits)
+
+    agent = world.agents[0]
+    derived = world.set_agent_traits(agent, AgentTraits(speed=100.0, metabolism=0.0))
+    clamp = config.evolution.clamp
+    assert agent.traits.speed == clamp.speed[1]
+    assert agent.traits.metabolism == clamp.metabolism[0]
+    assert agent.derived is derived
+    assert derived.speed_limit == config.species.base_speed * clamp.speed[1]
+    assert derived == world._derive_traits(agent.traits)
+
+
 def test_step_clamps_traits_at_entry():
     clamp = EvolutionClampConfig(
         speed=(0.8, 1.1),
@@ -2565,3 +2587,404 @@ def test_steering_stride_reuses_last_desired():
     agent0_next = world.agents[0]
     assert agent0_next.last_desired.x == approx(last0[0])
     assert agent0_next.last_desired.y == approx(last0[1])
+
+
+def test_batched_food_consumption_splits_cells_evenly_in_any_order():
+    def feed(reverse: bool) -> tuple[list[float], float]:
+        config = SimulationConfig(seed=3, initial_population=4, time_step=1.0)
+        config.environment.food_consumption_rate = 2.0
+        config.performance.food_consumption = "batched"
+        world = World(config)
+        key = (2, 2)
+        world._environment._food_cells[key] = FoodCell(value=3.0, max=10.0, regen_per_second=0.0)
+        agents = list(reversed(world.agents)) if reverse else list(world.agents)
+        energies = [agent.energy for agent in world.agents]
+        for agent in agents:
+            world._food_demand.setdefault(key, []).append(agent)
+        gained = fields_system.resolve_food_demand(world)
+        assert not world._food_demand
+        assert world._environment.peek_food(key) == approx(0.0)
+        return [agent.energy - before for agent, before in zip(world.agents, energies)], gained
+
+    forward, gained = feed(False)
+    assert forward == [approx(0.75)] * 4
+    assert gained == approx(3.0)
+    assert feed(True) == (forward, gained)
+
+
+def test_batched_food_consumption_is_deterministic():
+    def run() -> list[tuple]:
+        config = SimulationConfig(seed=6, initial_population=120, max_population=240, world_size=40.0)
+        config.performance.food_consumption = "batched"
+        world = World(config)
+        return [(m.population, m.deaths, m.average_energy) for m in (world.step(t) for t in range(150))]
+
+    first = run()
+    assert first == run()
+    assert first[-1][2] > 0.0
+
+    config = SimulationConfig(initial_population=0)
+    config.performance.food_consumption = "greedy"
+    with raises(ValueError):
+        World(config)
+
+
+def test_group_base_index_matches_linear_scan():
+    def linear(bases: dict, x: float, y: float, radius_sq: float):
+        best = None
+        best_dist_sq = radius_sq
+        for gid, base in bases.items():
+            dx = base.x - x
+            dy = base.y - y
+            dist_sq = dx * dx + dy * dy
+            if 1e-12 < dist_sq < best_dist_sq:
+                best = (gid, dx, dy, dist_sq)
+                best_dist_sq = dist_sq
+        return best
+
+    rng = DeterministicRng(8)
+    index = GroupBaseIndex(2.0)
+    reference: dict = {}
+    for gid in range(60):
+        # Integer coordinates put many bases at exactly the same distance from integer queries.
+        position = Vector2(float(rng.next_int(20)), float(rng.next_int(20)))
+        index[gid] = position
+        reference[gid] = position
+    for gid in range(0, 60, 7):
+        del index[gid]
+        del reference[gid]
+    for gid in range(3, 60, 11):
+        moved = Vector2(float(rng.next_int(20)), float(rng.next_int(20)))
+        index[gid] = moved
+        reference[gid] = moved
+    assert list(index.items()) == list(reference.items())
+
+    for _ in range(300):
+        x = float(rng.next_int(20))
+        y = float(rng.next_int(20))
+        for radius in (1.0, 2.5, 6.0, 40.0):
+            assert index.nearest(x, y, radius * radius) == linear(reference, x, y, radius * radius)
+
+    index.clear()
+    assert index.nearest(1.0, 1.0, 100.0) is None
+
+
+def test_group_registry_tracks_membership_without_rescans():
+    def recount(world: World) -> dict:
+        members: dict = {}
+        for agent in world.agents:
+            if agent.group_id >= 0:
+                members.setdefault(agent.group_id, set()).add(agent.id)
+        return members
+
+    for performance in ({}, {"tick_update": "double_buffer"}, {"agent_slots": "free_list"}):
+        config = SimulationConfig(seed=5, initial_population=160, max_population=320, world_size=40.0)
+        for name, value in performance.items():
+            setattr(config.performance, name, value)
+        world = World(config)
+        registry = world._group_registry
+        for tick in range(200):
+            metrics = world.step(tick)
+            members = recount(world)
+            assert {group_id: registry.members(group_id) for group_id in registry.active} == members
+            assert metrics.groups == len(members)
+            assert set(world._group_bases) <= set(members)
+        assert members
+
+    group_id = next(iter(registry.active))
+    size = registry.size(group_id)
+    agent = next(agent for agent in world.agents if agent.group_id == group_id)
+    registry.begin_tick()
+    groups_system.set_group(world, agent, world._UNGROUPED)
+    assert registry.size(group_id) == size - 1
+    assert registry.tick_size(group_id) == size
+    registry.begin_tick()
+    assert registry.tick_size(group_id, -1) == (size - 1 if size > 1 else -1)
+
+
+def test_fused_neighbor_sums_match_standalone_helpers():
+    def same(fused: Vector2, reference: Vector2) -> bool:
+        # Vector2 == compares with a tolerance; the fused pass must reproduce the exact bits.
+        return (fused.x, fused.y) == (reference.x, reference.y)
+
+    rng = DeterministicRng(21)
+    world = World(SimulationConfig(seed=2, initial_population=0, world_size=40.0))
+    world._group_bases[0] = Vector2(22.0, 20.0)
+    for trial in range(400):
+        group_id = (trial % 3) - 1
+        agent = Agent(
+            id=0,
+            generation=0,
+            group_id=group_id,
+            position=Vector2(20.0, 20.0),
+            velocity=Vector2(),
+            energy=10.0,
+            age=1.0,
+            state=AgentState.WANDER,
+        )
+        neighbors = []
+        offsets = []
+        for index in range(int(rng.next_int(14))):
+            # Snap some offsets to a coarse lattice so exact overlaps and radius-boundary hits occur.
+            offset = Vector2(rng.next_range(-7.0, 7.0), rng.next_range(-7.0, 7.0))
+            if index % 3 == 0:
+                offset = Vector2(round(offset.x), round(offset.y))
+            offsets.append(offset)
+            neighbors.append(
+                Agent(
+                    id=index + 1,
+                    generation=0,
+                    group_id=int(rng.next_int(4)) - 1,
+                    position=agent.position + offset,
+                    velocity=Vector2(rng.next_range(-1.0, 1.0), rng.next_range(-1.0, 1.0)),
+                    energy=10.0,
+                    age=1.0,
+                    state=AgentState.WANDER,
+                )
+            )
+        dist_sq = [offset.x * offset.x + offset.y * offset.y for offset in offsets]
+        grouped = group_id != world._UNGROUPED
+        sums = steering.accumulate_neighbors(
+            world, agent, neighbors, offsets, dist_sq, 1.5, 0.0, 0.0, personal=True, avoid=grouped, seek=not grouped
+        )
+
+        assert same(
+            steering._mean_direction(sums.personal_x, sums.personal_y, sums.personal_count),
+            steering.personal_space(world, offsets, dist_sq),
+        )
+        if neighbors:
+            assert same(
+                steering._finish_separation(world, sums.separation_x, sums.separation_y, sums.closest_dist_sq),
+                steering.separation(world, agent, neighbors, offsets, dist_sq),
+            )
+        if offsets:
+            assert same(steering._mean_direction(sums.offset_x, sums.offset_y, len(offsets)), steering.cohesion(offsets))
+        if grouped:
+            assert same(
+                steering._mean_direction(sums.avoid_x, sums.avoid_y, sums.avoid_count),
+                steering.intergroup_avoidance(world, agent, neighbors, offsets, dist_sq),
+            )
+            assert same(
+                steering._mean_direction(sums.group_cohesion_x, sums.group_cohesion_y, sums.group_cohesion_count),
+                steering.group_cohesion(world, agent, neighbors, offsets, dist_sq),
+            )
+            assert same(
+                steering._mean_direction(sums.alignment_x, sums.alignment_y, sums.alignment_count),
+                steering.alignment(world, agent, neighbors),
+            )
+        else:
+            assert not sums.flee_sensed
+            assert same(
+                steering._finish_group_seek(world, agent, sums.seek_x, sums.seek_y, sums.seek_weight),
+                steering.group_seek_bias(world, agent, neighbors, offsets, dist_sq),
+            )
+
+
+def test_group_updates_on_change_skips_unchanged_neighborhoods():
+    def run(group_updates: str, population: int) -> list:
+        config = SimulationConfig(seed=9, initial_population=population, max_population=400, world_size=40.0)
+        config.feedback.group_update_population_threshold = 100
+        config.performance.group_updates = group_updates
+        world = World(config)
+        history = []
+        for tick in range(60):
+            alive = len(world.agents)
+            metrics = world.step(tick)
+            assert metrics.group_updates_evaluated + metrics.group_updates_skipped == alive
+            history.append((metrics.population, metrics.groups, metrics.group_updates_skipped))
+        return history
+
+    assert run("on_change", 160) == run("on_change", 160)
+    assert sum(skipped for _, _, skipped in run("on_change", 160)) > 0
+    assert sum(skipped for _, _, skipped in run("stride", 160)) > 0
+    assert sum(skipped for _, _, skipped in run("on_change", 40)) == 0
+
+    config = make_static_config()
+    config.feedback.group_update_population_threshold = 0
+    config.performance.group_updates = "on_change"
+    world = World(config)
+    for index in range(6):
+        world.agents.append(
+            Agent(
+                id=index,
+                generation=0,
+                group_id=0 if index < 3 else world._UNGROUPED,
+                position=Vector2(10.0 + index, 10.0),
+                velocity=Vector2(),
+                energy=10.0,
+                age=1.0,
+                state=AgentState.WANDER,
+            )
+        )
+    world.step(0)
+    skipped = [world.step(tick).group_updates_skipped for tick in range(1, 6)]
+    assert skipped == [6] * 5
+
+    with raises(ValueError, match="Unknown group updates"):
+        World(SimulationConfig(performance=PerformanceConfig(group_updates="bogus")))
+
+
+def test_group_update_due_on_cooldown_end_and_detach_expiry():
+    config = make_static_config()
+    config.feedback.group_detach_after_seconds = 4.0
+    world = World(config)
+    traits = AgentTraits(loyalty=1.0)
+    agent = Agent(
+        id=0,
+        generation=0,
+        group_id=2,
+        position=Vector2(5.0, 5.0),
+        velocity=Vector2(),
+        energy=10.0,
+        age=1.0,
+        state=AgentState.WANDER,
+    )
+    assert not groups_system.group_update_due(world, agent, traits, has_close_allies=False)
+    agent.group_lonely_seconds = 3.0
+    assert groups_system.group_update_due(world, agent, traits, has_close_allies=False)
+    assert not groups_system.group_update_due(world, agent, traits, has_close_allies=True)
+    agent.group_lonely_seconds = 0.0
+    agent.group_cooldown = 1.0
+    assert groups_system.group_update_due(world, agent, traits, has_close_allies=True)
+    agent.group_cooldown = 2.0
+    assert not groups_system.group_update_due(world, agent, traits, has_close_allies=True)
+
+
+def test_coherent_steering_reuses_within_tolerance():
+    def run(performance: dict) -> list:
+        config = SimulationConfig(seed=4, initial_population=120, max_population=240, world_size=40.0)
+        for name, value in performance.items():
+            setattr(config.performance, name, value)
+        world = World(config)
+        history = []
+        for tick in range(80):
+            alive = len(world.agents)
+            metrics = world.step(tick)
+            assert metrics.steering_reused + metrics.steering_recomputed == alive
+            history.append(
+                (metrics.population, metrics.steering_reused, round(metrics.steering_max_deviation, 6))
+            )
+        return history
+
+    coherent = run({"steering_reuse": "coherent"})
+    assert coherent == run({"steering_reuse": "coherent"})
+    assert sum(reused for _, reused, _ in coherent) > 0
+    assert sum(reused for _, reused, _ in run({"steering_reuse": "coherent", "steering_reuse_tolerance": 0.0})) < sum(
+        reused for _, reused, _ in coherent
+    )
+    assert all(reused == 0 for _, reused, _ in run({}))
+
+    config = make_static_config()
+    config.species.wander_refresh_seconds = 1000.0
+    config.performance.steering_reuse = "coherent"
+    config.performance.steering_reuse_tolerance = 0.0
+    config.performance.steering_field_tolerance = 0.0
+    world = World(config)
+    for index in range(4):
+        world.agents.append(
+            Agent(
+                id=index,
+                generation=0,
+                group_id=world._UNGROUPED,
+                position=Vector2(12.0 + 5.0 * index, 20.0),
+                velocity=Vector2(),
+                energy=10.0,
+                age=1.0,
+                state=AgentState.WANDER,
+            )
+        )
+    assert world.step(0).steering_recomputed == 4
+    for tick in range(1, 5):
+        metrics = world.step(tick)
+        assert (metrics.steering_reused, metrics.steering_recomputed, metrics.steering_max_deviation) == (4, 0, 0.0)
+    world.agents[0].energy = 0.0
+    assert world.step(5).steering_recomputed == 1
+
+    with raises(ValueError, match="Unknown steering reuse"):
+        World(SimulationConfig(performance=PerformanceConfig(steering_reuse="bogus")))
+    with raises(ValueError, match="requires steering_backend='scalar'"):
+        World(SimulationConfig(performance=PerformanceConfig(steering_reuse="coherent", steering_backend="batch")))
+
+
+def test_coherent_steering_recomputes_when_a_neighbor_switches_group():
+    config = make_static_config()
+    config.species.vision_radius = 4.0
+    config.species.wander_refresh_seconds = 1000.0
+    config.feedback.group_detach_after_seconds = 1000.0
+    config.performance.steering_reuse = "coherent"
+    config.performance.steering_reuse_tolerance = 0.0
+    config.performance.steering_field_tolerance = 0.0
+    world = World(config)
+    # Agents 0 and 1 see each other; agent 2 is out of range and keeps reusing.
+    for index, x in enumerate((20.0, 21.5, 35.0)):
+        world.agents.append(
+            Agent(
+                id=index,
+                generation=0,
+                group_id=world._UNGROUPED,
+                position=Vector2(x, 20.0),
+                velocity=Vector2(),
+                energy=10.0,
+                age=1.0,
+                state=AgentState.WANDER,
+            )
+        )
+    world.step(0)
+    assert world.step(1).steering_reused == 3
+
+    # Nothing moves; agent 1 joins a group, which changes agent 0's group-seek terms.
+    world.agents[1].group_id = 7
+    metrics = world.step(2)
+    assert (metrics.steering_reused, metrics.steering_recomputed) == (1, 2)
+    assert world.step(3).steering_reused == 3
+    assert world._steering_cache.get(0).neighbor_groups == (7,)
+
+
+def test_tick_governor_hysteresis_and_replay():
+    governor = TickGovernor(budget_ms=20.0, window=3, low_ratio=0.6, max_level=2)
+    levels = []
+    for duration in [25.0, 25.0, 25.0, 25.0, 25.0, 25.0, 25.0, 25.0, 25.0, 15.0, 15.0, 15.0, 11.0, 11.0, 11.0]:
+        governor.observe(duration)
+        levels.append(governor.level)
+    # Up once per full window, capped at max_level; 15 ms sits inside the hysteresis band.
+    assert levels == [0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1]
+    for _ in range(6):
+        governor.observe(1.0)
+    assert governor.level == -1
+
+    feedback = FeedbackConfig(
+        group_update_stride=3,
+        group_update_population_threshold=320,
+        steering_update_stride=2,
+        steering_update_population_threshold=300,
+    )
+    assert governed_strides(feedback, -1) == (1, 320, 1, 300)
+    assert governed_strides(feedback, 0) == (3, 320, 2, 300)
+    assert governed_strides(feedback, 2) == (5, 80, 4, 75)
+
+    def run(trace: dict | None) -> list:
+        config = SimulationConfig(seed=6, initial_population=160, max_population=320, world_size=40.0)
+        config.performance.tick_governor = "budget"
+        config.performance.tick_budget_ms = 1e9
+        world = World(config)
+        if trace is not None:
+            world.replay_governor_trace(trace)
+        history = []
+        for tick in range(60):
+            metrics = world.step(tick)
+            history.append(
+                (metrics.governor_level, metrics.population, metrics.groups, metrics.steering_reused)
+            )
+        return history
+
+    trace = {0: 0, 10: 2, 25: -1, 40: 3}
+    replayed = run(trace)
+    assert [level for level, *_ in replayed] == [0] * 10 + [2] * 15 + [-1] * 15 + [3] * 20
+    assert replayed == run(trace)
+    assert any(reused for _, _, _, reused in replayed[10:25])
+    assert not any(reused for _, _, _, reused in replayed[25:40])
+
+    with raises(ValueError, match="requires tick_governor='budget'"):
+        World(SimulationConfig()).replay_governor_trace(trace)
+    with raises(ValueError, match="Unknown tick governor"):
+        World(SimulationConfig(performance=PerformanceConfig(tick_governor="bogus")))